@@ -1,30 +1,159 @@
-from infrablocks.invoke_factory import parameter
-
-from .collection import (
-    TerraformTaskCollection,
-)
-from .configuration import (
-    ApplyConfiguration,
-    Configuration,
-    ConfigureFunction,
-    DestroyConfiguration,
-    OutputConfiguration,
-    PlanConfiguration,
-    ValidateConfiguration,
-)
-from .factory import (
-    TerraformTaskFactory,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from infrablocks.invoke_factory import parameter
+
+    from .collection import (
+        TerraformTaskCollection,
+    )
+    from .configuration import (
+        ApplyConfiguration,
+        Configuration,
+        ConfigureFunction,
+        DestroyConfiguration,
+        OutputConfiguration,
+        PlanConfiguration,
+        ValidateConfiguration,
+    )
+    from .daemon import (
+        TaskDaemon,
+    )
+    from .dependencies import (
+        ModuleDependencyIndex,
+    )
+    from .discovery import (
+        RootModule,
+        RootModuleIndex,
+    )
+    from .drift import (
+        DriftDetector,
+        DriftReport,
+    )
+    from .factory import (
+        TerraformTaskFactory,
+    )
+    from .fingerprints import (
+        PlanFingerprintStore,
+    )
+    from .group import (
+        TerraformTaskCollectionGroup,
+    )
+    from .lint import (
+        Linter,
+        LintReport,
+    )
+    from .matrix import (
+        MatrixCell,
+        MatrixReport,
+    )
+    from .memoization import (
+        ConfigurationMemo,
+        default_configuration_memo,
+    )
+    from .outputs import (
+        OutputResolver,
+        OutputSource,
+        default_output_resolver,
+    )
+    from .refresh import (
+        RefreshPolicy,
+        RefreshStore,
+    )
+    from .sharding import (
+        ShardedPlanner,
+        ShardedPlanReport,
+    )
+    from .targeting import (
+        ResourceGraphIndex,
+        TargetSelection,
+        TargetSelector,
+    )
+
+_EXPORTS = {
+    "ApplyConfiguration": ".configuration",
+    "Configuration": ".configuration",
+    "ConfigurationMemo": ".memoization",
+    "ConfigureFunction": ".configuration",
+    "DestroyConfiguration": ".configuration",
+    "DriftDetector": ".drift",
+    "DriftReport": ".drift",
+    "LintReport": ".lint",
+    "Linter": ".lint",
+    "MatrixCell": ".matrix",
+    "MatrixReport": ".matrix",
+    "ModuleDependencyIndex": ".dependencies",
+    "OutputConfiguration": ".configuration",
+    "OutputResolver": ".outputs",
+    "OutputSource": ".outputs",
+    "PlanConfiguration": ".configuration",
+    "PlanFingerprintStore": ".fingerprints",
+    "RefreshPolicy": ".refresh",
+    "RefreshStore": ".refresh",
+    "ResourceGraphIndex": ".targeting",
+    "RootModule": ".discovery",
+    "RootModuleIndex": ".discovery",
+    "ShardedPlanReport": ".sharding",
+    "ShardedPlanner": ".sharding",
+    "TargetSelection": ".targeting",
+    "TargetSelector": ".targeting",
+    "TerraformTaskCollection": ".collection",
+    "TerraformTaskCollectionGroup": ".group",
+    "TaskDaemon": ".daemon",
+    "TerraformTaskFactory": ".factory",
+    "ValidateConfiguration": ".configuration",
+    "default_configuration_memo": ".memoization",
+    "default_output_resolver": ".outputs",
+    "parameter": "infrablocks.invoke_factory",
+}
 
 __all__ = [
     "ApplyConfiguration",
     "Configuration",
+    "ConfigurationMemo",
     "ConfigureFunction",
     "DestroyConfiguration",
+    "DriftDetector",
+    "DriftReport",
+    "LintReport",
+    "Linter",
+    "MatrixCell",
+    "MatrixReport",
+    "ModuleDependencyIndex",
     "OutputConfiguration",
+    "OutputResolver",
+    "OutputSource",
     "PlanConfiguration",
+    "PlanFingerprintStore",
+    "RefreshPolicy",
+    "RefreshStore",
+    "ResourceGraphIndex",
+    "RootModule",
+    "RootModuleIndex",
+    "ShardedPlanReport",
+    "ShardedPlanner",
+    "TargetSelection",
+    "TargetSelector",
+    "TaskDaemon",
     "TerraformTaskCollection",
+    "TerraformTaskCollectionGroup",
     "TerraformTaskFactory",
     "ValidateConfiguration",
+    "default_configuration_memo",
+    "default_output_resolver",
     "parameter",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
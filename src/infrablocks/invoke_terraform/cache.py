@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, cast
+
+from .constants import PLUGIN_CACHE_ENVIRONMENT_VARIABLE
+
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = "INVOKE_TERRAFORM_CACHE_DIR"
+
+
+def default_cache_directory() -> Path:
+    configured = os.environ.get(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if configured:
+        return Path(configured)
+
+    base = os.environ.get("XDG_CACHE_HOME")
+    if base:
+        return Path(base) / "invoke_terraform"
+
+    return Path.home() / ".cache" / "invoke_terraform"
+
+
+def plugin_cache_directory(environment: Mapping[str, str]) -> str:
+    configured = environment.get(
+        PLUGIN_CACHE_ENVIRONMENT_VARIABLE
+    ) or os.environ.get(PLUGIN_CACHE_ENVIRONMENT_VARIABLE)
+    if configured:
+        return configured
+    return str(default_cache_directory() / "plugins")
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, type):
+        return repr(value)
+    if isinstance(value, set | frozenset):
+        return sorted(
+            json.dumps(item, sort_keys=True, default=_canonical)
+            for item in cast(set[Any], value)
+        )
+    if is_dataclass(value):
+        return {
+            "type": type(value).__qualname__,
+            **{
+                field.name: getattr(value, field.name)
+                for field in fields(value)
+            },
+        }
+    if hasattr(value, "keys") and hasattr(value, "__getitem__"):
+        return {str(key): value[key] for key in value.keys()}
+    if hasattr(value, "__dict__"):
+        attributes = cast(dict[str, Any], vars(value))
+        return {
+            "type": type(value).__qualname__,
+            **{
+                name: attribute
+                for name, attribute in attributes.items()
+                if not name.startswith("_")
+            },
+        }
+    return repr(value)
+
+
+def digest(value: Any) -> str:
+    encoded = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=_canonical
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class JSONFileCache:
+    def __init__(self, path: Path):
+        self.path = path
+
+    @staticmethod
+    def named(name: str, directory: Path | None = None) -> "JSONFileCache":
+        directory = (
+            directory if directory is not None else default_cache_directory()
+        )
+        return JSONFileCache(directory / f"{name}.json")
+
+    def load(self) -> dict[str, Any]:
+        try:
+            with open(self.path) as file:
+                contents = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(contents, dict):
+            return {}
+
+        return contents  # pyright: ignore[reportUnknownVariableType]
+
+    def store(self, contents: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", dir=self.path.parent, delete=False, suffix=".tmp"
+        ) as file:
+            json.dump(contents, file, separators=(",", ":"))
+        os.replace(file.name, self.path)
@@ -0,0 +1,79 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import TextIO
+
+SOCKET_ENVIRONMENT_VARIABLE = "INVOKE_TERRAFORM_SOCKET"
+FALLBACK_COMMAND = "invoke"
+
+
+def default_socket_path() -> str:
+    configured = os.environ.get(SOCKET_ENVIRONMENT_VARIABLE)
+    if configured:
+        return configured
+
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"invoke-terraform-{os.getuid()}.sock")
+
+
+def connect(socket_path: str | None = None) -> socket.socket | None:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path or default_socket_path())
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def run(
+    argv: Sequence[str],
+    socket_path: str | None = None,
+    cwd: str | None = None,
+    environment: Mapping[str, str] | None = None,
+    stdout: TextIO | None = None,
+    stderr: TextIO | None = None,
+) -> int | None:
+    connection = connect(socket_path)
+    if connection is None:
+        return None
+
+    streams = {
+        "stdout": stdout or sys.stdout,
+        "stderr": stderr or sys.stderr,
+    }
+    request = {
+        "argv": list(argv),
+        "cwd": cwd or os.getcwd(),
+        "environment": dict(
+            environment if environment is not None else os.environ
+        ),
+    }
+    with connection, connection.makefile("rwb") as channel:
+        channel.write(json.dumps(request).encode() + b"\n")
+        channel.flush()
+        for line in channel:
+            message = json.loads(line)
+            if "exit" in message:
+                return int(message["exit"])
+            stream = streams[message["stream"]]
+            stream.write(message["data"])
+            stream.flush()
+
+    streams["stderr"].write("invoke-terraform daemon closed the connection.\n")
+    return 1
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    arguments = list(sys.argv[1:] if argv is None else argv)
+    code = run(arguments)
+    if code is None:
+        os.execvp(FALLBACK_COMMAND, [FALLBACK_COMMAND, *arguments])
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
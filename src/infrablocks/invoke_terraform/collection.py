@@ -1,9 +1,18 @@
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
 from typing import Any, Literal, Self, TypedDict, Unpack, overload
 
 from invoke.collection import Collection
 from invoke.context import Context
-
-from infrablocks.invoke_factory import Arguments, Parameter, ParameterList
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import (
+    Arguments,
+    BodyCallable,
+    Parameter,
+    ParameterList,
+    create_task,
+)
 
 from .configuration import (
     ApplyConfiguration,
@@ -14,7 +23,53 @@ from .configuration import (
     PlanConfiguration,
     ValidateConfiguration,
 )
+from .drift import DriftTarget
 from .factory import TerraformTaskFactory
+from .invocation import run_task_with_defaults
+from .lazy import LazyTask
+from .matrix import (
+    DEFAULT_MAXIMUM_WORKERS,
+    MatrixCell,
+    MatrixReport,
+    matrix_configure_function,
+    run_matrix,
+)
+from .memoization import ConfigurationMemo, default_configuration_memo
+from .sharding import DEFAULT_MAXIMUM_SHARDS
+from .targeting import DEFAULT_BASE_REF
+from .watch import DEFAULT_DEBOUNCE, DEFAULT_INTERVAL
+from .workspaces import data_directory, workspace_configure_function
+
+type TaskName = Literal[
+    "validate", "plan", "apply", "destroy", "output", "refresh-only"
+]
+type CompositeTaskName = Literal["validate-plan", "plan-apply", "apply-output"]
+type CollectionTaskName = (
+    TaskName
+    | CompositeTaskName
+    | Literal["watch", "plan-targeted", "plan-sharded"]
+)
+
+TASK_NAMES: list[TaskName] = [
+    "validate",
+    "plan",
+    "apply",
+    "destroy",
+    "output",
+]
+MATRIX_TASK_NAMES: list[TaskName] = ["plan", "apply"]
+WORKSPACES_TASK_NAMES: list[TaskName] = ["plan", "apply", "output"]
+COMPOSITE_TASK_NAMES: list[CompositeTaskName] = [
+    "validate-plan",
+    "plan-apply",
+    "apply-output",
+]
+
+type FanOut = Literal["matrix", "workspaces"]
+
+type TaskCreator = Callable[
+    [str, ConfigureFunction[Configuration], ParameterList], Task[Any]
+]
 
 
 class TerraformTaskCollectionParameters(TypedDict, total=False):
@@ -27,6 +82,21 @@ class TerraformTaskCollectionParameters(TypedDict, total=False):
     task_override_configure_function: dict[
         str, ConfigureFunction[Configuration]
     ]
+    lazy: bool
+    matrix: Sequence[MatrixCell]
+    matrix_maximum_workers: int
+    workspaces: Sequence[str]
+    workspaces_maximum_workers: int
+    configuration_memo: ConfigurationMemo | None
+    composite: bool
+    watch: bool
+    watch_interval: float
+    watch_debounce: float
+    targeted_plan: bool
+    targeted_plan_base_ref: str
+    sharded_plan: bool
+    sharded_plan_maximum_shards: int
+    refresh_only: bool
 
 
 class TerraformTaskCollection:
@@ -43,6 +113,21 @@ class TerraformTaskCollection:
         task_override_configure_function: dict[str, ConfigureFunction[Any]]
         | None = None,
         task_factory: TerraformTaskFactory = TerraformTaskFactory(),
+        lazy: bool = False,
+        matrix: Sequence[MatrixCell] | None = None,
+        matrix_maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+        workspaces: Sequence[str] | None = None,
+        workspaces_maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+        configuration_memo: ConfigurationMemo | None = None,
+        composite: bool = False,
+        watch: bool = False,
+        watch_interval: float = DEFAULT_INTERVAL,
+        watch_debounce: float = DEFAULT_DEBOUNCE,
+        targeted_plan: bool = False,
+        targeted_plan_base_ref: str = DEFAULT_BASE_REF,
+        sharded_plan: bool = False,
+        sharded_plan_maximum_shards: int = DEFAULT_MAXIMUM_SHARDS,
+        refresh_only: bool = False,
     ):
         self.configuration_name = configuration_name
         self.global_parameters: ParameterList = (
@@ -76,6 +161,25 @@ class TerraformTaskCollection:
             else {}
         )
         self._task_factory = task_factory
+        self.lazy = lazy
+        self.matrix: Sequence[MatrixCell] = (
+            matrix if matrix is not None else ()
+        )
+        self.matrix_maximum_workers = matrix_maximum_workers
+        self.workspaces: Sequence[str] = (
+            workspaces if workspaces is not None else ()
+        )
+        self.workspaces_maximum_workers = workspaces_maximum_workers
+        self.configuration_memo = configuration_memo
+        self.composite = composite
+        self.watch = watch
+        self.watch_interval = watch_interval
+        self.watch_debounce = watch_debounce
+        self.targeted_plan = targeted_plan
+        self.targeted_plan_base_ref = targeted_plan_base_ref
+        self.sharded_plan = sharded_plan
+        self.sharded_plan_maximum_shards = sharded_plan_maximum_shards
+        self.refresh_only = refresh_only
 
     def _clone(
         self, **kwargs: Unpack[TerraformTaskCollectionParameters]
@@ -105,6 +209,32 @@ class TerraformTaskCollection:
                 self.task_override_configure_function,
             ),
             task_factory=self._task_factory,
+            lazy=kwargs.get("lazy", self.lazy),
+            matrix=kwargs.get("matrix", self.matrix),
+            matrix_maximum_workers=kwargs.get(
+                "matrix_maximum_workers", self.matrix_maximum_workers
+            ),
+            workspaces=kwargs.get("workspaces", self.workspaces),
+            workspaces_maximum_workers=kwargs.get(
+                "workspaces_maximum_workers", self.workspaces_maximum_workers
+            ),
+            configuration_memo=kwargs.get(
+                "configuration_memo", self.configuration_memo
+            ),
+            composite=kwargs.get("composite", self.composite),
+            watch=kwargs.get("watch", self.watch),
+            watch_interval=kwargs.get("watch_interval", self.watch_interval),
+            watch_debounce=kwargs.get("watch_debounce", self.watch_debounce),
+            targeted_plan=kwargs.get("targeted_plan", self.targeted_plan),
+            targeted_plan_base_ref=kwargs.get(
+                "targeted_plan_base_ref", self.targeted_plan_base_ref
+            ),
+            sharded_plan=kwargs.get("sharded_plan", self.sharded_plan),
+            sharded_plan_maximum_shards=kwargs.get(
+                "sharded_plan_maximum_shards",
+                self.sharded_plan_maximum_shards,
+            ),
+            refresh_only=kwargs.get("refresh_only", self.refresh_only),
         )
 
     def for_configuration(self, configuration_name: str):
@@ -173,6 +303,13 @@ class TerraformTaskCollection:
         task_configure_function: ConfigureFunction[OutputConfiguration],
     ) -> Self: ...
 
+    @overload
+    def with_extra_task_configure_function(
+        self,
+        task_name: Literal["refresh-only"],
+        task_configure_function: ConfigureFunction[ApplyConfiguration],
+    ) -> Self: ...
+
     def with_extra_task_configure_function(
         self, task_name: str, task_configure_function: ConfigureFunction[Any]
     ) -> Self:
@@ -195,23 +332,127 @@ class TerraformTaskCollection:
             }
         )
 
-    def _resolve_parameters(self, task_name: str) -> ParameterList:
+    def with_lazy_tasks(self) -> Self:
+        return self._clone(lazy=True)
+
+    def with_matrix(
+        self,
+        cells: Iterable[MatrixCell],
+        maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+    ) -> Self:
+        return self._clone(
+            matrix=tuple(cells), matrix_maximum_workers=maximum_workers
+        )
+
+    def with_workspaces(
+        self,
+        workspaces: Iterable[str],
+        maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+    ) -> Self:
+        return self._clone(
+            workspaces=tuple(workspaces),
+            workspaces_maximum_workers=maximum_workers,
+        )
+
+    def with_memoized_configuration(
+        self, memo: ConfigurationMemo = default_configuration_memo
+    ) -> Self:
+        return self._clone(configuration_memo=memo)
+
+    def with_composite_tasks(self) -> Self:
+        return self._clone(composite=True)
+
+    def with_watch_task(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> Self:
+        return self._clone(
+            watch=True, watch_interval=interval, watch_debounce=debounce
+        )
+
+    def with_targeted_plan_task(
+        self, base_ref: str = DEFAULT_BASE_REF
+    ) -> Self:
+        return self._clone(targeted_plan=True, targeted_plan_base_ref=base_ref)
+
+    def with_sharded_plan_task(
+        self, maximum_shards: int = DEFAULT_MAXIMUM_SHARDS
+    ) -> Self:
+        return self._clone(
+            sharded_plan=True, sharded_plan_maximum_shards=maximum_shards
+        )
+
+    def with_refresh_only_task(self) -> Self:
+        return self._clone(refresh_only=True)
+
+    @staticmethod
+    def _component_task_names(
+        task_name: CollectionTaskName,
+    ) -> list[TaskName]:
+        match task_name:
+            case "validate-plan":
+                return ["validate", "plan"]
+            case "plan-apply":
+                return ["plan", "apply"]
+            case "apply-output":
+                return ["apply", "output"]
+            case "watch":
+                return ["validate", "plan"]
+            case "plan-targeted" | "plan-sharded":
+                return ["plan"]
+            case _:
+                return [task_name]
+
+    def _resolve_parameters(
+        self, task_name: CollectionTaskName
+    ) -> ParameterList:
         if task_name in self.task_override_parameters:
             return self.task_override_parameters[task_name]
 
-        return [
-            *self.global_parameters,
-            *self.task_extra_parameters.get(task_name, []),
-        ]
+        parameters = {
+            parameter["name"]: parameter
+            for parameter in self.global_parameters
+        }
+        for component in self._component_task_names(task_name):
+            for parameter in self.task_extra_parameters.get(component, []):
+                parameters.setdefault(parameter["name"], parameter)
+        return list(parameters.values())
 
     def _resolve_configure_function(
         self,
-        task_name: Literal["validate", "plan", "apply", "destroy", "output"],
+        task_name: CollectionTaskName,
     ) -> ConfigureFunction[Configuration]:
         if task_name in self.task_override_configure_function:
             return self.task_override_configure_function[task_name]
 
-        global_configure_function = self.global_configure_function
+        global_configure_function = (
+            self.configuration_memo.memoize(
+                self.configuration_name or "", self.global_configure_function
+            )
+            if self.configuration_memo is not None
+            else self.global_configure_function
+        )
+        specific_configure_functions = [
+            self._resolve_specific_configure_function(component)
+            for component in self._component_task_names(task_name)
+        ]
+
+        def combined_configure_function(
+            context: Context,
+            arguments: Arguments,
+            configuration: Configuration,
+        ):
+            global_configure_function(context, arguments, configuration)
+            for specific_configure_function in specific_configure_functions:
+                specific_configure_function(context, arguments, configuration)
+
+        return combined_configure_function
+
+    def _resolve_specific_configure_function(
+        self,
+        task_name: TaskName,
+    ) -> ConfigureFunction[Configuration]:
         extra_configure_function = self.task_extra_configure_function.get(
             task_name, lambda context, arguments, configuration: None
         )
@@ -225,7 +466,7 @@ class TerraformTaskCollection:
         )
         match task_name:
             case "validate":
-                specific_configuration_type = PlanConfiguration
+                specific_configuration_type = ValidateConfiguration
             case "plan":
                 specific_configuration_type = PlanConfiguration
             case "apply":
@@ -234,16 +475,16 @@ class TerraformTaskCollection:
                 specific_configuration_type = ApplyConfiguration
             case "output":
                 specific_configuration_type = OutputConfiguration
+            case "refresh-only":
+                specific_configuration_type = ApplyConfiguration
             case _:
                 raise ValueError("Unsupported task name: " + task_name)
 
-        def combined_configure_function(
+        def specific_configure_function(
             context: Context,
             arguments: Arguments,
             configuration: Configuration,
         ):
-            global_configure_function(context, arguments, configuration)
-
             specific_configuration = specific_configuration_type(configuration)
             extra_configure_function(
                 context, arguments, specific_configuration
@@ -251,54 +492,215 @@ class TerraformTaskCollection:
 
             configuration.apply_overrides(specific_configuration)
 
-        return combined_configure_function
+        return specific_configure_function
 
-    def create(self) -> Collection:
+    def _task_creator(self, task_name: CollectionTaskName) -> TaskCreator:
+        match task_name:
+            case "validate":
+                return self._task_factory.create_validate_task
+            case "plan":
+                return self._task_factory.create_plan_task
+            case "apply":
+                return self._task_factory.create_apply_task
+            case "destroy":
+                return self._task_factory.create_destroy_task
+            case "output":
+                return self._task_factory.create_output_task
+            case "refresh-only":
+                return self._task_factory.create_refresh_only_task
+            case "validate-plan":
+                return self._task_factory.create_validate_plan_task
+            case "plan-apply":
+                return self._task_factory.create_plan_apply_task
+            case "apply-output":
+                return self._task_factory.create_apply_output_task
+            case "watch":
+                return partial(
+                    self._task_factory.create_watch_task,
+                    interval=self.watch_interval,
+                    debounce=self.watch_debounce,
+                )
+            case "plan-targeted":
+                return partial(
+                    self._task_factory.create_targeted_plan_task,
+                    base_ref=self.targeted_plan_base_ref,
+                )
+            case "plan-sharded":
+                return partial(
+                    self._task_factory.create_sharded_plan_task,
+                    maximum_shards=self.sharded_plan_maximum_shards,
+                )
+
+    def drift_targets(self) -> list[DriftTarget]:
         if self.configuration_name is None:
-            raise ValueError("Configuration name must be set before creating.")
+            raise ValueError(
+                "Configuration name must be set before detecting drift."
+            )
 
-        collection = Collection(self.configuration_name)
+        configure_function = self._resolve_configure_function("plan")
+        arguments: Arguments = {}
+        for parameter in self._resolve_parameters("plan"):
+            default = parameter.get("default")
+            if default is not None:
+                arguments[parameter["name"]] = default
+        if not self.workspaces:
+            return [
+                DriftTarget(
+                    name=self.configuration_name,
+                    configure_function=configure_function,
+                    arguments=arguments,
+                )
+            ]
+        return [
+            DriftTarget(
+                name=f"{self.configuration_name}:{workspace}",
+                configure_function=configure_function,
+                arguments=arguments,
+                workspace=workspace,
+            )
+            for workspace in self.workspaces
+        ]
 
-        validate_task = self._task_factory.create_validate_task(
-            self.configuration_name,
-            self._resolve_configure_function("validate"),
-            self._resolve_parameters("validate"),
-        )
-        plan_task = self._task_factory.create_plan_task(
-            self.configuration_name,
-            self._resolve_configure_function("plan"),
-            self._resolve_parameters("plan"),
-        )
-        apply_task = self._task_factory.create_apply_task(
-            self.configuration_name,
-            self._resolve_configure_function("apply"),
-            self._resolve_parameters("apply"),
-        )
-        destroy_task = self._task_factory.create_destroy_task(
-            self.configuration_name,
-            self._resolve_configure_function("destroy"),
-            self._resolve_parameters("destroy"),
-        )
-        output_task = self._task_factory.create_output_task(
-            self.configuration_name,
-            self._resolve_configure_function("output"),
-            self._resolve_parameters("output"),
+    def _create_task(
+        self, configuration_name: str, task_name: CollectionTaskName
+    ) -> Task[Any]:
+        return self._task_creator(task_name)(
+            configuration_name,
+            self._resolve_configure_function(task_name),
+            self._resolve_parameters(task_name),
         )
 
-        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
-            validate_task
-        )
-        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
-            plan_task
+    def _create_lazy_task(
+        self, configuration_name: str, task_name: CollectionTaskName
+    ) -> Task[Any]:
+        return LazyTask(
+            task_name.replace("-", "_"),
+            self._task_factory.describe_task(task_name, configuration_name),
+            lambda: self._resolve_parameters(task_name),
+            lambda: self._create_task(configuration_name, task_name),
         )
-        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
-            apply_task
-        )
-        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
-            destroy_task
+
+    def _create_fan_out_task(
+        self, configuration_name: str, task_name: TaskName, fan_out: FanOut
+    ) -> Task[BodyCallable[MatrixReport]]:
+        create = self._task_creator(task_name)
+        configure_function = self._resolve_configure_function(task_name)
+        parameters = self._resolve_parameters(task_name)
+        task_factory = self._task_factory
+        matrix = self.matrix
+        workspaces = self.workspaces
+
+        def run(context: Context, arguments: Arguments) -> MatrixReport:
+            match fan_out:
+                case "matrix":
+                    cells = matrix
+                    maximum_workers = self.matrix_maximum_workers
+                    configure_functions = {
+                        cell.name: matrix_configure_function(
+                            cell, configure_function
+                        )
+                        for cell in cells
+                    }
+                case "workspaces":
+                    _, configuration = task_factory.initialise(
+                        configure_function, context, arguments
+                    )
+                    source_data_directory = data_directory(configuration)
+                    cells = [
+                        MatrixCell(name=workspace, workspace=workspace)
+                        for workspace in workspaces
+                    ]
+                    maximum_workers = self.workspaces_maximum_workers
+                    configure_functions = {
+                        workspace: workspace_configure_function(
+                            workspace,
+                            source_data_directory,
+                            configure_function,
+                        )
+                        for workspace in workspaces
+                    }
+
+            def run_cell(cell: MatrixCell) -> Any:
+                task = create(
+                    f"{configuration_name}-{cell.name}",
+                    configure_functions[cell.name],
+                    parameters,
+                )
+                return run_task_with_defaults(
+                    task, Context(config=context.config), **arguments
+                )
+
+            report = run_matrix(cells, run_cell, maximum_workers)
+            print(report.render())
+            report.raise_for_failures()
+            return report
+
+        run.__name__ = f"{task_name}_{fan_out}"
+        run.__doc__ = self._task_factory.describe_task(
+            f"{task_name}-{fan_out}", configuration_name
         )
-        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
-            output_task
+
+        return create_task(run, parameters)
+
+    def _create_lazy_fan_out_task(
+        self, configuration_name: str, task_name: TaskName, fan_out: FanOut
+    ) -> Task[Any]:
+        return LazyTask(
+            f"{task_name}_{fan_out}",
+            self._task_factory.describe_task(
+                f"{task_name}-{fan_out}", configuration_name
+            ),
+            lambda: self._resolve_parameters(task_name),
+            lambda: self._create_fan_out_task(
+                configuration_name, task_name, fan_out
+            ),
         )
 
+    def create(self) -> Collection:
+        if self.configuration_name is None:
+            raise ValueError("Configuration name must be set before creating.")
+
+        collection = Collection(self.configuration_name)
+
+        names: list[CollectionTaskName] = [*TASK_NAMES]
+        if self.composite:
+            names.extend(COMPOSITE_TASK_NAMES)
+        if self.watch:
+            names.append("watch")
+        if self.targeted_plan:
+            names.append("plan-targeted")
+        if self.sharded_plan:
+            names.append("plan-sharded")
+        if self.refresh_only:
+            names.append("refresh-only")
+        for name in names:
+            task = (
+                self._create_lazy_task(self.configuration_name, name)
+                if self.lazy
+                else self._create_task(self.configuration_name, name)
+            )
+            collection.add_task(  # pyright: ignore[reportUnknownMemberType]
+                task
+            )
+
+        fan_outs: list[tuple[FanOut, list[TaskName]]] = []
+        if self.matrix:
+            fan_outs.append(("matrix", MATRIX_TASK_NAMES))
+        if self.workspaces:
+            fan_outs.append(("workspaces", WORKSPACES_TASK_NAMES))
+        for fan_out, task_names in fan_outs:
+            for task_name in task_names:
+                task = (
+                    self._create_lazy_fan_out_task(
+                        self.configuration_name, task_name, fan_out
+                    )
+                    if self.lazy
+                    else self._create_fan_out_task(
+                        self.configuration_name, task_name, fan_out
+                    )
+                )
+                collection.add_task(  # pyright: ignore[reportUnknownMemberType]
+                    task
+                )
+
         return collection
@@ -1,6 +1,7 @@
-from collections.abc import Callable
-from dataclasses import dataclass
-from typing import overload
+from collections.abc import Callable, Sequence
+from copy import deepcopy
+from dataclasses import dataclass, fields, replace
+from typing import TYPE_CHECKING, Literal, overload
 
 from invoke.context import Context
 
@@ -13,11 +14,23 @@ from infrablocks.invoke_terraform.terraform import (
     Variables,
 )
 
+from .cache import digest
+
+if TYPE_CHECKING:
+    from infrablocks.invoke_terraform.terraform import Policy
+
+    from .fingerprints import PlanFingerprintStore
+    from .refresh import RefreshPolicy
+
+type UnchangedPlanAction = Literal["apply", "warn", "skip"]
+type PlanOutput = Literal["full", "condensed"]
+
 
 @dataclass
 class InitSpecificConfiguration:
     backend_config: BackendConfig
     reconfigure: bool
+    skip: bool = False
 
 
 @dataclass
@@ -29,6 +42,7 @@ class OutputSpecificConfiguration:
 @dataclass
 class ValidateSpecificConfiguration:
     json: bool
+    backend: bool = True
 
 
 @dataclass
@@ -39,6 +53,13 @@ class PlanConfiguration:
     workspace: str | None
 
     environment: Environment | None = None
+    policy: "Policy | None" = None
+    plan_store: "PlanFingerprintStore | None" = None
+    plan_output: PlanOutput = "full"
+    plan_details_path: str | None = None
+    refresh: bool = True
+    refresh_policy: "RefreshPolicy | None" = None
+    targets: Sequence[str] | None = None
 
     def __init__(self, configuration: "Configuration | None" = None):
         if configuration is not None:
@@ -46,6 +67,13 @@ class PlanConfiguration:
             self.variables = configuration.variables
             self.workspace = configuration.workspace
             self.environment = configuration.environment or {}
+            self.policy = configuration.policy
+            self.plan_store = configuration.plan_store
+            self.plan_output = configuration.plan_output
+            self.plan_details_path = configuration.plan_details_path
+            self.refresh = configuration.refresh
+            self.refresh_policy = configuration.refresh_policy
+            self.targets = configuration.targets
 
 
 @dataclass
@@ -54,6 +82,7 @@ class ValidateConfiguration:
 
     workspace: str | None
     json: bool
+    backend: bool = True
 
     environment: Environment | None = None
 
@@ -62,6 +91,7 @@ class ValidateConfiguration:
             self.init = configuration.init
             self.workspace = configuration.workspace
             self.json = configuration.validate.json
+            self.backend = configuration.validate.backend
             self.environment = configuration.environment or {}
 
 
@@ -74,6 +104,12 @@ class ApplyConfiguration:
     auto_approve: bool = True
 
     environment: Environment | None = None
+    policy: "Policy | None" = None
+    plan_store: "PlanFingerprintStore | None" = None
+    unchanged_plan: UnchangedPlanAction = "apply"
+    refresh: bool = True
+    refresh_policy: "RefreshPolicy | None" = None
+    targets: Sequence[str] | None = None
 
     def __init__(self, configuration: "Configuration | None" = None):
         if configuration is not None:
@@ -82,6 +118,12 @@ class ApplyConfiguration:
             self.workspace = configuration.workspace
             self.auto_approve = configuration.auto_approve
             self.environment = configuration.environment or {}
+            self.policy = configuration.policy
+            self.plan_store = configuration.plan_store
+            self.unchanged_plan = configuration.unchanged_plan
+            self.refresh = configuration.refresh
+            self.refresh_policy = configuration.refresh_policy
+            self.targets = configuration.targets
 
 
 @dataclass
@@ -134,6 +176,14 @@ class Configuration:
     auto_approve: bool = True
 
     environment: Environment | None = None
+    policy: "Policy | None" = None
+    plan_store: "PlanFingerprintStore | None" = None
+    unchanged_plan: UnchangedPlanAction = "apply"
+    plan_output: PlanOutput = "full"
+    plan_details_path: str | None = None
+    refresh: bool = True
+    refresh_policy: "RefreshPolicy | None" = None
+    targets: Sequence[str] | None = None
 
     @staticmethod
     def create_empty():
@@ -151,6 +201,35 @@ class Configuration:
             environment={},
         )
 
+    def fingerprint(self) -> str:
+        return digest(self)
+
+    def copy(self) -> "Configuration":
+        return replace(
+            self,
+            init=replace(
+                self.init, backend_config=deepcopy(self.init.backend_config)
+            ),
+            validate=replace(self.validate),
+            output=replace(self.output),
+            variables=deepcopy(self.variables),
+            environment=(
+                dict(self.environment)
+                if self.environment is not None
+                else None
+            ),
+        )
+
+    def update_from(self, configuration: "Configuration") -> None:
+        copied = configuration.copy()
+        for field in fields(self):
+            setattr(self, field.name, getattr(copied, field.name))
+
+    @overload
+    def apply_overrides(
+        self, configuration: ValidateConfiguration
+    ) -> None: ...
+
     @overload
     def apply_overrides(self, configuration: PlanConfiguration) -> None: ...
 
@@ -177,11 +256,25 @@ class Configuration:
         match configuration:
             case ValidateConfiguration():
                 self.validate.json = configuration.json
+                self.validate.backend = configuration.backend
             case PlanConfiguration():
                 self.variables = configuration.variables
+                self.policy = configuration.policy
+                self.plan_store = configuration.plan_store
+                self.plan_output = configuration.plan_output
+                self.plan_details_path = configuration.plan_details_path
+                self.refresh = configuration.refresh
+                self.refresh_policy = configuration.refresh_policy
+                self.targets = configuration.targets
             case ApplyConfiguration():
                 self.variables = configuration.variables
                 self.auto_approve = configuration.auto_approve
+                self.policy = configuration.policy
+                self.plan_store = configuration.plan_store
+                self.unchanged_plan = configuration.unchanged_plan
+                self.refresh = configuration.refresh
+                self.refresh_policy = configuration.refresh_policy
+                self.targets = configuration.targets
             case DestroyConfiguration():
                 self.variables = configuration.variables
                 self.auto_approve = configuration.auto_approve
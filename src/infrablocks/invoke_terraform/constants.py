@@ -0,0 +1,2 @@
+DATA_DIRECTORY_ENVIRONMENT_VARIABLE = "TF_DATA_DIR"
+PLUGIN_CACHE_ENVIRONMENT_VARIABLE = "TF_PLUGIN_CACHE_DIR"
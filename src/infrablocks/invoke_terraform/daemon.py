@@ -0,0 +1,218 @@
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+from collections.abc import Callable, Generator, Mapping
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from threading import Lock
+from typing import Any
+
+from invoke.collection import Collection
+from invoke.loader import FilesystemLoader
+from invoke.program import Program
+
+from .cache import digest
+from .client import default_socket_path
+from .memoization import default_configuration_memo
+from .outputs import default_output_resolver
+from .terraform.console import default_console_pool
+
+type Message = dict[str, Any]
+type Send = Callable[[Message], None]
+
+
+class _ChannelStream(io.TextIOBase):
+    def __init__(self, name: str, send: Send):
+        self._name = name
+        self._send = send
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            self._send({"stream": self._name, "data": data})
+        return len(data)
+
+
+@contextmanager
+def _process_state(
+    cwd: str, environment: Mapping[str, str]
+) -> Generator[None]:
+    previous_cwd = os.getcwd()
+    previous_environment = dict(os.environ)
+    previous_stdin = sys.stdin
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(environment)
+    sys.stdin = io.StringIO()
+    try:
+        yield
+    finally:
+        sys.stdin = previous_stdin
+        os.environ.clear()
+        os.environ.update(previous_environment)
+        os.chdir(previous_cwd)
+
+
+def _clear_scope_caches() -> None:
+    default_configuration_memo.clear()
+    default_console_pool.close()
+
+
+def _exit_code(error: SystemExit) -> int:
+    match error.code:
+        case None:
+            return 0
+        case int(code):
+            return code
+        case message:
+            print(message, file=sys.stderr)
+            return 1
+
+
+class TaskDaemon:
+    def __init__(
+        self,
+        namespace: Collection,
+        socket_path: str | None = None,
+        binary: str = "invoke",
+    ):
+        self._namespace = namespace
+        self._socket_path = socket_path or default_socket_path()
+        self._binary = binary
+        self._lock = Lock()
+        self._server: socketserver.UnixStreamServer | None = None
+        self._request_scope: str | None = None
+
+    @staticmethod
+    def from_tasks(
+        collection_name: str | None = None,
+        search_root: str | None = None,
+        socket_path: str | None = None,
+    ) -> "TaskDaemon":
+        module, parent = FilesystemLoader(start=search_root).load(
+            collection_name
+        )
+        return TaskDaemon(
+            Collection.from_module(module, loaded_from=parent),
+            socket_path=socket_path,
+        )
+
+    @property
+    def socket_path(self) -> str:
+        return self._socket_path
+
+    def handle(self, request: Mapping[str, Any], send: Send) -> int:
+        stdout = _ChannelStream("stdout", send)
+        stderr = _ChannelStream("stderr", send)
+        cwd = request.get("cwd") or os.getcwd()
+        environment = request.get("environment") or dict(os.environ)
+        with (
+            self._lock,
+            _process_state(cwd, environment),
+            redirect_stdout(stdout),
+            redirect_stderr(stderr),
+        ):
+            scope = digest([cwd, environment])
+            if scope != self._request_scope:
+                _clear_scope_caches()
+                self._request_scope = scope
+            default_output_resolver.clear()
+            program = Program(namespace=self._namespace, binary=self._binary)
+            try:
+                program.run([self._binary, *request.get("argv", [])])
+            except SystemExit as error:
+                return _exit_code(error)
+            except Exception:
+                traceback.print_exc()
+                return 1
+            return 0
+
+    def serve_forever(self) -> None:
+        self._remove_stale_socket()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                def send(message: Message) -> None:
+                    self.wfile.write(json.dumps(message).encode() + b"\n")
+                    self.wfile.flush()
+
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    send({"exit": daemon.handle(json.loads(line), send)})
+                except OSError:
+                    pass
+
+        previous_umask = os.umask(0o077)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(
+                self._socket_path, Handler
+            )
+        finally:
+            os.umask(previous_umask)
+        server.daemon_threads = True
+        self._server = server
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._server = None
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self._socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self._socket_path)
+        except OSError:
+            os.unlink(self._socket_path)
+            return
+        finally:
+            probe.close()
+        raise ValueError(
+            f"Daemon already listening on socket: {self._socket_path}."
+        )
+
+
+def _terminate(_signal: int, _frame: object) -> None:
+    sys.exit(0)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m infrablocks.invoke_terraform.daemon"
+    )
+    parser.add_argument("--socket", dest="socket_path")
+    parser.add_argument("--collection", dest="collection_name")
+    parser.add_argument("--search-root")
+    arguments = parser.parse_args(argv)
+
+    daemon = TaskDaemon.from_tasks(
+        collection_name=arguments.collection_name,
+        search_root=arguments.search_root,
+        socket_path=arguments.socket_path,
+    )
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
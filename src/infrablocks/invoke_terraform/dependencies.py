@@ -0,0 +1,236 @@
+import os
+import re
+import shlex
+from collections.abc import Collection, Iterable, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .cache import JSONFileCache
+
+if TYPE_CHECKING:
+    from invoke.context import Context
+
+_LINE_COMMENT = re.compile(r"^\s*(#|//).*$", re.MULTILINE)
+_MODULE_HEADER = re.compile(r'^\s*module\s+"([^"]*)"\s*\{', re.MULTILINE)
+_SOURCE_ATTRIBUTE = re.compile(r'^\s*source\s*=\s*"([^"]*)"', re.MULTILINE)
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+type DirectorySignature = list[Any] | None
+
+
+def block_body(contents: str, start: int) -> str:
+    depth = 1
+    for index in range(start, len(contents)):
+        character = contents[index]
+        if character == "{":
+            depth += 1
+        elif character == "}":
+            depth -= 1
+            if depth == 0:
+                return contents[start:index]
+    return contents[start:]
+
+
+def strip_comments(contents: str) -> str:
+    return _LINE_COMMENT.sub("", contents)
+
+
+def module_calls(contents: str) -> list[tuple[str, str]]:
+    contents = strip_comments(contents)
+    calls: list[tuple[str, str]] = []
+    for header in _MODULE_HEADER.finditer(contents):
+        match = _SOURCE_ATTRIBUTE.search(block_body(contents, header.end()))
+        if match is not None:
+            calls.append((header.group(1), match.group(1)))
+    return calls
+
+
+def module_sources(contents: str) -> list[str]:
+    return [source for _, source in module_calls(contents)]
+
+
+def is_local_source(source: str) -> bool:
+    return source.startswith(("./", "../"))
+
+
+def directory_files(
+    directory: Path,
+    suffixes: tuple[str, ...],
+    names: Collection[str] = (),
+) -> list[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                (
+                    entry
+                    for entry in entries
+                    if (entry.name.endswith(suffixes) or entry.name in names)
+                    and entry.is_file()
+                ),
+                key=lambda entry: entry.name,
+            )
+    except OSError:
+        return []
+
+
+def terraform_files(directory: Path) -> list[os.DirEntry[str]]:
+    return directory_files(directory, (".tf",))
+
+
+def directory_signature(directory: Path) -> DirectorySignature:
+    try:
+        directory_mtime = directory.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    files: list[list[Any]] = []
+    for entry in terraform_files(directory):
+        stat = entry.stat()
+        files.append([entry.name, stat.st_mtime_ns, stat.st_size])
+
+    return [directory_mtime, files]
+
+
+def _read_local_modules(directory: Path) -> list[Path]:
+    modules: list[Path] = []
+    for entry in terraform_files(directory):
+        try:
+            with open(entry.path) as file:
+                contents = file.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for source in module_sources(contents):
+            if is_local_source(source):
+                module = (directory / source).resolve()
+                if module not in modules:
+                    modules.append(module)
+    return modules
+
+
+class ModuleDependencyIndex:
+    def __init__(self, cache: JSONFileCache | None = None):
+        self._cache = (
+            cache
+            if cache is not None
+            else JSONFileCache.named("module_dependencies")
+        )
+        self._directories: dict[str, Any] | None = None
+        self._dirty = False
+
+    def _entries(self) -> dict[str, Any]:
+        if self._directories is None:
+            contents = self._cache.load()
+            directories = contents.get("directories")
+            self._directories = (
+                directories if isinstance(directories, dict) else {}
+            )
+        return self._directories  # pyright: ignore[reportUnknownVariableType]
+
+    def local_modules(self, directory: str | Path) -> list[Path]:
+        directory = Path(directory).resolve()
+        signature = directory_signature(directory)
+        entries = self._entries()
+        key = str(directory)
+
+        entry = entries.get(key)
+        if entry is not None and entry["signature"] == signature:
+            return [Path(module) for module in entry["modules"]]
+
+        modules = _read_local_modules(directory)
+        entries[key] = {
+            "signature": signature,
+            "modules": [str(module) for module in modules],
+        }
+        self._dirty = True
+
+        return modules
+
+    def closure(self, root: str | Path) -> set[Path]:
+        pending = [Path(root).resolve()]
+        seen: set[Path] = set()
+        while pending:
+            directory = pending.pop()
+            if directory in seen:
+                continue
+            seen.add(directory)
+            pending.extend(self.local_modules(directory))
+        return seen
+
+    def affected_configurations(
+        self,
+        configurations: Mapping[str, str | Path],
+        changed_files: Iterable[str | Path],
+    ) -> list[str]:
+        changed = [Path(file).resolve() for file in changed_files]
+        affected = [
+            name
+            for name, directory in configurations.items()
+            if self._touches(self.closure(directory), changed)
+        ]
+        self.save()
+        return affected
+
+    @staticmethod
+    def _touches(closure: set[Path], changed_files: list[Path]) -> bool:
+        return any(
+            not closure.isdisjoint(file.parents) for file in changed_files
+        )
+
+    def save(self) -> None:
+        if self._dirty and self._directories is not None:
+            self._cache.store({"directories": self._directories})
+            self._dirty = False
+
+
+def _git(context: "Context", *arguments: str) -> str:
+    result = context.run(
+        " ".join(["git", *(shlex.quote(argument) for argument in arguments)]),
+        hide=True,
+    )
+    return result.stdout if result is not None else ""
+
+
+def changed_files(context: "Context", base_ref: str) -> list[Path]:
+    toplevel = Path(_git(context, "rev-parse", "--show-toplevel").strip())
+    merge_base = _git(context, "merge-base", base_ref, "HEAD").strip()
+    names = _git(context, "diff", "--name-only", merge_base).splitlines()
+    return [toplevel / name for name in names if name.strip()]
+
+
+def changed_lines(context: "Context", base_ref: str) -> dict[Path, set[int]]:
+    toplevel = Path(_git(context, "rev-parse", "--show-toplevel").strip())
+    merge_base = _git(context, "merge-base", base_ref, "HEAD").strip()
+    diff = _git(
+        context,
+        "diff",
+        "--unified=0",
+        "--no-color",
+        "--no-renames",
+        merge_base,
+    )
+
+    changes: dict[Path, set[int]] = {}
+    previous: str | None = None
+    current: set[int] | None = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            previous = (
+                line[len("--- a/") :] if line != "--- /dev/null" else None
+            )
+        elif line.startswith("+++ "):
+            name = line[len("+++ b/") :] if line != "+++ /dev/null" else None
+            name = name if name is not None else previous
+            current = (
+                changes.setdefault(toplevel / name, set())
+                if name is not None
+                else None
+            )
+        elif current is not None:
+            hunk = _HUNK_HEADER.match(line)
+            if hunk is not None:
+                start = int(hunk.group(1))
+                count = int(hunk.group(2) or "1")
+                current.update(
+                    range(max(start, 1), max(start, 1) + max(count, 1))
+                )
+    return changes
@@ -0,0 +1,180 @@
+import os
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .cache import JSONFileCache
+from .dependencies import block_body, strip_comments
+
+_TERRAFORM_HEADER = re.compile(r"^\s*terraform\s*\{", re.MULTILINE)
+_BACKEND_HEADER = re.compile(r'^\s*backend\s+"([^"]+)"\s*\{', re.MULTILINE)
+_CLOUD_HEADER = re.compile(r"^\s*cloud\s*\{", re.MULTILINE)
+_PROVIDER_HEADER = re.compile(r'^\s*provider\s+"([^"]+)"\s*\{', re.MULTILINE)
+
+DEFAULT_EXCLUDED_DIRECTORIES = frozenset({"node_modules"})
+
+
+@dataclass(frozen=True)
+class RootModule:
+    directory: Path
+    name: str
+    backend: str | None
+    providers: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _DirectoryScan:
+    subdirectories: list[Path]
+    signature: list[Any]
+    terraform_files: list[str]
+
+
+def _scan(directory: Path) -> _DirectoryScan | None:
+    try:
+        directory_mtime = directory.stat().st_mtime_ns
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+    except OSError:
+        return None
+
+    subdirectories: list[Path] = []
+    files: list[list[Any]] = []
+    terraform_files: list[str] = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirectories.append(Path(entry.path))
+        elif entry.name.endswith(".tf") and entry.is_file():
+            stat = entry.stat()
+            files.append([entry.name, stat.st_mtime_ns, stat.st_size])
+            terraform_files.append(entry.path)
+
+    return _DirectoryScan(
+        subdirectories=subdirectories,
+        signature=[directory_mtime, files],
+        terraform_files=terraform_files,
+    )
+
+
+def _describe(terraform_files: list[str]) -> dict[str, Any]:
+    backend: str | None = None
+    providers: set[str] = set()
+    for path in terraform_files:
+        try:
+            with open(path) as file:
+                contents = strip_comments(file.read())
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        for header in _TERRAFORM_HEADER.finditer(contents):
+            body = block_body(contents, header.end())
+            backend_match = _BACKEND_HEADER.search(body)
+            if backend_match is not None:
+                backend = backend_match.group(1)
+            elif _CLOUD_HEADER.search(body) is not None:
+                backend = "cloud"
+        providers.update(_PROVIDER_HEADER.findall(contents))
+
+    return {"backend": backend, "providers": sorted(providers)}
+
+
+def root_module_name(root: Path, directory: Path) -> str:
+    relative = directory.relative_to(root)
+    parts = relative.parts if relative.parts else (root.name,)
+    return "-".join(part.replace(".", "-") for part in parts)
+
+
+def _check_unique_names(modules: Iterable[RootModule]) -> None:
+    directories: dict[str, Path] = {}
+    for module in modules:
+        existing = directories.setdefault(module.name, module.directory)
+        if existing != module.directory:
+            raise ValueError(
+                f"Root modules {existing} and {module.directory} both map "
+                f"to the collection name {module.name!r}; rename one of "
+                "the directories or exclude it."
+            )
+
+
+class RootModuleIndex:
+    def __init__(
+        self,
+        cache: JSONFileCache | None = None,
+        excluded_directories: frozenset[str] = DEFAULT_EXCLUDED_DIRECTORIES,
+    ):
+        self._cache = (
+            cache if cache is not None else JSONFileCache.named("root_modules")
+        )
+        self._excluded_directories = excluded_directories
+        self._directories: dict[str, Any] | None = None
+        self._dirty = False
+
+    def _entries(self) -> dict[str, Any]:
+        if self._directories is None:
+            contents = self._cache.load()
+            directories = contents.get("directories")
+            self._directories = (
+                directories if isinstance(directories, dict) else {}
+            )
+        return self._directories  # pyright: ignore[reportUnknownVariableType]
+
+    def _walk(self, root: Path) -> Iterator[tuple[Path, _DirectoryScan]]:
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            scan = _scan(directory)
+            if scan is None:
+                continue
+            yield directory, scan
+            pending.extend(
+                reversed(
+                    [
+                        subdirectory
+                        for subdirectory in scan.subdirectories
+                        if not subdirectory.name.startswith(".")
+                        and subdirectory.name not in self._excluded_directories
+                    ]
+                )
+            )
+
+    def _entry(self, directory: Path, scan: _DirectoryScan) -> dict[str, Any]:
+        entries = self._entries()
+        key = str(directory)
+        entry = entries.get(key)
+        if entry is not None and entry["signature"] == scan.signature:
+            return entry
+
+        entry = {
+            "signature": scan.signature,
+            **_describe(scan.terraform_files),
+        }
+        entries[key] = entry
+        self._dirty = True
+        return entry
+
+    def discover(self, root: str | Path) -> list[RootModule]:
+        root = Path(root).resolve()
+        modules: list[RootModule] = []
+        for directory, scan in self._walk(root):
+            if not scan.terraform_files:
+                continue
+            entry = self._entry(directory, scan)
+            if entry["backend"] is None and not entry["providers"]:
+                continue
+            modules.append(
+                RootModule(
+                    directory=directory,
+                    name=root_module_name(root, directory),
+                    backend=entry["backend"],
+                    providers=tuple(entry["providers"]),
+                )
+            )
+        self.save()
+        _check_unique_names(modules)
+        return modules
+
+    def save(self) -> None:
+        if self._dirty and self._directories is not None:
+            self._cache.store({"directories": self._directories})
+            self._dirty = False
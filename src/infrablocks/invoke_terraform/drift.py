@@ -0,0 +1,269 @@
+import json
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Literal, cast
+
+from invoke.context import Context
+
+from infrablocks.invoke_factory import Arguments
+from infrablocks.invoke_terraform.terraform import (
+    WORKSPACE_ENVIRONMENT_VARIABLE,
+    TerraformFactory,
+)
+
+from .cache import JSONFileCache
+from .configuration import Configuration, ConfigureFunction
+from .constants import DATA_DIRECTORY_ENVIRONMENT_VARIABLE
+from .fingerprints import plan_key
+from .refresh import RefreshStore
+
+DEFAULT_MAXIMUM_WORKERS = 8
+DURATION_SMOOTHING = 0.5
+
+type DriftStatus = Literal["clean", "drifted", "failed"]
+type DriftMode = Literal["refresh-only", "plan"]
+
+
+@dataclass(frozen=True)
+class DriftTarget:
+    name: str
+    configure_function: ConfigureFunction[Configuration]
+    arguments: Arguments = field(default_factory=dict[str, Any])
+    workspace: str | None = None
+
+
+@dataclass(frozen=True)
+class DriftResult:
+    name: str
+    status: DriftStatus
+    duration: float
+    key: str | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class DriftReport:
+    results: Sequence[DriftResult]
+    maximum_workers: int
+    elapsed: float
+
+    def with_status(self, status: DriftStatus) -> list[DriftResult]:
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def drifted(self) -> list[DriftResult]:
+        return self.with_status("drifted")
+
+    @property
+    def failed(self) -> list[DriftResult]:
+        return self.with_status("failed")
+
+    def metrics(self) -> dict[str, float | int]:
+        durations = [result.duration for result in self.results]
+        return {
+            "targets": len(self.results),
+            "clean": len(self.with_status("clean")),
+            "drifted": len(self.drifted),
+            "failed": len(self.failed),
+            "maximum_workers": self.maximum_workers,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "total_seconds": round(sum(durations), 3),
+            "longest_seconds": round(max(durations, default=0.0), 3),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "metrics": self.metrics(),
+            "results": [
+                {
+                    key: value
+                    for key, value in asdict(result).items()
+                    if value is not None
+                }
+                for result in self.results
+            ],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def render(self) -> str:
+        lines = [
+            f"{len(self.drifted)} of {len(self.results)} targets drifted, "
+            f"{len(self.failed)} failed ({self.elapsed:.1f}s)."
+        ]
+        for result in self.results:
+            if result.status == "clean":
+                continue
+            lines.append(
+                f"  {result.name}: {result.status} ({result.duration:.1f}s)"
+                + (f": {result.error}" if result.error else "")
+            )
+        return "\n".join(lines)
+
+
+class DriftHistory:
+    def __init__(self, cache: JSONFileCache | None = None):
+        self._cache = (
+            cache if cache is not None else JSONFileCache.named("drift")
+        )
+
+    def entry(self, name: str) -> dict[str, Any]:
+        entry = self._cache.load().get(name)
+        if not isinstance(entry, dict):
+            return {}
+        return cast(dict[str, Any], entry)
+
+    def prioritise(self, targets: Iterable[DriftTarget]) -> list[DriftTarget]:
+        entries = self._cache.load()
+
+        def priority(target: DriftTarget) -> tuple[float, float]:
+            entry = entries.get(target.name)
+            if not isinstance(entry, dict):
+                return (0.0, float("-inf"))
+            values = cast(dict[str, Any], entry)
+            return (
+                -float(values.get("last_drift") or 0.0),
+                -float(values.get("duration") or 0.0),
+            )
+
+        return sorted(targets, key=priority)
+
+    def record(self, results: Iterable[DriftResult]) -> None:
+        contents = self._cache.load()
+        now = time.time()
+        for result in results:
+            previous = self.entry(result.name)
+            duration = previous.get("duration")
+            contents[result.name] = {
+                **previous,
+                "last_checked": now,
+                "last_status": result.status,
+                "duration": (
+                    result.duration
+                    if duration is None
+                    else DURATION_SMOOTHING * result.duration
+                    + (1 - DURATION_SMOOTHING) * float(duration)
+                ),
+                **({"last_drift": now} if result.status == "drifted" else {}),
+            }
+        self._cache.store(contents)
+
+
+class DriftDetector:
+    def __init__(
+        self,
+        terraform_factory: TerraformFactory = TerraformFactory(),
+        history: DriftHistory | None = None,
+        maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+        mode: DriftMode = "refresh-only",
+        refresh_store: RefreshStore | None = None,
+    ):
+        self._terraform_factory = terraform_factory
+        self._history = history
+        self._maximum_workers = maximum_workers
+        self._mode = mode
+        self._refresh_store = refresh_store
+
+    @property
+    def history(self) -> DriftHistory:
+        if self._history is None:
+            self._history = DriftHistory()
+        return self._history
+
+    def detect(
+        self, context: Context, targets: Iterable[DriftTarget]
+    ) -> DriftReport:
+        started = time.monotonic()
+        ordered = self.history.prioritise(targets)
+        with ThreadPoolExecutor(max_workers=self._maximum_workers) as executor:
+            results = list(
+                executor.map(partial(self._check, context), ordered)
+            )
+
+        self.history.record(results)
+        if self._refresh_store is not None:
+            for result in results:
+                if result.status == "drifted" and result.key is not None:
+                    self._refresh_store.report_drift(result.key)
+
+        return DriftReport(
+            results=results,
+            maximum_workers=self._maximum_workers,
+            elapsed=time.monotonic() - started,
+        )
+
+    def _check(self, context: Context, target: DriftTarget) -> DriftResult:
+        started = time.monotonic()
+        key: str | None = None
+        try:
+            configuration = self._configure(context, target)
+            key = plan_key(
+                configuration.source_directory, configuration.workspace
+            )
+            drifted = self._plan(context, configuration)
+        except Exception as error:
+            reason = str(error).strip().splitlines()
+            return DriftResult(
+                name=target.name,
+                status="failed",
+                duration=time.monotonic() - started,
+                key=key,
+                error=type(error).__name__
+                + (f": {reason[0]}" if reason else ""),
+            )
+        return DriftResult(
+            name=target.name,
+            status="drifted" if drifted else "clean",
+            duration=time.monotonic() - started,
+            key=key,
+        )
+
+    @staticmethod
+    def _configure(context: Context, target: DriftTarget) -> Configuration:
+        configuration = Configuration.create_empty()
+        target.configure_function(
+            Context(config=context.config),
+            dict(target.arguments),
+            configuration,
+        )
+        if target.workspace is not None:
+            data_directory = (
+                Path(configuration.source_directory).resolve()
+                / ".terraform"
+                / "drift"
+                / target.workspace
+            )
+            data_directory.mkdir(parents=True, exist_ok=True)
+            configuration.workspace = target.workspace
+            configuration.environment = {
+                **(configuration.environment or {}),
+                DATA_DIRECTORY_ENVIRONMENT_VARIABLE: str(data_directory),
+                WORKSPACE_ENVIRONMENT_VARIABLE: target.workspace,
+            }
+        return configuration
+
+    def _plan(self, context: Context, configuration: Configuration) -> bool:
+        terraform = self._terraform_factory.build(
+            Context(config=context.config)
+        )
+        if not configuration.init.skip:
+            terraform.init(
+                chdir=configuration.source_directory,
+                backend_config=configuration.init.backend_config,
+                reconfigure=configuration.init.reconfigure,
+                environment=configuration.environment,
+            )
+        return bool(
+            terraform.plan(
+                chdir=configuration.source_directory,
+                vars=configuration.variables,
+                environment=configuration.environment,
+                refresh_only=self._mode == "refresh-only",
+                detailed_exitcode=True,
+            )
+        )
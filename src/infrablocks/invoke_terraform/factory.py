@@ -1,3 +1,11 @@
+import os
+import sys
+from collections.abc import Sequence
+from dataclasses import replace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TypedDict
+
 from invoke.context import Context
 from invoke.tasks import Task
 
@@ -6,41 +14,105 @@ from infrablocks.invoke_factory import (
     BodyCallable,
     ParameterList,
     create_task,
+    parameter,
 )
 from infrablocks.invoke_terraform.terraform import (
+    PlanRenderer,
+    PlanReport,
+    PlanSummary,
     StreamNames,
     Terraform,
     TerraformFactory,
 )
 
 from .configuration import Configuration, ConfigureFunction
+from .dependencies import changed_lines
+from .fingerprints import plan_key
+from .sharding import DEFAULT_MAXIMUM_SHARDS, ShardedPlanner, ShardedPlanReport
+from .targeting import DEFAULT_BASE_REF, TargetSelector
+from .validation import ValidationCache, offline_environment
+from .watch import (
+    DEFAULT_DEBOUNCE,
+    DEFAULT_INTERVAL,
+    SourceWatcher,
+    WatchSession,
+)
+
+TASK_DESCRIPTIONS = {
+    "validate": "Validate the {} Terraform configuration.",
+    "plan": "Plan the {} Terraform configuration.",
+    "apply": "Apply the {} Terraform configuration.",
+    "destroy": "Destroy the {} Terraform configuration.",
+    "output": "Output from the {} Terraform configuration.",
+    "validate-plan": "Validate and plan the {} Terraform configuration.",
+    "plan-apply": (
+        "Plan and apply the saved plan of the {} Terraform configuration."
+    ),
+    "apply-output": ("Apply and output from the {} Terraform configuration."),
+    "refresh-only": (
+        "Refresh the state of the {} Terraform configuration without changes."
+    ),
+    "watch": (
+        "Watch the {} Terraform configuration, validating on every change."
+    ),
+    "plan-targeted": (
+        "Plan only the resources of the {} Terraform configuration touched "
+        "by changes (fast path)."
+    ),
+    "plan-sharded": (
+        "Plan the {} Terraform configuration in parallel shards "
+        "(experimental)."
+    ),
+    "plan-matrix": "Plan every matrix cell of the {} Terraform configuration.",
+    "apply-matrix": (
+        "Apply every matrix cell of the {} Terraform configuration."
+    ),
+    "plan-workspaces": (
+        "Plan every workspace of the {} Terraform configuration."
+    ),
+    "apply-workspaces": (
+        "Apply every workspace of the {} Terraform configuration."
+    ),
+    "output-workspaces": (
+        "Output from every workspace of the {} Terraform configuration."
+    ),
+}
+
+
+class RefreshOptions(TypedDict, total=False):
+    refresh: bool
+
+
+class TargetOptions(TypedDict, total=False):
+    targets: Sequence[str]
 
 
 class TerraformTaskFactory:
     def __init__(
-        self, terraform_factory: TerraformFactory = TerraformFactory()
+        self,
+        terraform_factory: TerraformFactory = TerraformFactory(),
+        validation_cache: ValidationCache | None = None,
     ):
         self._terraform_factory = terraform_factory
+        self._validation_cache = validation_cache
+
+    @staticmethod
+    def describe_task(task_name: str, configuration_name: str) -> str:
+        return TASK_DESCRIPTIONS[task_name].format(configuration_name)
 
     def create_plan_task(
         self,
         configuration_name: str,
         configure_function: ConfigureFunction[Configuration],
         parameters: ParameterList,
-    ) -> Task[BodyCallable[None]]:
-        def plan(context: Context, arguments: Arguments):
+    ) -> Task[BodyCallable[PlanReport | None]]:
+        def plan(context: Context, arguments: Arguments) -> PlanReport | None:
             (terraform, configuration) = self._setup_configuration(
                 configure_function, context, arguments
             )
-            terraform.plan(
-                chdir=configuration.source_directory,
-                vars=configuration.variables,
-                environment=configuration.environment,
-            )
+            return self._plan(terraform, configuration)
 
-        plan.__doc__ = (
-            f"Plan the {configuration_name} Terraform configuration."
-        )
+        plan.__doc__ = self.describe_task("plan", configuration_name)
 
         return create_task(plan, parameters)
 
@@ -49,21 +121,14 @@ class TerraformTaskFactory:
         configuration_name: str,
         configure_function: ConfigureFunction[Configuration],
         parameters: ParameterList,
-    ) -> Task[BodyCallable[None]]:
-        def apply(context: Context, arguments: Arguments):
+    ) -> Task[BodyCallable[PlanReport | None]]:
+        def apply(context: Context, arguments: Arguments) -> PlanReport | None:
             (terraform, configuration) = self._setup_configuration(
                 configure_function, context, arguments
             )
-            terraform.apply(
-                chdir=configuration.source_directory,
-                vars=configuration.variables,
-                autoapprove=configuration.auto_approve,
-                environment=configuration.environment,
-            )
+            return self._apply(terraform, configuration, configuration_name)
 
-        apply.__doc__ = (
-            f"Apply the {configuration_name} Terraform configuration."
-        )
+        apply.__doc__ = self.describe_task("apply", configuration_name)
 
         return create_task(apply, parameters)
 
@@ -84,9 +149,7 @@ class TerraformTaskFactory:
                 environment=configuration.environment,
             )
 
-        destroy.__doc__ = (
-            f"Destroy the {configuration_name} Terraform configuration."
-        )
+        destroy.__doc__ = self.describe_task("destroy", configuration_name)
 
         return create_task(destroy, parameters)
 
@@ -97,18 +160,24 @@ class TerraformTaskFactory:
         parameters: ParameterList,
     ) -> Task[BodyCallable[None]]:
         def validate(context: Context, arguments: Arguments):
-            (terraform, configuration) = self._setup_configuration(
+            configuration = self._configure(
                 configure_function, context, arguments
             )
-            terraform.validate(
-                chdir=configuration.source_directory,
-                json=configuration.validate.json,
-                environment=configuration.environment,
+            if not configuration.validate.backend:
+                self._validate_offline(
+                    self._terraform_factory.build(context),
+                    configuration,
+                    configuration_name,
+                )
+                return
+
+            (terraform, configuration) = self._initialise(
+                configuration, context
             )
+            self._select_workspace(terraform, configuration)
+            self._validate(terraform, configuration)
 
-        validate.__doc__ = (
-            f"Validate the {configuration_name} Terraform configuration."
-        )
+        validate.__doc__ = self.describe_task("validate", configuration_name)
 
         return create_task(validate, parameters)
 
@@ -122,53 +191,605 @@ class TerraformTaskFactory:
             (terraform, configuration) = self._setup_configuration(
                 configure_function, context, arguments
             )
+            return self._output(terraform, configuration)
+
+        output.__doc__ = self.describe_task("output", configuration_name)
+
+        return create_task(output, parameters)
+
+    def create_validate_plan_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+    ) -> Task[BodyCallable[PlanReport | None]]:
+        def validate_plan(
+            context: Context, arguments: Arguments
+        ) -> PlanReport | None:
+            (terraform, configuration) = self._setup_configuration(
+                configure_function, context, arguments
+            )
+            self._validate(terraform, configuration)
+            return self._plan(terraform, configuration)
+
+        validate_plan.__doc__ = self.describe_task(
+            "validate-plan", configuration_name
+        )
+
+        return create_task(validate_plan, parameters)
+
+    def create_plan_apply_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+    ) -> Task[BodyCallable[PlanReport | None]]:
+        def plan_apply(
+            context: Context, arguments: Arguments
+        ) -> PlanReport | None:
+            (terraform, configuration) = self._setup_configuration(
+                configure_function, context, arguments
+            )
+            with TemporaryDirectory() as directory:
+                plan_file = os.path.join(directory, "plan.tfplan")
+                if not self._uses_saved_plan(configuration):
+                    self._run_plan(terraform, configuration, plan_file)
+                    self._confirm_apply(configuration, configuration_name)
+                    terraform.apply(
+                        chdir=configuration.source_directory,
+                        autoapprove=configuration.auto_approve,
+                        environment=configuration.environment,
+                        plan_file=plan_file,
+                    )
+                    return None
+
+                return self._apply_saved_plan(
+                    terraform, configuration, configuration_name, plan_file
+                )
+
+        plan_apply.__doc__ = self.describe_task(
+            "plan-apply", configuration_name
+        )
+
+        return create_task(plan_apply, parameters)
+
+    def create_apply_output_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+    ) -> Task[BodyCallable[str | None]]:
+        def apply_output(context: Context, arguments: Arguments) -> str | None:
+            (terraform, configuration) = self._setup_configuration(
+                configure_function, context, arguments
+            )
+            self._apply(terraform, configuration, configuration_name)
+            return self._output(terraform, configuration)
 
-            capture: StreamNames | None = None
-            if configuration.output.capture_stdout:
-                capture = {"stdout"}
+        apply_output.__doc__ = self.describe_task(
+            "apply-output", configuration_name
+        )
 
-            result = terraform.output(
+        return create_task(apply_output, parameters)
+
+    def create_refresh_only_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+    ) -> Task[BodyCallable[None]]:
+        def refresh_only(context: Context, arguments: Arguments):
+            (terraform, configuration) = self._setup_configuration(
+                configure_function, context, arguments
+            )
+            terraform.apply(
                 chdir=configuration.source_directory,
-                capture=capture,
-                json=configuration.output.json,
+                vars=configuration.variables,
+                autoapprove=configuration.auto_approve,
                 environment=configuration.environment,
+                refresh_only=True,
             )
+            self._record_refresh(configuration, {})
 
-            if (
-                configuration.output.capture_stdout
-                and result.stdout is not None
-            ):
-                output = result.stdout.read()
-                return output.strip()
+        refresh_only.__doc__ = self.describe_task(
+            "refresh-only", configuration_name
+        )
 
-            return None
+        return create_task(refresh_only, parameters)
 
-        output.__doc__ = (
-            f"Output from the {configuration_name} Terraform configuration."
+    def create_watch_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> Task[BodyCallable[None]]:
+        def watch(context: Context, arguments: Arguments):
+            configuration = self._configure(
+                configure_function, context, arguments
+            )
+            watcher = SourceWatcher(
+                configuration.source_directory,
+                interval=interval,
+                debounce=debounce,
+                requests=sys.stdin if sys.stdin.isatty() else None,
+            )
+            print(
+                f"Watching {configuration_name}; press enter to plan "
+                + "without refresh, q to quit.",
+                file=sys.stderr,
+            )
+            try:
+                WatchSession(
+                    self._terraform_factory.build(context),
+                    configuration,
+                    configuration_name,
+                ).run(watcher)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                watcher.close()
+
+        watch.__doc__ = self.describe_task("watch", configuration_name)
+
+        return create_task(watch, parameters)
+
+    def create_targeted_plan_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+        base_ref: str = DEFAULT_BASE_REF,
+        selector: TargetSelector | None = None,
+    ) -> Task[BodyCallable[PlanReport | None]]:
+        def plan_targeted(
+            context: Context, arguments: Arguments
+        ) -> PlanReport | None:
+            (terraform, configuration) = self._setup_configuration(
+                configure_function, context, arguments
+            )
+            selection = (selector or TargetSelector()).select(
+                terraform,
+                configuration.source_directory,
+                changed_lines(
+                    context, str(arguments.get("base_ref") or base_ref)
+                ),
+                environment=configuration.environment,
+            )
+            if selection is None:
+                print(
+                    f"Changes to {configuration_name} cannot be mapped to "
+                    + "resource addresses; running a full plan.",
+                    file=sys.stderr,
+                )
+            elif not selection.targets:
+                print(
+                    f"No resources of {configuration_name} are touched by "
+                    + "changes; skipping plan.",
+                    file=sys.stderr,
+                )
+                return None
+            else:
+                configuration.targets = selection.targets
+            return self._plan(terraform, configuration)
+
+        plan_targeted.__doc__ = self.describe_task(
+            "plan-targeted", configuration_name
         )
 
-        return create_task(output, parameters)
+        return create_task(
+            plan_targeted,
+            [
+                *parameters,
+                parameter(
+                    name="base_ref",
+                    help="Plan only resources changed since this git ref.",
+                    default=base_ref,
+                ),
+            ],
+        )
 
-    def _setup_configuration(
+    def create_sharded_plan_task(
+        self,
+        configuration_name: str,
+        configure_function: ConfigureFunction[Configuration],
+        parameters: ParameterList,
+        maximum_shards: int = DEFAULT_MAXIMUM_SHARDS,
+        planner: ShardedPlanner | None = None,
+    ) -> Task[BodyCallable[ShardedPlanReport]]:
+        def plan_sharded(
+            context: Context, arguments: Arguments
+        ) -> ShardedPlanReport:
+            (terraform, configuration) = self._setup_configuration(
+                configure_function, context, arguments
+            )
+            print(
+                "Warning: sharded planning is experimental; shards plan "
+                + "with -lock=false and are checked against a state "
+                + "snapshot taken before and after.",
+                file=sys.stderr,
+            )
+            report = (
+                planner
+                or ShardedPlanner(
+                    terraform_factory=self._terraform_factory,
+                    maximum_shards=maximum_shards,
+                )
+            ).plan(context, configuration)
+            print(report.render(), file=sys.stderr)
+            if report.fallback is not None:
+                print(
+                    f"Running a full plan of {configuration_name}.",
+                    file=sys.stderr,
+                )
+                self._plan(terraform, configuration)
+            return report
+
+        plan_sharded.__doc__ = self.describe_task(
+            "plan-sharded", configuration_name
+        )
+
+        return create_task(plan_sharded, parameters)
+
+    @staticmethod
+    def _validate(terraform: Terraform, configuration: Configuration) -> None:
+        terraform.validate(
+            chdir=configuration.source_directory,
+            json=configuration.validate.json,
+            environment=configuration.environment,
+        )
+
+    def _validate_offline(
         self,
+        terraform: Terraform,
+        configuration: Configuration,
+        configuration_name: str,
+    ) -> None:
+        if self._validation_cache is None:
+            self._validation_cache = ValidationCache()
+        cache = self._validation_cache
+        source_directory = configuration.source_directory
+
+        digest = cache.source_digest(source_directory)
+        if not configuration.validate.json and cache.matches(
+            source_directory, digest
+        ):
+            print(
+                f"Configuration {configuration_name} is unchanged since it "
+                + "last validated; skipping validate.",
+                file=sys.stderr,
+            )
+            return
+
+        environment = offline_environment(
+            source_directory, configuration.environment
+        )
+        terraform.init(
+            chdir=source_directory, environment=environment, backend=False
+        )
+        terraform.validate(
+            chdir=source_directory,
+            json=configuration.validate.json,
+            environment=environment,
+        )
+        cache.record(source_directory, digest)
+
+    @staticmethod
+    def _plan(
+        terraform: Terraform, configuration: Configuration
+    ) -> PlanReport | None:
+        if not TerraformTaskFactory._uses_saved_plan(configuration):
+            TerraformTaskFactory._run_plan(terraform, configuration)
+            return None
+
+        with TemporaryDirectory() as directory:
+            return TerraformTaskFactory._plan_and_report(
+                terraform,
+                configuration,
+                os.path.join(directory, "plan.tfplan"),
+            )
+
+    @staticmethod
+    def _apply(
+        terraform: Terraform,
+        configuration: Configuration,
+        configuration_name: str,
+    ) -> PlanReport | None:
+        if not TerraformTaskFactory._uses_saved_plan(configuration):
+            refresh = TerraformTaskFactory._refresh_options(configuration)
+            targets = TerraformTaskFactory._target_options(configuration)
+            terraform.apply(
+                chdir=configuration.source_directory,
+                vars=configuration.variables,
+                autoapprove=configuration.auto_approve,
+                environment=configuration.environment,
+                **refresh,
+                **targets,
+            )
+            TerraformTaskFactory._record_refresh(configuration, refresh)
+            return None
+
+        with TemporaryDirectory() as directory:
+            return TerraformTaskFactory._apply_saved_plan(
+                terraform,
+                configuration,
+                configuration_name,
+                os.path.join(directory, "plan.tfplan"),
+            )
+
+    @staticmethod
+    def _apply_saved_plan(
+        terraform: Terraform,
+        configuration: Configuration,
+        configuration_name: str,
+        plan_file: str,
+    ) -> PlanReport:
+        report = TerraformTaskFactory._plan_and_report(
+            terraform, configuration, plan_file
+        )
+        store = configuration.plan_store
+        key = plan_key(configuration.source_directory, configuration.workspace)
+        if (
+            store is not None
+            and configuration.unchanged_plan != "apply"
+            and store.matches(key, report.summary.fingerprint)
+        ):
+            skip = configuration.unchanged_plan == "skip"
+            print(
+                f"Plan for {configuration_name} matches the "
+                + "previously approved plan"
+                + ("; skipping apply." if skip else "."),
+                file=sys.stderr,
+            )
+            if skip:
+                return report
+
+        TerraformTaskFactory._confirm_apply(configuration, configuration_name)
+        terraform.apply(
+            chdir=configuration.source_directory,
+            autoapprove=configuration.auto_approve,
+            environment=configuration.environment,
+            plan_file=plan_file,
+        )
+        if store is not None:
+            store.approve(key, report.summary)
+        return replace(report, applied=True)
+
+    @staticmethod
+    def _confirm_apply(
+        configuration: Configuration, configuration_name: str
+    ) -> None:
+        if configuration.auto_approve:
+            return
+        print(
+            f"Apply the plan above to {configuration_name}? "
+            + "Only 'yes' will be accepted to approve.",
+            file=sys.stderr,
+        )
+        try:
+            answer = input("Enter a value: ")
+        except EOFError:
+            answer = ""
+        if answer.strip() != "yes":
+            raise ValueError(f"Apply of {configuration_name} was cancelled.")
+
+    @staticmethod
+    def _output(
+        terraform: Terraform, configuration: Configuration
+    ) -> str | None:
+        capture: StreamNames | None = None
+        if configuration.output.capture_stdout:
+            capture = {"stdout"}
+
+        result = terraform.output(
+            chdir=configuration.source_directory,
+            capture=capture,
+            json=configuration.output.json,
+            environment=configuration.environment,
+        )
+
+        if configuration.output.capture_stdout and result.stdout is not None:
+            output = result.stdout.read()
+            return output.strip()
+
+        return None
+
+    @staticmethod
+    def _uses_saved_plan(configuration: Configuration) -> bool:
+        return (
+            configuration.policy is not None
+            or configuration.plan_store is not None
+        )
+
+    @staticmethod
+    def _run_plan(
+        terraform: Terraform,
+        configuration: Configuration,
+        plan_file: str | None = None,
+    ) -> None:
+        refresh = TerraformTaskFactory._refresh_options(configuration)
+        targets = TerraformTaskFactory._target_options(configuration)
+        if configuration.plan_output == "condensed":
+            details_path = configuration.plan_details_path or os.path.join(
+                configuration.source_directory,
+                ".terraform",
+                "plan-details.jsonl.gz",
+            )
+            PlanRenderer(sys.stdout, Path(details_path)).render(
+                terraform.stream_plan(
+                    chdir=configuration.source_directory,
+                    vars=configuration.variables,
+                    environment=configuration.environment,
+                    out=plan_file,
+                    **refresh,
+                    **targets,
+                )
+            )
+        elif plan_file is not None:
+            terraform.plan(
+                chdir=configuration.source_directory,
+                vars=configuration.variables,
+                environment=configuration.environment,
+                out=plan_file,
+                **refresh,
+                **targets,
+            )
+        else:
+            terraform.plan(
+                chdir=configuration.source_directory,
+                vars=configuration.variables,
+                environment=configuration.environment,
+                **refresh,
+                **targets,
+            )
+        TerraformTaskFactory._record_refresh(configuration, refresh)
+
+    @staticmethod
+    def _refresh_options(configuration: Configuration) -> RefreshOptions:
+        policy = configuration.refresh_policy
+        if not configuration.refresh:
+            return {"refresh": False}
+        if policy is not None and not policy.should_refresh(
+            plan_key(configuration.source_directory, configuration.workspace)
+        ):
+            print(
+                "State was refreshed within "
+                + f"{policy.maximum_age:g}s and no drift was reported; "
+                + "skipping refresh.",
+                file=sys.stderr,
+            )
+            return {"refresh": False}
+        return {}
+
+    @staticmethod
+    def _target_options(configuration: Configuration) -> TargetOptions:
+        if configuration.targets is None:
+            return {}
+        print(
+            "Warning: fast path; only "
+            + ", ".join(configuration.targets)
+            + " and their dependencies are planned. Changes to other "
+            + "resources, including resources depending on these, are not "
+            + "shown. Run a full plan before relying on the result.",
+            file=sys.stderr,
+        )
+        return {"targets": configuration.targets}
+
+    @staticmethod
+    def _record_refresh(
+        configuration: Configuration, refresh: RefreshOptions
+    ) -> None:
+        policy = configuration.refresh_policy
+        if (
+            policy is not None
+            and configuration.targets is None
+            and refresh.get("refresh", True)
+        ):
+            policy.store.record_refresh(
+                plan_key(
+                    configuration.source_directory, configuration.workspace
+                )
+            )
+
+    @staticmethod
+    def _plan_and_report(
+        terraform: Terraform,
+        configuration: Configuration,
+        plan_file: str,
+    ) -> PlanReport:
+        TerraformTaskFactory._run_plan(terraform, configuration, plan_file)
+        plan = terraform.load_plan(
+            plan_file,
+            chdir=configuration.source_directory,
+            environment=configuration.environment,
+        )
+        summary = PlanSummary.of(plan)
+
+        policy_result = None
+        if configuration.policy is not None:
+            policy_result = configuration.policy.evaluate(plan)
+            if configuration.policy.enforce:
+                policy_result.raise_for_violations()
+            elif policy_result.violations:
+                print(
+                    "Warning: plan violates advisory policy:\n"
+                    + "\n".join(
+                        f"  {violation}"
+                        for violation in policy_result.violations
+                    ),
+                    file=sys.stderr,
+                )
+
+        diff = None
+        if configuration.plan_store is not None:
+            approved = configuration.plan_store.approved(
+                plan_key(
+                    configuration.source_directory, configuration.workspace
+                )
+            )
+            if approved is not None:
+                diff = summary.diff(approved)
+                if not diff.is_empty:
+                    print(diff.render(), file=sys.stderr)
+
+        return PlanReport(summary=summary, diff=diff, policy=policy_result)
+
+    @staticmethod
+    def _configure(
         configure_function: ConfigureFunction[Configuration],
         context: Context,
         arguments: Arguments,
-    ) -> tuple[Terraform, Configuration]:
+    ) -> Configuration:
         configuration = Configuration.create_empty()
         configure_function(
             context,
             arguments,
             configuration,
         )
+        return configuration
+
+    def initialise(
+        self,
+        configure_function: ConfigureFunction[Configuration],
+        context: Context,
+        arguments: Arguments,
+    ) -> tuple[Terraform, Configuration]:
+        return self._initialise(
+            self._configure(configure_function, context, arguments), context
+        )
+
+    def _initialise(
+        self, configuration: Configuration, context: Context
+    ) -> tuple[Terraform, Configuration]:
         terraform = self._terraform_factory.build(context)
-        terraform.init(
-            chdir=configuration.source_directory,
-            backend_config=configuration.init.backend_config,
-            reconfigure=configuration.init.reconfigure,
-            environment=configuration.environment,
+        if not configuration.init.skip:
+            terraform.init(
+                chdir=configuration.source_directory,
+                backend_config=configuration.init.backend_config,
+                reconfigure=configuration.init.reconfigure,
+                environment=configuration.environment,
+            )
+
+        return terraform, configuration
+
+    def _setup_configuration(
+        self,
+        configure_function: ConfigureFunction[Configuration],
+        context: Context,
+        arguments: Arguments,
+    ) -> tuple[Terraform, Configuration]:
+        terraform, configuration = self.initialise(
+            configure_function, context, arguments
         )
+        self._select_workspace(terraform, configuration)
+
+        return terraform, configuration
 
+    @staticmethod
+    def _select_workspace(
+        terraform: Terraform, configuration: Configuration
+    ) -> None:
         if configuration.workspace is not None:
             terraform.select_workspace(
                 configuration.workspace,
@@ -176,5 +797,3 @@ class TerraformTaskFactory:
                 or_create=True,
                 environment=configuration.environment,
             )
-
-        return terraform, configuration
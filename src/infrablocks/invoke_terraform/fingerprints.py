@@ -0,0 +1,47 @@
+import hashlib
+from pathlib import Path
+
+from infrablocks.invoke_terraform.terraform.summary import PlanSummary
+
+from .cache import JSONFileCache, default_cache_directory
+
+
+def plan_key(source_directory: str, workspace: str | None) -> str:
+    return f"{Path(source_directory).resolve()}#{workspace or 'default'}"
+
+
+class PlanFingerprintStore:
+    def __init__(self, directory: Path | None = None):
+        self._directory = (
+            directory
+            if directory is not None
+            else default_cache_directory() / "plans"
+        )
+        self._index = JSONFileCache(self._directory / "fingerprints.json")
+        self._fingerprints: dict[str, str] | None = None
+
+    def _summary_cache(self, key: str) -> JSONFileCache:
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return JSONFileCache.named(name, self._directory / "summaries")
+
+    def fingerprints(self) -> dict[str, str]:
+        if self._fingerprints is None:
+            self._fingerprints = self._index.load()
+        return self._fingerprints
+
+    def matches(self, key: str, fingerprint: str) -> bool:
+        return self.fingerprints().get(key) == fingerprint
+
+    def approved(self, key: str) -> PlanSummary | None:
+        if key not in self.fingerprints():
+            return None
+        contents = self._summary_cache(key).load()
+        if contents.get("fingerprint") != self.fingerprints()[key]:
+            return None
+        return PlanSummary.from_dict(contents)
+
+    def approve(self, key: str, summary: PlanSummary) -> None:
+        self._summary_cache(key).store(summary.to_dict())
+        fingerprints = {**self._index.load(), key: summary.fingerprint}
+        self._index.store(fingerprints)
+        self._fingerprints = fingerprints
@@ -0,0 +1,301 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self, TypedDict, Unpack, cast
+
+from invoke.collection import Collection
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import (
+    Arguments,
+    BodyCallable,
+    ParameterList,
+    create_task,
+    parameter,
+)
+
+from .collection import TerraformTaskCollection
+from .configuration import Configuration
+from .dependencies import ModuleDependencyIndex, changed_files
+from .discovery import RootModule, RootModuleIndex
+from .drift import DriftDetector, DriftReport
+from .invocation import run_task_with_defaults
+from .lazy import LazyCollection
+from .lint import Linter, LintReport
+
+
+@dataclass(frozen=True)
+class GroupMember:
+    collection: TerraformTaskCollection
+    source_directory: str
+
+    @property
+    def configuration_name(self) -> str:
+        if self.collection.configuration_name is None:
+            raise ValueError(
+                "Configuration name must be set on group members."
+            )
+        return self.collection.configuration_name
+
+
+class TerraformTaskCollectionGroupParameters(TypedDict, total=False):
+    group_name: str
+    members: Sequence[GroupMember]
+    dependency_index: ModuleDependencyIndex | None
+    linter: Linter | None
+    drift_detector: DriftDetector | None
+
+
+def _collection_for_module(
+    template: TerraformTaskCollection, module: RootModule
+) -> TerraformTaskCollection:
+    template_configure_function = template.global_configure_function
+
+    def configure(
+        context: Context, arguments: Arguments, configuration: Configuration
+    ):
+        template_configure_function(context, arguments, configuration)
+        configuration.source_directory = str(module.directory)
+
+    return template.for_configuration(
+        module.name
+    ).with_global_configure_function(configure)
+
+
+class TerraformTaskCollectionGroup:
+    def __init__(
+        self,
+        group_name: str | None = None,
+        members: Sequence[GroupMember] | None = None,
+        dependency_index: ModuleDependencyIndex | None = None,
+        linter: Linter | None = None,
+        drift_detector: DriftDetector | None = None,
+    ):
+        self.group_name = group_name
+        self.members: Sequence[GroupMember] = (
+            members if members is not None else []
+        )
+        self._dependency_index = dependency_index
+        self._linter = linter
+        self._drift_detector = drift_detector
+
+    def _clone(
+        self, **kwargs: Unpack[TerraformTaskCollectionGroupParameters]
+    ) -> Self:
+        return self.__class__(
+            group_name=kwargs.get("group_name", self.group_name),
+            members=kwargs.get("members", self.members),
+            dependency_index=kwargs.get(
+                "dependency_index", self._dependency_index
+            ),
+            linter=kwargs.get("linter", self._linter),
+            drift_detector=kwargs.get("drift_detector", self._drift_detector),
+        )
+
+    def for_group(self, group_name: str) -> Self:
+        return self._clone(group_name=group_name)
+
+    def with_configuration(
+        self, collection: TerraformTaskCollection, source_directory: str
+    ) -> Self:
+        return self._clone(
+            members=[
+                *self.members,
+                GroupMember(
+                    collection=collection, source_directory=source_directory
+                ),
+            ]
+        )
+
+    def with_discovered_configurations(
+        self,
+        root: str | Path,
+        template: TerraformTaskCollection,
+        index: RootModuleIndex | None = None,
+    ) -> Self:
+        index = index if index is not None else RootModuleIndex()
+        group = self
+        for module in index.discover(root):
+            group = group.with_configuration(
+                _collection_for_module(template, module),
+                str(module.directory),
+            )
+        return group
+
+    def with_dependency_index(
+        self, dependency_index: ModuleDependencyIndex
+    ) -> Self:
+        return self._clone(dependency_index=dependency_index)
+
+    def with_linter(self, linter: Linter) -> Self:
+        return self._clone(linter=linter)
+
+    def with_drift_detector(self, drift_detector: DriftDetector) -> Self:
+        return self._clone(drift_detector=drift_detector)
+
+    @property
+    def drift_detector(self) -> DriftDetector:
+        if self._drift_detector is None:
+            self._drift_detector = DriftDetector()
+        return self._drift_detector
+
+    @property
+    def linter(self) -> Linter:
+        if self._linter is None:
+            self._linter = Linter()
+        return self._linter
+
+    @property
+    def dependency_index(self) -> ModuleDependencyIndex:
+        if self._dependency_index is None:
+            self._dependency_index = ModuleDependencyIndex()
+        return self._dependency_index
+
+    def select_configurations(
+        self, context: Context, affected_since: str | None = None
+    ) -> list[str]:
+        names = [member.configuration_name for member in self.members]
+        if not affected_since:
+            return names
+
+        return self.dependency_index.affected_configurations(
+            {
+                member.configuration_name: member.source_directory
+                for member in self.members
+            },
+            changed_files(context, affected_since),
+        )
+
+    def _group_parameters(self) -> ParameterList:
+        return [
+            parameter(
+                name="affected_since",
+                help=(
+                    "Only run configurations affected by changes since this "
+                    "git ref."
+                ),
+                default=None,
+            )
+        ]
+
+    def _create_group_task(
+        self,
+        task_name: str,
+        collections: dict[str, Collection],
+    ) -> Task[BodyCallable[None]]:
+        def run(context: Context, arguments: Arguments):
+            affected_since = arguments.get("affected_since")
+            for name in self.select_configurations(
+                context,
+                str(affected_since) if affected_since else None,
+            ):
+                run_task_with_defaults(
+                    cast(Task[Any], collections[name].tasks[task_name]),
+                    context,
+                )
+
+        run.__name__ = task_name
+        run.__doc__ = (
+            f"{task_name.capitalize()} the Terraform configurations in the "
+            f"{self.group_name} group."
+        )
+
+        return create_task(run, self._group_parameters())
+
+    def _create_lint_task(self) -> Task[BodyCallable[LintReport]]:
+        def lint(context: Context, arguments: Arguments) -> LintReport:
+            affected_since = arguments.get("affected_since")
+            selected = set(
+                self.select_configurations(
+                    context,
+                    str(affected_since) if affected_since else None,
+                )
+            )
+            report = self.linter.lint(
+                context,
+                {
+                    member.configuration_name: member.source_directory
+                    for member in self.members
+                    if member.configuration_name in selected
+                },
+            )
+            print(report.render())
+            report.raise_for_failures()
+            return report
+
+        lint.__doc__ = (
+            f"Check formatting and validate the Terraform configurations in "
+            f"the {self.group_name} group."
+        )
+
+        return create_task(lint, self._group_parameters())
+
+    def _create_drift_task(self) -> Task[BodyCallable[DriftReport]]:
+        def drift(context: Context, arguments: Arguments) -> DriftReport:
+            affected_since = arguments.get("affected_since")
+            selected = set(
+                self.select_configurations(
+                    context,
+                    str(affected_since) if affected_since else None,
+                )
+            )
+            report = self.drift_detector.detect(
+                context,
+                [
+                    target
+                    for member in self.members
+                    if member.configuration_name in selected
+                    for target in member.collection.drift_targets()
+                ],
+            )
+            print(report.render())
+            report_path = arguments.get("report")
+            if report_path:
+                Path(str(report_path)).write_text(report.to_json())
+            return report
+
+        drift.__doc__ = (
+            f"Detect drift across the Terraform configurations in the "
+            f"{self.group_name} group."
+        )
+
+        return create_task(
+            drift,
+            [
+                *self._group_parameters(),
+                parameter(
+                    name="report",
+                    help="Write the drift report as JSON to this path.",
+                    default=None,
+                ),
+            ],
+        )
+
+    def create(self) -> Collection:
+        if self.group_name is None:
+            raise ValueError("Group name must be set before creating.")
+
+        collection = Collection(self.group_name)
+        collections: dict[str, Collection] = {}
+        for member in self.members:
+            member_collection = LazyCollection(
+                member.configuration_name, member.collection.create
+            )
+            collections[member.configuration_name] = member_collection
+            collection.add_collection(  # pyright: ignore[reportUnknownMemberType]
+                member_collection
+            )
+
+        for task_name in ["plan", "apply"]:
+            collection.add_task(  # pyright: ignore[reportUnknownMemberType]
+                self._create_group_task(task_name, collections)
+            )
+        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
+            self._create_lint_task()
+        )
+        collection.add_task(  # pyright: ignore[reportUnknownMemberType]
+            self._create_drift_task()
+        )
+
+        return collection
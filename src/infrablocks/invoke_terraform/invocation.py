@@ -0,0 +1,19 @@
+import inspect
+from typing import Any
+
+from invoke.context import Context
+from invoke.tasks import Task
+
+
+def run_task_with_defaults(
+    task: Task[Any], context: Context, **arguments: Any
+) -> Any:
+    signature = task.argspec(  # pyright: ignore[reportUnknownMemberType]
+        task.body  # pyright: ignore[reportUnknownMemberType]
+    )
+    defaults = {
+        name: signature_parameter.default
+        for name, signature_parameter in signature.parameters.items()
+        if signature_parameter.kind is inspect.Parameter.KEYWORD_ONLY
+    }
+    return task(context, **{**defaults, **arguments})
@@ -0,0 +1,125 @@
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from invoke.collection import Collection
+from invoke.parser.argument import Argument
+from invoke.tasks import Task
+from invoke.vendor.lexicon import Lexicon
+
+from infrablocks.invoke_factory import ParameterList
+
+
+class LazyCollection(Collection):
+    def __init__(self, name: str, factory: Callable[[], Collection]):
+        self._factory: Callable[[], Collection] | None = factory
+        super().__init__(name)
+
+    def _materialise(self) -> None:
+        factory = self._factory
+        if factory is None:
+            return
+        self._factory = None
+
+        built = factory()
+        self._tasks = built.tasks
+        self._collections = built.collections
+        self._default = built.default
+        self._configuration = {
+            **built.configuration(),
+            **self._configuration,
+        }
+
+    @property
+    def is_materialised(self) -> bool:
+        return self._factory is None
+
+    @property
+    def tasks(self) -> Lexicon:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._materialise()
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks: Lexicon) -> None:
+        self._tasks = tasks
+
+    @property
+    def collections(self) -> Lexicon:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._materialise()
+        return self._collections
+
+    @collections.setter
+    def collections(self, collections: Lexicon) -> None:
+        self._collections = collections
+
+    @property
+    def default(self) -> str | None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._materialise()
+        return self._default
+
+    @default.setter
+    def default(  # pyright: ignore[reportIncompatibleVariableOverride]
+        self, default: str | None
+    ) -> None:
+        self._default = default
+
+    def configuration(self, taskpath: str | None = None) -> dict[str, Any]:
+        self._materialise()
+        return super().configuration(taskpath)
+
+
+class LazyTask(Task[Any]):
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        parameters: Callable[[], ParameterList],
+        build: Callable[[], Task[Any]],
+    ):
+        self._parameters = parameters
+        self._build: Callable[[], Task[Any]] | None = build
+        self._task: Task[Any] | None = None
+
+        def body(*args: Any, **kwargs: Any) -> Any:
+            return self.materialise()(*args, **kwargs)
+
+        body.__name__ = name
+        body.__doc__ = description
+
+        super().__init__(  # pyright: ignore[reportUnknownMemberType]
+            body, positional=[]
+        )
+
+    @property
+    def is_materialised(self) -> bool:
+        return self._task is not None
+
+    def materialise(self) -> Task[Any]:
+        if self._task is None:
+            build = self._build
+            if build is None:
+                raise RuntimeError(f"Task {self.name} failed to build.")
+            self._build = None
+            self._task = build()
+        return self._task
+
+    def argspec(self, body: Callable[..., Any]) -> inspect.Signature:
+        return inspect.Signature(
+            [
+                inspect.Parameter(
+                    parameter["name"],
+                    inspect.Parameter.KEYWORD_ONLY,
+                    default=parameter.get("default", None),
+                )
+                for parameter in self._parameters()
+            ]
+        )
+
+    def get_arguments(
+        self, ignore_unknown_help: bool | None = None
+    ) -> list[Argument]:
+        self.help = {
+            parameter["name"]: parameter.get("help", "")
+            for parameter in self._parameters()
+        }
+        return super().get_arguments(ignore_unknown_help)
@@ -0,0 +1,163 @@
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from invoke.context import Context
+
+from infrablocks.invoke_terraform.terraform import Terraform, TerraformFactory
+
+from .cache import JSONFileCache
+from .validation import ValidationCache, offline_environment
+
+DEFAULT_MAXIMUM_WORKERS = 8
+
+type LintCheck = Literal["fmt", "validate"]
+
+LINT_CHECKS: tuple[LintCheck, ...] = ("fmt", "validate")
+
+
+@dataclass(frozen=True)
+class LintFailure:
+    check: LintCheck
+    output: str
+
+
+@dataclass(frozen=True)
+class LintResult:
+    name: str
+    source_directory: str
+    skipped: bool = False
+    failures: Sequence[LintFailure] = field(
+        default_factory=tuple[LintFailure, ...]
+    )
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+
+@dataclass(frozen=True)
+class LintReport:
+    results: Sequence[LintResult]
+
+    @property
+    def failed(self) -> list[LintResult]:
+        return [result for result in self.results if not result.passed]
+
+    @property
+    def skipped(self) -> list[LintResult]:
+        return [result for result in self.results if result.skipped]
+
+    def render(self) -> str:
+        lines = [
+            f"{len(self.results) - len(self.failed)} of {len(self.results)} "
+            f"configurations passed ({len(self.skipped)} unchanged)."
+        ]
+        for result in self.failed:
+            for failure in result.failures:
+                lines.append(f"  {result.name}: {failure.check} failed")
+                lines.extend(
+                    f"    {line}" for line in failure.output.splitlines()
+                )
+        return "\n".join(lines)
+
+    def raise_for_failures(self) -> None:
+        if self.failed:
+            raise ValueError(f"Lint failed.\n{self.render()}")
+
+
+def _failure_output(error: Exception) -> str:
+    result: Any = getattr(error, "result", None)
+    output = "".join(
+        [
+            str(getattr(result, "stdout", "") or ""),
+            str(getattr(result, "stderr", "") or ""),
+        ]
+    )
+    return output.strip() or str(error)
+
+
+class Linter:
+    def __init__(
+        self,
+        terraform_factory: TerraformFactory = TerraformFactory(),
+        cache: ValidationCache | None = None,
+        maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+        checks: Sequence[LintCheck] = LINT_CHECKS,
+    ):
+        self._terraform_factory = terraform_factory
+        self._cache = cache
+        self._maximum_workers = maximum_workers
+        self._checks = tuple(checks)
+
+    @property
+    def cache(self) -> ValidationCache:
+        if self._cache is None:
+            self._cache = ValidationCache(cache=JSONFileCache.named("lint"))
+        return self._cache
+
+    def lint(
+        self, context: Context, configurations: Mapping[str, str]
+    ) -> LintReport:
+        digests = {
+            name: self.cache.source_digest(directory)
+            for name, directory in configurations.items()
+        }
+        results: dict[str, LintResult] = {
+            name: LintResult(
+                name=name, source_directory=directory, skipped=True
+            )
+            for name, directory in configurations.items()
+            if self.cache.matches(directory, digests[name])
+        }
+
+        pending = [
+            (name, directory)
+            for name, directory in configurations.items()
+            if name not in results
+        ]
+        with ThreadPoolExecutor(max_workers=self._maximum_workers) as executor:
+            futures = [
+                executor.submit(self._lint, context, name, directory)
+                for name, directory in pending
+            ]
+            for future in futures:
+                result = future.result()
+                results[result.name] = result
+                if result.passed:
+                    self.cache.record(
+                        result.source_directory, digests[result.name]
+                    )
+
+        return LintReport(results=[results[name] for name in configurations])
+
+    def _lint(self, context: Context, name: str, directory: str) -> LintResult:
+        terraform = self._terraform_factory.build(
+            Context(config=context.config)
+        )
+        failures: list[LintFailure] = []
+        for check in self._checks:
+            try:
+                self._run_check(check, terraform, directory)
+            except Exception as error:
+                failures.append(
+                    LintFailure(check=check, output=_failure_output(error))
+                )
+        return LintResult(
+            name=name, source_directory=directory, failures=tuple(failures)
+        )
+
+    @staticmethod
+    def _run_check(
+        check: LintCheck, terraform: Terraform, directory: str
+    ) -> None:
+        match check:
+            case "fmt":
+                terraform.fmt(chdir=directory, check=True, recursive=True)
+            case "validate":
+                environment = offline_environment(directory, None)
+                terraform.init(
+                    chdir=directory, environment=environment, backend=False
+                )
+                terraform.validate(chdir=directory, environment=environment)
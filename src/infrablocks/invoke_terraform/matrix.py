@@ -0,0 +1,140 @@
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from invoke.context import Context
+
+from infrablocks.invoke_factory import Arguments
+from infrablocks.invoke_terraform.terraform import (
+    BackendConfig,
+    Environment,
+    Variables,
+)
+
+from .cache import plugin_cache_directory
+from .configuration import Configuration, ConfigureFunction
+from .constants import (
+    DATA_DIRECTORY_ENVIRONMENT_VARIABLE,
+    PLUGIN_CACHE_ENVIRONMENT_VARIABLE,
+)
+
+DEFAULT_MAXIMUM_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class MatrixCell:
+    name: str
+    variables: Variables = field(default_factory=dict[str, Any])
+    workspace: str | None = None
+    backend_config: BackendConfig | None = None
+    environment: Environment | None = None
+
+
+@dataclass(frozen=True)
+class MatrixCellResult:
+    cell: str
+    duration: float
+    result: Any = None
+    error: BaseException | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class MatrixReport:
+    results: Sequence[MatrixCellResult]
+
+    @property
+    def succeeded(self) -> list[MatrixCellResult]:
+        return [result for result in self.results if result.succeeded]
+
+    @property
+    def failed(self) -> list[MatrixCellResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for result in self.results:
+            if result.error is None:
+                lines.append(f"  {result.cell}: ok ({result.duration:.1f}s)")
+            else:
+                reason = str(result.error).strip().splitlines()
+                lines.append(
+                    f"  {result.cell}: failed ({result.duration:.1f}s): "
+                    f"{type(result.error).__name__}"
+                    + (f": {reason[0]}" if reason else "")
+                )
+        return (
+            f"{len(self.succeeded)} of {len(self.results)} cells succeeded.\n"
+            + "\n".join(lines)
+        )
+
+    def raise_for_failures(self) -> None:
+        if self.failed:
+            raise ValueError(f"Matrix run failed.\n{self.render()}")
+
+
+def matrix_configure_function(
+    cell: MatrixCell, configure_function: ConfigureFunction[Configuration]
+) -> ConfigureFunction[Configuration]:
+    def configure(
+        context: Context, arguments: Arguments, configuration: Configuration
+    ):
+        configure_function(context, arguments, configuration)
+
+        configuration.variables = {**configuration.variables, **cell.variables}
+        if cell.workspace is not None:
+            configuration.workspace = cell.workspace
+        if cell.backend_config is not None:
+            configuration.init.backend_config = cell.backend_config
+
+        environment = {
+            **(configuration.environment or {}),
+            **(cell.environment or {}),
+        }
+        data_directory = (
+            Path(configuration.source_directory).resolve()
+            / ".terraform"
+            / "matrix"
+            / cell.name
+        )
+        plugin_cache = plugin_cache_directory(environment)
+        data_directory.mkdir(parents=True, exist_ok=True)
+        Path(plugin_cache).mkdir(parents=True, exist_ok=True)
+        configuration.environment = {
+            **environment,
+            DATA_DIRECTORY_ENVIRONMENT_VARIABLE: str(data_directory),
+            PLUGIN_CACHE_ENVIRONMENT_VARIABLE: plugin_cache,
+        }
+
+    return configure
+
+
+def _run_cell(
+    cell: MatrixCell, run: Callable[[MatrixCell], Any]
+) -> MatrixCellResult:
+    started = time.monotonic()
+    try:
+        result = run(cell)
+    except Exception as error:
+        return MatrixCellResult(
+            cell=cell.name, duration=time.monotonic() - started, error=error
+        )
+    return MatrixCellResult(
+        cell=cell.name, duration=time.monotonic() - started, result=result
+    )
+
+
+def run_matrix(
+    cells: Iterable[MatrixCell],
+    run: Callable[[MatrixCell], Any],
+    maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+) -> MatrixReport:
+    with ThreadPoolExecutor(max_workers=maximum_workers) as executor:
+        futures = [executor.submit(_run_cell, cell, run) for cell in cells]
+        return MatrixReport(results=[future.result() for future in futures])
@@ -0,0 +1,63 @@
+from threading import Lock
+
+from invoke.context import Context
+
+from infrablocks.invoke_factory import Arguments
+
+from .cache import digest
+from .configuration import Configuration, ConfigureFunction
+
+
+class ConfigurationMemo:
+    def __init__(self):
+        self._entries: dict[str, Configuration] = {}
+        self._lock = Lock()
+        self._key_locks: dict[str, Lock] = {}
+
+    @staticmethod
+    def key(
+        scope: str,
+        context: Context,
+        arguments: Arguments,
+        configuration: Configuration,
+    ) -> str:
+        return digest(
+            [scope, arguments, context.config, configuration.fingerprint()]
+        )
+
+    def _key_lock(self, key: str) -> Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, Lock())
+
+    def memoize(
+        self,
+        scope: str,
+        configure_function: ConfigureFunction[Configuration],
+    ) -> ConfigureFunction[Configuration]:
+        def configure(
+            context: Context,
+            arguments: Arguments,
+            configuration: Configuration,
+        ):
+            key = self.key(scope, context, arguments, configuration)
+            with self._key_lock(key):
+                resolved = self._entries.get(key)
+                if resolved is not None:
+                    configuration.update_from(resolved)
+                    return
+
+                configure_function(context, arguments, configuration)
+                self._entries[key] = configuration.copy()
+
+        return configure
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+
+default_configuration_memo = ConfigurationMemo()
@@ -0,0 +1,251 @@
+import json
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from threading import Lock
+from typing import Any, cast
+
+from invoke.context import Context
+
+from infrablocks.invoke_terraform.terraform import (
+    WORKSPACE_ENVIRONMENT_VARIABLE,
+    BackendConfig,
+    Environment,
+    Terraform,
+    TerraformFactory,
+)
+
+from .cache import JSONFileCache
+
+DEFAULT_MAXIMUM_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class OutputSource:
+    source_directory: str
+    workspace: str | None = None
+    backend_config: BackendConfig | None = None
+    environment: Environment | None = field(default=None, compare=False)
+
+    @property
+    def key(self) -> str:
+        return json.dumps(
+            [
+                str(Path(self.source_directory).resolve()),
+                self.workspace,
+                self.backend_config,
+            ],
+            sort_keys=True,
+        )
+
+
+@dataclass(frozen=True)
+class ConfigurationOutputs:
+    lineage: str | None
+    serial: int | None
+    values: Mapping[str, Any]
+
+
+class OutputResolver:
+    def __init__(
+        self,
+        terraform_factory: TerraformFactory = TerraformFactory(),
+        maximum_workers: int = DEFAULT_MAXIMUM_WORKERS,
+        cache: JSONFileCache | None = None,
+        time_to_live: float | None = None,
+    ):
+        self._terraform_factory = terraform_factory
+        self._maximum_workers = maximum_workers
+        self._cache = cache
+        self._time_to_live = time_to_live
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future[ConfigurationOutputs]] = {}
+        self._initialise_locks: dict[str, Lock] = {}
+        self._initialised: set[str] = set()
+
+    def enable_disk_cache(
+        self, time_to_live: float, cache: JSONFileCache | None = None
+    ) -> None:
+        with self._lock:
+            self._cache = (
+                cache if cache is not None else JSONFileCache.named("outputs")
+            )
+            self._time_to_live = time_to_live
+
+    def _submit(
+        self, context: Context, source: OutputSource
+    ) -> Future[ConfigurationOutputs]:
+        key = source.key
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._maximum_workers,
+                    thread_name_prefix="terraform-outputs",
+                )
+            future = self._executor.submit(self._fetch, context, source)
+            self._futures[key] = future
+        future.add_done_callback(partial(self._discard_failed, key))
+        return future
+
+    def _discard_failed(
+        self, key: str, future: Future[ConfigurationOutputs]
+    ) -> None:
+        if future.exception() is None:
+            return
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def prefetch(
+        self, context: Context, sources: Iterable[OutputSource]
+    ) -> None:
+        for source in sources:
+            self._submit(context, source)
+
+    def resolve(
+        self, context: Context, source: OutputSource
+    ) -> ConfigurationOutputs:
+        return self._submit(context, source).result()
+
+    def output(
+        self,
+        context: Context,
+        source_directory: str,
+        name: str,
+        workspace: str | None = None,
+        backend_config: BackendConfig | None = None,
+        environment: Environment | None = None,
+    ) -> Any:
+        outputs = self.resolve(
+            context,
+            OutputSource(
+                source_directory=source_directory,
+                workspace=workspace,
+                backend_config=backend_config,
+                environment=environment,
+            ),
+        )
+        if name not in outputs.values:
+            raise ValueError(
+                f"Output {name!r} is not defined by {source_directory}."
+            )
+        return outputs.values[name]
+
+    def invalidate(self, source: OutputSource) -> None:
+        with self._lock:
+            self._futures.pop(source.key, None)
+            self._initialised.discard(source.key)
+            if self._cache is not None:
+                contents = self._cache.load()
+                if contents.pop(source.key, None) is not None:
+                    self._cache.store(contents)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._futures.clear()
+            self._initialised.clear()
+
+    def _cached(self, source: OutputSource) -> ConfigurationOutputs | None:
+        if self._cache is None or self._time_to_live is None:
+            return None
+        with self._lock:
+            entry = self._cache.load().get(source.key)
+        if not isinstance(entry, dict):
+            return None
+        contents = cast(dict[str, Any], entry)
+        fetched_at = contents.get("fetched_at")
+        if (
+            not isinstance(fetched_at, int | float)
+            or time.time() - fetched_at > self._time_to_live
+        ):
+            return None
+        return ConfigurationOutputs(
+            lineage=contents.get("lineage"),
+            serial=contents.get("serial"),
+            values=contents.get("values", {}),
+        )
+
+    def _store(
+        self, source: OutputSource, outputs: ConfigurationOutputs
+    ) -> None:
+        if self._cache is None or self._time_to_live is None:
+            return
+        with self._lock:
+            contents = self._cache.load()
+            contents[source.key] = {
+                "lineage": outputs.lineage,
+                "serial": outputs.serial,
+                "values": dict(outputs.values),
+                "fetched_at": time.time(),
+            }
+            self._cache.store(contents)
+
+    def _initialise_lock(self, source: OutputSource) -> Lock:
+        directory = str(Path(source.source_directory).resolve())
+        with self._lock:
+            return self._initialise_locks.setdefault(directory, Lock())
+
+    def _initialise(
+        self,
+        terraform: Terraform,
+        source: OutputSource,
+        environment: Environment,
+    ) -> None:
+        with self._initialise_lock(source):
+            if source.key in self._initialised:
+                return
+            terraform.init(
+                chdir=source.source_directory,
+                backend_config=source.backend_config,
+                environment=environment,
+            )
+            self._initialised.add(source.key)
+
+    def _fetch(
+        self, context: Context, source: OutputSource
+    ) -> ConfigurationOutputs:
+        environment = dict(source.environment or {})
+        if source.workspace is not None:
+            environment[WORKSPACE_ENVIRONMENT_VARIABLE] = source.workspace
+
+        terraform = self._terraform_factory.build(
+            Context(config=context.config)
+        )
+        self._initialise(terraform, source, environment)
+
+        cached = self._cached(source)
+        if (
+            cached is not None
+            and cached.lineage is not None
+            and cached.serial is not None
+            and terraform.state_version(
+                chdir=source.source_directory, environment=environment
+            )
+            == (cached.lineage, cached.serial)
+        ):
+            return cached
+
+        state = terraform.load_state(
+            chdir=source.source_directory, environment=environment
+        )
+        outputs = ConfigurationOutputs(
+            lineage=state.lineage,
+            serial=state.serial,
+            values=state.outputs(),
+        )
+
+        if not any(
+            state.is_sensitive_output(name) for name in state.output_names
+        ):
+            self._store(source, outputs)
+        return outputs
+
+
+default_output_resolver = OutputResolver()
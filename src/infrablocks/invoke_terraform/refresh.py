@@ -0,0 +1,55 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from .cache import JSONFileCache
+
+
+class RefreshStore:
+    def __init__(self, cache: JSONFileCache | None = None):
+        self._cache = (
+            cache if cache is not None else JSONFileCache.named("refreshes")
+        )
+
+    def last_refreshed(self, key: str) -> float | None:
+        refreshed_at = self._entry(key).get("refreshed_at")
+        return float(refreshed_at) if refreshed_at is not None else None
+
+    def drift_reported(self, key: str) -> bool:
+        return bool(self._entry(key).get("drift"))
+
+    def record_refresh(self, key: str, at: float | None = None) -> None:
+        self._update(
+            key,
+            refreshed_at=at if at is not None else time.time(),
+            drift=False,
+        )
+
+    def report_drift(self, key: str) -> None:
+        self._update(key, drift=True, drifted_at=time.time())
+
+    def _entry(self, key: str) -> dict[str, Any]:
+        entry = self._cache.load().get(key)
+        if not isinstance(entry, dict):
+            return {}
+        return cast(dict[str, Any], entry)
+
+    def _update(self, key: str, **values: object) -> None:
+        contents = self._cache.load()
+        contents[key] = {**self._entry(key), **values}
+        self._cache.store(contents)
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    maximum_age: float
+    store: RefreshStore = field(default_factory=RefreshStore)
+
+    def should_refresh(self, key: str, now: float | None = None) -> bool:
+        if self.store.drift_reported(key):
+            return True
+        refreshed_at = self.store.last_refreshed(key)
+        if refreshed_at is None:
+            return True
+        now = now if now is not None else time.time()
+        return now - refreshed_at >= self.maximum_age
@@ -0,0 +1,254 @@
+import heapq
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from tempfile import TemporaryDirectory
+
+from invoke.context import Context
+
+from infrablocks.invoke_terraform.terraform import (
+    PlanSummary,
+    ResourceGraph,
+    Terraform,
+    TerraformFactory,
+)
+
+from .configuration import Configuration
+from .targeting import ResourceGraphIndex
+
+DEFAULT_MAXIMUM_SHARDS = 8
+
+type StateSnapshot = tuple[str | None, int | None]
+
+
+@dataclass(frozen=True)
+class PlanShard:
+    index: int
+    targets: Sequence[str]
+    size: int
+
+
+@dataclass(frozen=True)
+class ShardResult:
+    shard: PlanShard
+    duration: float
+    summary: PlanSummary | None = None
+    addresses: Sequence[str] = field(default_factory=list[str])
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class ShardedPlanReport:
+    shards: Sequence[ShardResult]
+    elapsed: float
+    summary: PlanSummary | None = None
+    fallback: str | None = None
+
+    def render(self) -> str:
+        if self.fallback is not None:
+            return f"Sharded plan abandoned: {self.fallback}."
+
+        actions = (
+            ", ".join(
+                f"{count} {action}"
+                for action, count in sorted(self.summary.by_action.items())
+            )
+            if self.summary is not None
+            else ""
+        )
+        lines = [
+            f"Planned {len(self.shards)} shards in {self.elapsed:.1f}s"
+            + (f": {actions}." if actions else ".")
+        ]
+        for result in self.shards:
+            changes = (
+                len(result.summary.changes)
+                if result.summary is not None
+                else 0
+            )
+            lines.append(
+                f"  shard {result.shard.index}: "
+                + f"{len(result.shard.targets)} targets, "
+                + f"{result.shard.size} addresses, {changes} changes "
+                + f"({result.duration:.1f}s)"
+            )
+        return "\n".join(lines)
+
+
+def partition(graph: ResourceGraph, maximum_shards: int) -> list[PlanShard]:
+    components = graph.components()
+    if len(components) < 2 or maximum_shards < 2:
+        return []
+
+    count = min(maximum_shards, len(components))
+    bins: list[list[list[str]]] = [[] for _ in range(count)]
+    loads = [(0, index) for index in range(count)]
+    for component in components:
+        load, index = heapq.heappop(loads)
+        bins[index].append(component)
+        heapq.heappush(loads, (load + len(component), index))
+
+    return [
+        PlanShard(
+            index=index + 1,
+            targets=sorted(
+                target
+                for component in group
+                for target in graph.roots(component)
+            ),
+            size=sum(len(component) for component in group),
+        )
+        for index, group in enumerate(bins)
+    ]
+
+
+def overlapping_addresses(results: Sequence[ShardResult]) -> list[str]:
+    seen: set[str] = set()
+    overlapping: set[str] = set()
+    for result in results:
+        for address in result.addresses:
+            if address in seen:
+                overlapping.add(address)
+            seen.add(address)
+    return sorted(overlapping)
+
+
+class ShardedPlanner:
+    def __init__(
+        self,
+        terraform_factory: TerraformFactory = TerraformFactory(),
+        graph_index: ResourceGraphIndex | None = None,
+        maximum_shards: int = DEFAULT_MAXIMUM_SHARDS,
+    ):
+        self._terraform_factory = terraform_factory
+        self._graph_index = graph_index
+        self._maximum_shards = maximum_shards
+
+    @property
+    def graph_index(self) -> ResourceGraphIndex:
+        if self._graph_index is None:
+            self._graph_index = ResourceGraphIndex()
+        return self._graph_index
+
+    def plan(
+        self, context: Context, configuration: Configuration
+    ) -> ShardedPlanReport:
+        started = time.monotonic()
+        terraform = self._terraform(context)
+        graph = self.graph_index.graph(
+            terraform,
+            configuration.source_directory,
+            configuration.environment,
+        )
+        shards = partition(graph, self._maximum_shards)
+        if not shards:
+            return ShardedPlanReport(
+                shards=[],
+                elapsed=time.monotonic() - started,
+                fallback="the graph has fewer than two independent components",
+            )
+
+        before = self._snapshot(terraform, configuration)
+        with (
+            TemporaryDirectory() as directory,
+            ThreadPoolExecutor(max_workers=len(shards)) as executor,
+        ):
+            results = list(
+                executor.map(
+                    partial(
+                        self._plan_shard, context, configuration, directory
+                    ),
+                    shards,
+                )
+            )
+
+        fallback = self._fallback_reason(results)
+        if fallback is None and before != self._snapshot(
+            terraform, configuration
+        ):
+            fallback = "state changed while shards were planning"
+
+        return ShardedPlanReport(
+            shards=results,
+            elapsed=time.monotonic() - started,
+            summary=(
+                PlanSummary.merge(
+                    result.summary
+                    for result in results
+                    if result.summary is not None
+                )
+                if fallback is None
+                else None
+            ),
+            fallback=fallback,
+        )
+
+    def _terraform(self, context: Context) -> Terraform:
+        return self._terraform_factory.build(Context(config=context.config))
+
+    @staticmethod
+    def _snapshot(
+        terraform: Terraform, configuration: Configuration
+    ) -> StateSnapshot:
+        state = terraform.load_state(
+            chdir=configuration.source_directory,
+            environment=configuration.environment,
+        )
+        return (state.lineage, state.serial)
+
+    def _plan_shard(
+        self,
+        context: Context,
+        configuration: Configuration,
+        directory: str,
+        shard: PlanShard,
+    ) -> ShardResult:
+        started = time.monotonic()
+        plan_file = os.path.join(directory, f"shard-{shard.index}.tfplan")
+        try:
+            terraform = self._terraform(context)
+            for _ in terraform.stream_plan(
+                chdir=configuration.source_directory,
+                vars=configuration.variables,
+                environment=configuration.environment,
+                out=plan_file,
+                refresh=configuration.refresh,
+                targets=shard.targets,
+                lock=False,
+            ):
+                pass
+            plan = terraform.load_plan(
+                plan_file,
+                chdir=configuration.source_directory,
+                environment=configuration.environment,
+            )
+        except Exception as error:
+            reason = str(error).strip().splitlines()
+            return ShardResult(
+                shard=shard,
+                duration=time.monotonic() - started,
+                error=type(error).__name__
+                + (f": {reason[0]}" if reason else ""),
+            )
+        return ShardResult(
+            shard=shard,
+            duration=time.monotonic() - started,
+            summary=PlanSummary.of(plan),
+            addresses=list(plan.addresses),
+        )
+
+    @staticmethod
+    def _fallback_reason(results: Sequence[ShardResult]) -> str | None:
+        for result in results:
+            if result.error is not None:
+                return f"shard {result.shard.index} failed: {result.error}"
+        overlapping = overlapping_addresses(results)
+        if overlapping:
+            return (
+                f"shards overlap on {len(overlapping)} addresses "
+                + f"(first {overlapping[0]})"
+            )
+        return None
@@ -0,0 +1,209 @@
+import re
+from collections.abc import Collection, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+from infrablocks.invoke_terraform.terraform import (
+    Environment,
+    ResourceGraph,
+    Terraform,
+)
+
+from .cache import JSONFileCache
+from .dependencies import (
+    ModuleDependencyIndex,
+    block_body,
+    directory_signature,
+    is_local_source,
+    module_calls,
+    terraform_files,
+)
+
+DEFAULT_BASE_REF = "origin/main"
+
+_COMMENT_LINE = re.compile(r"^[ \t]*(#|//).*$", re.MULTILINE)
+_BLOCK_HEADER = re.compile(
+    r'^[ \t]*(?:(resource|data)[ \t]+"([^"]+)"[ \t]+"([^"]+)"'
+    + r'|(module)[ \t]+"([^"]+)")[ \t]*\{',
+    re.MULTILINE,
+)
+
+
+@dataclass(frozen=True)
+class SourceBlock:
+    address: str
+    first_line: int
+    last_line: int
+
+    def contains(self, line: int) -> bool:
+        return self.first_line <= line <= self.last_line
+
+
+@dataclass(frozen=True)
+class TargetSelection:
+    changed: Sequence[str] = field(default_factory=list[str])
+    targets: Sequence[str] = field(default_factory=list[str])
+    closure: Sequence[str] = field(default_factory=list[str])
+
+
+def source_blocks(contents: str) -> list[SourceBlock]:
+    contents = _COMMENT_LINE.sub("", contents)
+    blocks: list[SourceBlock] = []
+    for header in _BLOCK_HEADER.finditer(contents):
+        kind, type, name, module, module_name = header.groups()
+        if module is not None:
+            address = f"module.{module_name}"
+        elif kind == "data":
+            address = f"data.{type}.{name}"
+        else:
+            address = f"{type}.{name}"
+        end = header.end() + len(block_body(contents, header.end()))
+        blocks.append(
+            SourceBlock(
+                address=address,
+                first_line=contents.count("\n", 0, header.start()) + 1,
+                last_line=contents.count("\n", 0, end) + 1,
+            )
+        )
+    return blocks
+
+
+def module_addresses(source_directory: str | Path) -> dict[Path, list[str]]:
+    root = Path(source_directory).resolve()
+    addresses: dict[Path, list[str]] = {root: [""]}
+    pending = [(root, "")]
+    while pending:
+        directory, prefix = pending.pop()
+        for entry in terraform_files(directory):
+            try:
+                with open(entry.path) as file:
+                    contents = file.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            for name, source in module_calls(contents):
+                if not is_local_source(source):
+                    continue
+                module = (directory / source).resolve()
+                address = f"{prefix}module.{name}"
+                if address in addresses.setdefault(module, []):
+                    continue
+                addresses[module].append(address)
+                pending.append((module, address + "."))
+    return addresses
+
+
+def _read_blocks(path: Path) -> list[SourceBlock] | None:
+    try:
+        with open(path) as file:
+            return source_blocks(file.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def changed_addresses(
+    source_directory: str | Path,
+    changes: Mapping[Path, Collection[int]],
+) -> list[str] | None:
+    modules = module_addresses(source_directory)
+    changed: set[str] = set()
+    for path, lines in changes.items():
+        path = Path(path).resolve()
+        addresses = modules.get(path.parent)
+        if addresses is None:
+            continue
+        blocks = _read_blocks(path) if path.name.endswith(".tf") else None
+        for module in addresses:
+            unmapped = blocks is None or any(
+                not any(block.contains(line) for block in blocks)
+                for line in lines
+            )
+            if unmapped:
+                if not module:
+                    return None
+                changed.add(module)
+                continue
+            for block in blocks or []:
+                if any(block.contains(line) for line in lines):
+                    changed.add(
+                        f"{module}.{block.address}"
+                        if module
+                        else block.address
+                    )
+    return sorted(changed)
+
+
+class ResourceGraphIndex:
+    def __init__(
+        self,
+        cache: JSONFileCache | None = None,
+        dependency_index: ModuleDependencyIndex | None = None,
+    ):
+        self._cache = (
+            cache if cache is not None else JSONFileCache.named("graphs")
+        )
+        self._dependency_index = (
+            dependency_index
+            if dependency_index is not None
+            else ModuleDependencyIndex()
+        )
+
+    def signature(self, source_directory: str | Path) -> list[Any]:
+        closure = self._dependency_index.closure(source_directory)
+        self._dependency_index.save()
+        return [
+            [str(directory), directory_signature(directory)]
+            for directory in sorted(closure)
+        ]
+
+    def graph(
+        self,
+        terraform: Terraform,
+        source_directory: str,
+        environment: Environment | None = None,
+    ) -> ResourceGraph:
+        key = str(Path(source_directory).resolve())
+        signature = self.signature(source_directory)
+        contents = self._cache.load()
+        entry = contents.get(key)
+        if isinstance(entry, dict):
+            cached = cast(dict[str, Any], entry)
+            if cached.get("signature") == signature:
+                return ResourceGraph.from_dict(cached)
+
+        graph = terraform.load_graph(
+            chdir=source_directory, environment=environment
+        )
+        contents[key] = {"signature": signature, **graph.to_dict()}
+        self._cache.store(contents)
+        return graph
+
+
+class TargetSelector:
+    def __init__(self, graph_index: ResourceGraphIndex | None = None):
+        self._graph_index = (
+            graph_index if graph_index is not None else ResourceGraphIndex()
+        )
+
+    def select(
+        self,
+        terraform: Terraform,
+        source_directory: str,
+        changes: Mapping[Path, Collection[int]],
+        environment: Environment | None = None,
+    ) -> TargetSelection | None:
+        changed = changed_addresses(source_directory, changes)
+        if changed is None:
+            return None
+        if not changed:
+            return TargetSelection()
+
+        graph = self._graph_index.graph(
+            terraform, source_directory, environment
+        )
+        targets = graph.minimal_targets(changed)
+        return TargetSelection(
+            changed=changed,
+            targets=targets,
+            closure=sorted({*targets, *graph.dependencies_of(targets)}),
+        )
@@ -1,10 +1,18 @@
-from .factory import TerraformFactory
-from .invoke_executor import InvokeExecutor
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from .state import (
+    ResourceInstance,
+    StateIndex,
+    StateIndexCache,
+)
 from .terraform import (
+    WORKSPACE_ENVIRONMENT_VARIABLE,
     BackendConfig,
     ConfigurationValue,
     Environment,
     Executor,
+    Process,
     Result,
     StreamName,
     StreamNames,
@@ -12,16 +20,103 @@ from .terraform import (
     Variables,
 )
 
+if TYPE_CHECKING:
+    from .console import (
+        ConsoleSession,
+        ConsoleSessionPool,
+        default_console_pool,
+    )
+    from .factory import TerraformFactory
+    from .graph import ResourceGraph
+    from .invoke_executor import InvokeExecutor
+    from .plan import PlanSelection, PlanTable, ResourceChange
+    from .policy import (
+        DestroyGuard,
+        ForbiddenActions,
+        NoPublicBuckets,
+        Policy,
+        PolicyResult,
+        RequiredTags,
+        Rule,
+        Violation,
+    )
+    from .render import PlanRenderer, RenderedPlan
+    from .summary import PlanDiff, PlanReport, PlanSummary
+
+_LAZY_EXPORTS = {
+    "ConsoleSession": ".console",
+    "ConsoleSessionPool": ".console",
+    "DestroyGuard": ".policy",
+    "ForbiddenActions": ".policy",
+    "InvokeExecutor": ".invoke_executor",
+    "NoPublicBuckets": ".policy",
+    "PlanDiff": ".summary",
+    "PlanRenderer": ".render",
+    "PlanReport": ".summary",
+    "PlanSelection": ".plan",
+    "PlanSummary": ".summary",
+    "PlanTable": ".plan",
+    "Policy": ".policy",
+    "PolicyResult": ".policy",
+    "RenderedPlan": ".render",
+    "RequiredTags": ".policy",
+    "ResourceChange": ".plan",
+    "ResourceGraph": ".graph",
+    "Rule": ".policy",
+    "TerraformFactory": ".factory",
+    "Violation": ".policy",
+    "default_console_pool": ".console",
+}
+
 __all__ = [
     "BackendConfig",
     "ConfigurationValue",
+    "ConsoleSession",
+    "ConsoleSessionPool",
+    "DestroyGuard",
     "Environment",
     "Executor",
+    "ForbiddenActions",
     "InvokeExecutor",
+    "NoPublicBuckets",
+    "PlanDiff",
+    "PlanRenderer",
+    "PlanReport",
+    "PlanSelection",
+    "PlanSummary",
+    "PlanTable",
+    "Policy",
+    "PolicyResult",
+    "Process",
+    "RenderedPlan",
+    "RequiredTags",
+    "ResourceChange",
+    "ResourceGraph",
+    "ResourceInstance",
     "Result",
+    "Rule",
+    "StateIndex",
+    "StateIndexCache",
     "StreamName",
     "StreamNames",
     "Terraform",
     "TerraformFactory",
     "Variables",
+    "Violation",
+    "WORKSPACE_ENVIRONMENT_VARIABLE",
+    "default_console_pool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,230 @@
+import atexit
+import json
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence, Set
+from threading import Lock
+from typing import Any
+
+from .terraform import (
+    WORKSPACE_ENVIRONMENT_VARIABLE,
+    Environment,
+    Process,
+    Terraform,
+    Variables,
+)
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_MAXIMUM_SESSIONS = 8
+
+_TERMINAL_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b[()][0-9A-Za-z]")
+_DIAGNOSTIC_DECORATION = "╷│╵ "
+
+
+def _clean(line: str) -> str:
+    line = _TERMINAL_ESCAPE.sub("", line).rstrip("\r\n")
+    return line.rsplit("\r", 1)[-1].strip()
+
+
+def _single_line(expression: str) -> str:
+    return " ".join(line.strip() for line in expression.splitlines())
+
+
+class ConsoleSession:
+    def __init__(self, process: Process, timeout: float = DEFAULT_TIMEOUT):
+        self._process = process
+        self._timeout = timeout
+        self._lock = Lock()
+        self._marker = f"__invoke_terraform_{uuid.uuid4().hex}__"
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self._process.alive
+
+    def evaluate(self, expressions: Sequence[str]) -> list[Any]:
+        commands = [
+            f"jsonencode([{_single_line(expression)}])"
+            for expression in expressions
+        ]
+        delimiter = f'upper("{self._marker}")'
+        with self._lock:
+            try:
+                self._process.write(
+                    "".join(
+                        f"{command}\n{delimiter}\n" for command in commands
+                    )
+                )
+                responses = [
+                    self._read_response({command, delimiter})
+                    for command in commands
+                ]
+            except BaseException:
+                self._process.close()
+                raise
+            self.last_used = time.monotonic()
+
+        errors = [
+            f"  {expression}: {error}"
+            for expression, (_, error) in zip(expressions, responses)
+            if error is not None
+        ]
+        if errors:
+            raise ValueError(
+                "Terraform console evaluation failed.\n" + "\n".join(errors)
+            )
+        return [value for value, _ in responses]
+
+    def evaluate_one(self, expression: str) -> Any:
+        return self.evaluate([expression])[0]
+
+    def _read_response(self, echoes: Set[str]) -> tuple[Any, str | None]:
+        delimiter = json.dumps(self._marker.upper())
+        messages: list[str] = []
+        value: Any = None
+        found = False
+        while True:
+            raw = self._process.readline(self._timeout)
+            if raw == "":
+                raise ValueError(
+                    "Terraform console exited unexpectedly: "
+                    + (" ".join(messages) or "no output")
+                )
+            line = _clean(raw)
+            if line == delimiter:
+                break
+            if line.startswith(">") or line in echoes:
+                continue
+            if not found and len(line) > 1 and line[0] == line[-1] == '"':
+                try:
+                    value = json.loads(json.loads(line))[0]
+                    found = True
+                    continue
+                except (ValueError, TypeError, IndexError, KeyError):
+                    pass
+            message = line.strip(_DIAGNOSTIC_DECORATION)
+            if message:
+                messages.append(message)
+
+        if found:
+            return value, None
+        return None, " ".join(messages) or "no result"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._process.alive:
+                try:
+                    self._process.write("exit\n")
+                except OSError:
+                    pass
+            self._process.close()
+
+
+class ConsoleSessionPool:
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        maximum_sessions: int = DEFAULT_MAXIMUM_SESSIONS,
+    ):
+        self._idle_timeout = idle_timeout
+        self._maximum_sessions = maximum_sessions
+        self._sessions: OrderedDict[str, ConsoleSession] = OrderedDict()
+        self._lock = Lock()
+
+    def session(
+        self,
+        terraform: Terraform,
+        chdir: str | None = None,
+        workspace: str | None = None,
+        vars: Variables | None = None,
+        environment: Environment | None = None,
+    ) -> ConsoleSession:
+        key = json.dumps(
+            [
+                os.path.abspath(chdir or "."),
+                workspace,
+                vars,
+                sorted((environment or {}).items()),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+
+            console_environment = dict(environment or {})
+            if workspace is not None:
+                console_environment[WORKSPACE_ENVIRONMENT_VARIABLE] = workspace
+            session = terraform.console(
+                chdir=chdir, vars=vars, environment=console_environment
+            )
+            self._sessions[key] = session
+            while len(self._sessions) > self._maximum_sessions:
+                _, oldest = self._sessions.popitem(last=False)
+                oldest.close()
+            return session
+
+    def evaluate(
+        self,
+        terraform: Terraform,
+        expressions: Sequence[str],
+        chdir: str | None = None,
+        workspace: str | None = None,
+        vars: Variables | None = None,
+        environment: Environment | None = None,
+    ) -> list[Any]:
+        session = self.session(
+            terraform,
+            chdir=chdir,
+            workspace=workspace,
+            vars=vars,
+            environment=environment,
+        )
+        try:
+            return session.evaluate(expressions)
+        except BaseException:
+            if not session.alive:
+                self.discard(session)
+            raise
+
+    def discard(self, session: ConsoleSession) -> None:
+        with self._lock:
+            for key, candidate in list(self._sessions.items()):
+                if candidate is session:
+                    del self._sessions[key]
+        session.close()
+
+    def evict_idle(self) -> None:
+        with self._lock:
+            self._evict_idle()
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        for key, session in list(self._sessions.items()):
+            if (
+                not session.alive
+                or now - session.last_used > self._idle_timeout
+            ):
+                del self._sessions[key]
+                session.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+default_console_pool = ConsoleSessionPool()
+atexit.register(default_console_pool.close)
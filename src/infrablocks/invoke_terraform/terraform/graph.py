@@ -0,0 +1,187 @@
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import IO, Any
+
+_EDGE = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*->\s*"((?:[^"\\]|\\.)*)"')
+_NODE = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*(?:\[|;|$)')
+_ROOT_PREFIX = "[root] "
+_NODE_SUFFIX = re.compile(r"\s+\([a-z ]+\)$")
+_MODULE_PREFIX = re.compile(r"^(?:module\.[\w-]+(?:\[[^\]]*\])?\.)*")
+_RESOURCE = re.compile(r"^(?:data\.)?[\w-]+\.[\w-]+$")
+_MODULE = re.compile(r"^module\.[\w-]+$")
+_SHARED_NODE_PREFIXES = ("meta.", "output.", "provider[", "provider.", "var.")
+_NON_RESOURCE_TYPES = frozenset(
+    {
+        "count",
+        "each",
+        "local",
+        "meta",
+        "output",
+        "path",
+        "provider",
+        "self",
+        "terraform",
+        "var",
+    }
+)
+
+
+def normalise_node(name: str) -> str:
+    name = name.replace('\\"', '"')
+    if name.startswith(_ROOT_PREFIX):
+        name = name[len(_ROOT_PREFIX) :]
+    return _NODE_SUFFIX.sub("", name)
+
+
+def is_targetable(address: str) -> bool:
+    prefix = _MODULE_PREFIX.match(address)
+    local = address[prefix.end() :] if prefix is not None else address
+    if not local:
+        return False
+    if local.split(".", 1)[0] in _NON_RESOURCE_TYPES:
+        return False
+    return bool(_RESOURCE.match(local) or _MODULE.match(local))
+
+
+def is_shared(node: str) -> bool:
+    return node == "root" or node.startswith(_SHARED_NODE_PREFIXES)
+
+
+@dataclass(frozen=True)
+class ResourceGraph:
+    dependencies: Mapping[str, Sequence[str]]
+
+    @staticmethod
+    def parse(lines: Iterable[str]) -> "ResourceGraph":
+        dependencies: dict[str, list[str]] = {}
+        for line in lines:
+            edge = _EDGE.match(line)
+            if edge is not None:
+                source = normalise_node(edge.group(1))
+                target = normalise_node(edge.group(2))
+                dependencies.setdefault(target, [])
+                if source == target:
+                    dependencies.setdefault(source, [])
+                    continue
+                edges = dependencies.setdefault(source, [])
+                if target not in edges:
+                    edges.append(target)
+                continue
+            node = _NODE.match(line)
+            if node is not None:
+                dependencies.setdefault(normalise_node(node.group(1)), [])
+        return ResourceGraph(dependencies=dependencies)
+
+    @staticmethod
+    def load(stream: IO[str]) -> "ResourceGraph":
+        return ResourceGraph.parse(stream)
+
+    @staticmethod
+    def from_dict(contents: Mapping[str, Any]) -> "ResourceGraph":
+        return ResourceGraph(dependencies=contents["dependencies"])
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "dependencies": {
+                node: list(edges) for node, edges in self.dependencies.items()
+            }
+        }
+
+    @property
+    def addresses(self) -> list[str]:
+        return sorted(
+            node for node in self.dependencies if is_targetable(node)
+        )
+
+    def dependencies_of(self, addresses: Iterable[str]) -> set[str]:
+        starts = set(addresses)
+        pending = [
+            node
+            for node in self.dependencies
+            if node in starts
+            or any(node.startswith(address + ".") for address in starts)
+        ]
+        seen: set[str] = set()
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            pending.extend(self.dependencies.get(node, ()))
+        return {
+            node for node in seen if node not in starts and is_targetable(node)
+        }
+
+    def minimal_targets(self, addresses: Iterable[str]) -> list[str]:
+        candidates = {
+            address: self.dependencies_of([address])
+            for address in set(addresses)
+        }
+        targets: list[str] = []
+        for address in sorted(
+            candidates,
+            key=lambda address: (-len(candidates[address]), address),
+        ):
+            if not any(
+                address in candidates[target]
+                or address.startswith(target + ".")
+                for target in targets
+            ):
+                targets.append(address)
+        return sorted(targets)
+
+    def roots(self, addresses: Iterable[str]) -> list[str]:
+        members = sorted(set(addresses))
+        covered = self._reachable(
+            edge for member in members for edge in self._edges(member)
+        )
+        roots = [member for member in members if member not in covered]
+        reached = self._reachable(roots)
+        for member in members:
+            if member not in reached:
+                roots.append(member)
+                reached |= self._reachable([member])
+        return sorted(roots)
+
+    def components(self) -> list[list[str]]:
+        parents: dict[str, str] = {}
+
+        def find(node: str) -> str:
+            root = parents.setdefault(node, node)
+            while root != parents[root]:
+                root = parents[root]
+            while node != root:
+                parents[node], node = root, parents[node]
+            return root
+
+        for node, edges in self.dependencies.items():
+            if is_shared(node):
+                continue
+            find(node)
+            for edge in edges:
+                if not is_shared(edge):
+                    parents[find(edge)] = find(node)
+
+        groups: dict[str, list[str]] = {}
+        for node in parents:
+            if is_targetable(node):
+                groups.setdefault(find(node), []).append(node)
+        return sorted(
+            (sorted(group) for group in groups.values()),
+            key=lambda group: (-len(group), group[0]),
+        )
+
+    def _edges(self, node: str) -> Sequence[str]:
+        return self.dependencies.get(node, ())
+
+    def _reachable(self, nodes: Iterable[str]) -> set[str]:
+        pending = list(nodes)
+        seen: set[str] = set()
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            pending.extend(self._edges(node))
+        return seen
@@ -1,8 +1,75 @@
-from typing import IO, Iterable
+import codecs
+import fcntl
+import os
+import pty
+import select
+import struct
+import subprocess
+import sys
+import termios
+import threading
+from typing import IO, Collection, Iterable, Iterator
 
 from invoke.context import Context
+from invoke.exceptions import UnexpectedExit
+from invoke.runners import Result
 
-from .terraform import Environment, Executor
+from .terraform import Environment, Executor, Process
+
+TERMINAL_ROWS = 24
+TERMINAL_COLUMNS = 4096
+
+
+class PseudoTerminalProcess(Process):
+    def __init__(self, process: subprocess.Popen[bytes], descriptor: int):
+        self._process = process
+        self._descriptor = descriptor
+        self._buffer = ""
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._closed = False
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and self._process.poll() is None
+
+    def write(self, text: str) -> None:
+        os.write(self._descriptor, text.encode())
+
+    def readline(self, timeout: float | None = None) -> str:
+        while "\n" not in self._buffer:
+            ready, _, _ = select.select([self._descriptor], [], [], timeout)
+            if not ready:
+                raise TimeoutError("Timed out waiting for process output.")
+            try:
+                chunk = os.read(self._descriptor, 65536)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                line, self._buffer = self._buffer, ""
+                return line
+            self._buffer += self._decoder.decode(chunk)
+
+        line, self._buffer = self._buffer.split("\n", 1)
+        return line + "\n"
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        os.close(self._descriptor)
+
+
+def _forward(source: IO[str], target: IO[str]) -> None:
+    for line in source:
+        target.write(line)
+        target.flush()
 
 
 class InvokeExecutor(Executor):
@@ -15,10 +82,80 @@ class InvokeExecutor(Executor):
         environment: Environment | None = None,
         stdout: IO[str] | None = None,
         stderr: IO[str] | None = None,
-    ) -> None:
-        self._context.run(
+        exit_codes: Collection[int] | None = None,
+    ) -> int:
+        result = self._context.run(
             " ".join(command),
             env=(environment if environment is not None else {}),
             out_stream=stdout,
             err_stream=stderr,
+            warn=exit_codes is not None,
         )
+        if result is None:
+            return 0
+        if exit_codes is not None and result.exited not in exit_codes:
+            raise UnexpectedExit(result)
+        return result.exited
+
+    def stream(
+        self,
+        command: Iterable[str],
+        environment: Environment | None = None,
+    ) -> Iterator[str]:
+        command_line = " ".join(command)
+        with subprocess.Popen(
+            command_line,
+            shell=True,
+            cwd=self._context.cwd or None,
+            env={**os.environ, **(environment or {})},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        ) as process:
+            if process.stdout is None or process.stderr is None:
+                raise ValueError("Process output was not captured.")
+            forwarder = threading.Thread(
+                target=_forward, args=(process.stderr, sys.stderr), daemon=True
+            )
+            forwarder.start()
+            try:
+                yield from process.stdout
+            except GeneratorExit:
+                process.kill()
+                forwarder.join()
+                raise
+            exited = process.wait()
+            forwarder.join()
+
+        if exited != 0:
+            raise UnexpectedExit(Result(command=command_line, exited=exited))
+
+    def spawn(
+        self,
+        command: Iterable[str],
+        environment: Environment | None = None,
+    ) -> Process:
+        controller, terminal = pty.openpty()
+        fcntl.ioctl(
+            terminal,
+            termios.TIOCSWINSZ,
+            struct.pack("HHHH", TERMINAL_ROWS, TERMINAL_COLUMNS, 0, 0),
+        )
+        try:
+            process = subprocess.Popen(
+                " ".join(command),
+                shell=True,
+                cwd=self._context.cwd or None,
+                env={**os.environ, **(environment or {})},
+                stdin=terminal,
+                stdout=terminal,
+                stderr=terminal,
+                start_new_session=True,
+            )
+        except BaseException:
+            os.close(controller)
+            raise
+        finally:
+            os.close(terminal)
+
+        return PseudoTerminalProcess(process, controller)
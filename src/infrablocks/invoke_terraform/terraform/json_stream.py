@@ -0,0 +1,185 @@
+import re
+from collections.abc import Iterator
+from json import JSONDecodeError, JSONDecoder
+from typing import IO, Any
+
+_DECODER = JSONDecoder()
+_NON_WHITESPACE = re.compile(r"\S")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+class JSONStreamReader:
+    def __init__(self, stream: IO[str], chunk_size: int = 1 << 20):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+        self._captured: list[str] | None = None
+        self._capture_start = 0
+
+    def _read_more(self, minimum: int = 0) -> bool:
+        if self._exhausted:
+            return False
+        chunk = self._stream.read(max(self._chunk_size, minimum))
+        if not chunk:
+            self._exhausted = True
+            return False
+        if self._captured is not None:
+            self._captured.append(
+                self._buffer[self._capture_start : self._position]
+            )
+            self._capture_start = 0
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def start_capture(self) -> None:
+        self.peek()
+        self._captured = []
+        self._capture_start = self._position
+
+    def stop_capture(self) -> str:
+        if self._captured is None:
+            raise ValueError("JSON stream is not capturing.")
+        captured = "".join(
+            [
+                *self._captured,
+                self._buffer[self._capture_start : self._position],
+            ]
+        )
+        self._captured = None
+        return captured
+
+    def peek(self) -> str:
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._position)
+            if match is not None:
+                self._position = match.start()
+                return self._buffer[self._position]
+            self._position = len(self._buffer)
+            if not self._read_more():
+                return ""
+
+    def _expect(self, character: str) -> None:
+        found = self.peek()
+        if found != character:
+            raise ValueError(
+                f"Expected {character!r} in JSON stream, found {found!r}."
+            )
+        self._position += 1
+
+    def read_value_and_raw(self) -> tuple[Any, str]:
+        if self.peek() == "":
+            raise ValueError("Unexpected end of JSON stream.")
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except JSONDecodeError:
+                if not self._read_more(len(self._buffer)):
+                    raise
+                continue
+            if self._may_continue(value, end) and self._read_more():
+                continue
+            raw = self._buffer[self._position : end]
+            self._position = end
+            return value, raw
+
+    def _may_continue(self, value: Any, end: int) -> bool:
+        if end == len(self._buffer):
+            return True
+        return (
+            isinstance(value, int | float)
+            and not isinstance(value, bool)
+            and _NUMBER_TAIL.match(self._buffer, end) is not None
+        )
+
+    def read_value(self) -> Any:
+        return self.read_value_and_raw()[0]
+
+    def read_raw(self) -> str:
+        first = self.peek()
+        if first not in ("{", "[", '"'):
+            return self.read_value_and_raw()[1]
+        while True:
+            end = self._scan_end(first)
+            if end is not None:
+                raw = self._buffer[self._position : end]
+                self._position = end
+                return raw
+            if not self._read_more(len(self._buffer)):
+                raise ValueError("Unexpected end of JSON stream.")
+
+    def _scan_end(self, first: str) -> int | None:
+        if first == '"':
+            tail = _STRING_TAIL.match(self._buffer, self._position + 1)
+            return tail.end() if tail is not None else None
+
+        depth = 0
+        position = self._position
+        while True:
+            match = _STRUCTURE.search(self._buffer, position)
+            if match is None:
+                return None
+            match match.group():
+                case '"':
+                    tail = _STRING_TAIL.match(self._buffer, match.end())
+                    if tail is None:
+                        return None
+                    position = tail.end()
+                    continue
+                case "{" | "[":
+                    depth += 1
+                case _:
+                    depth -= 1
+            position = match.end()
+            if depth == 0:
+                return position
+
+    def skip(self, depth: int = 0) -> None:
+        match self.peek() if depth > 0 else "":
+            case "{":
+                for _ in self.iter_object():
+                    self.skip(depth - 1)
+            case "[":
+                for _ in self.iter_array():
+                    self.skip(depth - 1)
+            case _:
+                self.read_raw()
+
+    def iter_object(self) -> Iterator[str]:
+        self._expect("{")
+        if self.peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            separator = self.peek()
+            self._position += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(
+                    f"Expected ',' or '}}' in JSON stream, found "
+                    f"{separator!r}."
+                )
+
+    def iter_array(self) -> Iterator[None]:
+        self._expect("[")
+        if self.peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield None
+            separator = self.peek()
+            self._position += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(
+                    f"Expected ',' or ']' in JSON stream, found {separator!r}."
+                )
@@ -0,0 +1,292 @@
+import json
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import cached_property
+from typing import IO, Any, Literal
+
+from .json_stream import JSONStreamReader
+
+type PlanColumn = Literal["type", "module", "provider", "mode", "actions"]
+
+_SKIP_DEPTH = 4
+
+
+class _InternedColumn:
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes = array("I")
+        self._codes_by_value: dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes_by_value[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code(self, value: str) -> int | None:
+        return self._codes_by_value.get(value)
+
+    def __getitem__(self, position: int) -> str:
+        return self.values[self.codes[position]]
+
+    def positions(
+        self, codes: set[int], candidates: Sequence[int] | None
+    ) -> array[int]:
+        column = self.codes
+        if candidates is None:
+            return array(
+                "I",
+                (
+                    position
+                    for position, code in enumerate(column)
+                    if code in codes
+                ),
+            )
+        return array(
+            "I",
+            (position for position in candidates if column[position] in codes),
+        )
+
+
+class ResourceChange:
+    def __init__(self, table: "PlanTable", position: int):
+        self._table = table
+        self._position = position
+
+    @property
+    def address(self) -> str:
+        return self._table.addresses[self._position]
+
+    @property
+    def type(self) -> str:
+        return self._table.column("type")[self._position]
+
+    @property
+    def module(self) -> str:
+        return self._table.column("module")[self._position]
+
+    @property
+    def provider(self) -> str:
+        return self._table.column("provider")[self._position]
+
+    @property
+    def mode(self) -> str:
+        return self._table.column("mode")[self._position]
+
+    @property
+    def actions(self) -> tuple[str, ...]:
+        return tuple(self._table.column("actions")[self._position].split(","))
+
+    @cached_property
+    def change(self) -> dict[str, Any]:
+        return json.loads(self._table.raw_changes[self._position]).get(
+            "change", {}
+        )
+
+    @property
+    def before(self) -> Any:
+        return self.change.get("before")
+
+    @property
+    def after(self) -> Any:
+        return self.change.get("after")
+
+    def __repr__(self) -> str:
+        return f"<ResourceChange {self.address} {','.join(self.actions)}>"
+
+
+class PlanSelection:
+    def __init__(self, table: "PlanTable", positions: array[int]):
+        self._table = table
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __iter__(self) -> Iterator[ResourceChange]:
+        return (
+            ResourceChange(self._table, position)
+            for position in self.positions
+        )
+
+    @property
+    def addresses(self) -> list[str]:
+        addresses = self._table.addresses
+        return [addresses[position] for position in self.positions]
+
+    def count_by(self, column: PlanColumn) -> Counter[str]:
+        return self._table.count_by(column, self.positions)
+
+
+def _read_resource_change(reader: JSONStreamReader) -> dict[str, Any]:
+    resource_change: dict[str, Any] = {}
+    for key in reader.iter_object():
+        match key:
+            case "change":
+                change: dict[str, Any] = {}
+                for member in reader.iter_object():
+                    if member == "actions":
+                        change["actions"] = reader.read_value()
+                    else:
+                        reader.read_raw()
+                resource_change["change"] = change
+            case (
+                "address"
+                | "type"
+                | "module_address"
+                | "provider_name"
+                | "mode"
+            ):
+                resource_change[key] = reader.read_value()
+            case _:
+                reader.read_raw()
+    return resource_change
+
+
+class PlanTable:
+    def __init__(
+        self,
+        format_version: str | None = None,
+        terraform_version: str | None = None,
+    ):
+        self.format_version = format_version
+        self.terraform_version = terraform_version
+        self.addresses: list[str] = []
+        self.raw_changes: list[str] = []
+        self._columns: dict[PlanColumn, _InternedColumn] = {
+            "type": _InternedColumn(),
+            "module": _InternedColumn(),
+            "provider": _InternedColumn(),
+            "mode": _InternedColumn(),
+            "actions": _InternedColumn(),
+        }
+
+    @staticmethod
+    def load(stream: IO[str]) -> "PlanTable":
+        reader = JSONStreamReader(stream)
+        table = PlanTable()
+        for key in reader.iter_object():
+            match key:
+                case "format_version":
+                    table.format_version = reader.read_value()
+                case "terraform_version":
+                    table.terraform_version = reader.read_value()
+                case "resource_changes":
+                    for _ in reader.iter_array():
+                        reader.start_capture()
+                        resource_change = _read_resource_change(reader)
+                        table.append(resource_change, reader.stop_capture())
+                case _:
+                    reader.skip(depth=_SKIP_DEPTH)
+        return table
+
+    def append(self, resource_change: dict[str, Any], raw: str) -> None:
+        change = resource_change.get("change", {})
+        self.addresses.append(resource_change.get("address") or "")
+        self.raw_changes.append(raw)
+        self._columns["type"].append(resource_change.get("type") or "")
+        self._columns["module"].append(
+            resource_change.get("module_address") or ""
+        )
+        self._columns["provider"].append(
+            resource_change.get("provider_name") or ""
+        )
+        self._columns["mode"].append(resource_change.get("mode") or "managed")
+        self._columns["actions"].append(",".join(change.get("actions", [])))
+
+    def column(self, name: PlanColumn) -> _InternedColumn:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __iter__(self) -> Iterator[ResourceChange]:
+        return iter(self.select())
+
+    @cached_property
+    def _by_address(self) -> dict[str, int]:
+        return {
+            address: position
+            for position, address in enumerate(self.addresses)
+        }
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._by_address
+
+    def __getitem__(self, address: str) -> ResourceChange:
+        return ResourceChange(self, self._by_address[address])
+
+    def position(self, address: str) -> int:
+        return self._by_address[address]
+
+    def select(
+        self,
+        type: str | None = None,
+        module: str | None = None,
+        provider: str | None = None,
+        mode: str | None = None,
+        action: str | None = None,
+        changed: bool | None = None,
+    ) -> PlanSelection:
+        filters: list[tuple[PlanColumn, set[int]]] = []
+        values: tuple[tuple[PlanColumn, str | None], ...] = (
+            ("type", type),
+            ("module", module),
+            ("provider", provider),
+            ("mode", mode),
+        )
+        for name, value in values:
+            if value is not None:
+                code = self._columns[name].code(value)
+                filters.append((name, set() if code is None else {code}))
+        if action is not None:
+            filters.append(
+                (
+                    "actions",
+                    self._action_codes(lambda actions: action in actions),
+                )
+            )
+        if changed is not None:
+            filters.append(
+                (
+                    "actions",
+                    self._action_codes(
+                        lambda actions: (
+                            (actions not in (["no-op"], ["read"])) == changed
+                        )
+                    ),
+                )
+            )
+
+        positions: array[int] | None = None
+        for name, codes in filters:
+            positions = self._columns[name].positions(codes, positions)
+        if positions is None:
+            positions = array("I", range(len(self)))
+        return PlanSelection(self, positions)
+
+    def _action_codes(self, matches: Callable[[list[str]], bool]) -> set[int]:
+        return {
+            code
+            for code, actions in enumerate(self._columns["actions"].values)
+            if matches(actions.split(","))
+        }
+
+    def count_by(
+        self, column: PlanColumn, positions: Iterable[int] | None = None
+    ) -> Counter[str]:
+        interned = self._columns[column]
+        codes = (
+            interned.codes
+            if positions is None
+            else (interned.codes[position] for position in positions)
+        )
+        return Counter(
+            {
+                interned.values[code]: count
+                for code, count in Counter(codes).items()
+            }
+        )
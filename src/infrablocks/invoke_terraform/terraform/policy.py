@@ -0,0 +1,193 @@
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, cast
+
+from .plan import PlanSelection, PlanTable, ResourceChange
+
+PUBLIC_BUCKET_ACLS = frozenset({"public-read", "public-read-write"})
+PUBLIC_ACCESS_BLOCK_SETTINGS = (
+    "block_public_acls",
+    "block_public_policy",
+    "ignore_public_acls",
+    "restrict_public_buckets",
+)
+
+
+@dataclass(frozen=True)
+class Violation:
+    rule: str
+    address: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.rule}: {self.address}: {self.message}"
+
+
+class Rule:
+    name: str = "rule"
+    types: frozenset[str] | None = None
+
+    def evaluate(self, changes: PlanSelection) -> list[Violation]:
+        raise NotImplementedError
+
+
+def _writes(change: ResourceChange) -> bool:
+    actions = change.actions
+    return "create" in actions or "update" in actions
+
+
+def _after(change: ResourceChange) -> Mapping[str, Any]:
+    after = change.after
+    if not isinstance(after, Mapping):
+        return {}
+    return cast(Mapping[str, Any], after)
+
+
+@dataclass(frozen=True)
+class ForbiddenActions(Rule):
+    actions: frozenset[str]
+    types: frozenset[str] | None = None
+    name: str = "forbidden-actions"
+
+    def evaluate(self, changes: PlanSelection) -> list[Violation]:
+        return [
+            Violation(
+                self.name,
+                change.address,
+                f"action {action!r} is forbidden.",
+            )
+            for change in changes
+            for action in change.actions
+            if action in self.actions
+        ]
+
+
+@dataclass(frozen=True)
+class DestroyGuard(ForbiddenActions):
+    actions: frozenset[str] = frozenset({"delete"})
+    types: frozenset[str] | None = None
+    name: str = "destroy-guard"
+
+
+@dataclass(frozen=True)
+class RequiredTags(Rule):
+    tags: frozenset[str]
+    types: frozenset[str] | None = None
+    attribute: str = "tags"
+    name: str = "required-tags"
+
+    def evaluate(self, changes: PlanSelection) -> list[Violation]:
+        violations: list[Violation] = []
+        for change in changes:
+            if change.mode != "managed" or not _writes(change):
+                continue
+            after = _after(change)
+            if self.attribute not in after:
+                continue
+            tags: Mapping[str, Any] = after[self.attribute] or {}
+            missing = sorted(self.tags.difference(tags))
+            if missing:
+                violations.append(
+                    Violation(
+                        self.name,
+                        change.address,
+                        f"missing required tags: {', '.join(missing)}.",
+                    )
+                )
+        return violations
+
+
+@dataclass(frozen=True)
+class NoPublicBuckets(Rule):
+    types: frozenset[str] | None = frozenset(
+        {
+            "aws_s3_bucket",
+            "aws_s3_bucket_acl",
+            "aws_s3_bucket_public_access_block",
+        }
+    )
+    name: str = "no-public-buckets"
+
+    def evaluate(self, changes: PlanSelection) -> list[Violation]:
+        violations: list[Violation] = []
+        for change in changes:
+            if not _writes(change):
+                continue
+            message = self._public_setting(change.type, _after(change))
+            if message is not None:
+                violations.append(
+                    Violation(self.name, change.address, message)
+                )
+        return violations
+
+    @staticmethod
+    def _public_setting(type: str, after: Mapping[str, Any]) -> str | None:
+        if type == "aws_s3_bucket_public_access_block":
+            disabled = [
+                setting
+                for setting in PUBLIC_ACCESS_BLOCK_SETTINGS
+                if after.get(setting) is False
+            ]
+            if disabled:
+                return f"public access block disables {', '.join(disabled)}."
+            return None
+        acl = after.get("acl")
+        if acl in PUBLIC_BUCKET_ACLS:
+            return f"bucket ACL {acl!r} is public."
+        return None
+
+
+@dataclass(frozen=True)
+class PolicyResult:
+    violations: Sequence[Violation] = ()
+    evaluated: int = 0
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+    def raise_for_violations(self) -> None:
+        if self.violations:
+            raise ValueError(
+                "Plan violates policy:\n"
+                + "\n".join(f"  {violation}" for violation in self.violations)
+            )
+
+
+class Policy:
+    def __init__(self, rules: Iterable[Rule], enforce: bool = True):
+        self.rules = tuple(rules)
+        self.enforce = enforce
+        self._rules_by_type: dict[str, list[Rule]] = {}
+        self._untyped_rules: list[Rule] = []
+        for rule in self.rules:
+            if rule.types is None:
+                self._untyped_rules.append(rule)
+                continue
+            for type in rule.types:
+                self._rules_by_type.setdefault(type, []).append(rule)
+
+    def evaluate(self, plan: PlanTable) -> PolicyResult:
+        violations: list[Violation] = []
+        for type in plan.column("type").values:
+            rules = self._rules_by_type.get(type)
+            if rules is None:
+                continue
+            batch = plan.select(type=type, changed=True)
+            if not batch:
+                continue
+            for rule in rules:
+                violations.extend(rule.evaluate(batch))
+
+        if self._untyped_rules:
+            batch = plan.select(changed=True)
+            for rule in self._untyped_rules:
+                violations.extend(rule.evaluate(batch))
+
+        return PolicyResult(
+            violations=sorted(
+                violations,
+                key=lambda violation: plan.position(violation.address),
+            ),
+            evaluated=len(plan),
+        )
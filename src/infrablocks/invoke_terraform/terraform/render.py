@@ -0,0 +1,133 @@
+import gzip
+import json
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, cast
+
+MAXIMUM_GROUPS = 50
+
+ACTION_ORDER = (
+    "create",
+    "update",
+    "replace",
+    "delete",
+    "read",
+    "import",
+    "move",
+    "remove",
+)
+
+
+@dataclass
+class RenderedPlan:
+    by_action: Counter[str] = field(default_factory=Counter[str])
+    by_module: dict[str, Counter[str]] = field(
+        default_factory=dict[str, Counter[str]]
+    )
+    drifted: int = 0
+    errors: int = 0
+    totals: Mapping[str, Any] | None = None
+    details_path: Path | None = None
+
+
+def _format_counts(counts: Mapping[str, int]) -> str:
+    ordered = sorted(
+        counts,
+        key=lambda action: (
+            ACTION_ORDER.index(action)
+            if action in ACTION_ORDER
+            else len(ACTION_ORDER),
+            action,
+        ),
+    )
+    return ", ".join(f"{counts[action]} {action}" for action in ordered)
+
+
+class PlanRenderer:
+    def __init__(
+        self,
+        output: IO[str],
+        details_path: Path | None = None,
+        maximum_groups: int = MAXIMUM_GROUPS,
+    ):
+        self._output = output
+        self._details_path = details_path
+        self._maximum_groups = maximum_groups
+
+    def render(self, lines: Iterable[str]) -> RenderedPlan:
+        rendered = RenderedPlan(details_path=self._details_path)
+        if self._details_path is None:
+            for line in lines:
+                self._consume(rendered, line)
+        else:
+            self._details_path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self._details_path, "wt") as details:
+                for line in lines:
+                    details.write(line)
+                    self._consume(rendered, line)
+
+        self._write_summary(rendered)
+        return rendered
+
+    def _consume(self, rendered: RenderedPlan, line: str) -> None:
+        try:
+            decoded = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(decoded, dict):
+            return
+        message = cast(dict[str, Any], decoded)
+
+        match message.get("type"):
+            case "planned_change":
+                change: dict[str, Any] = message.get("change") or {}
+                action = str(change.get("action", "unknown"))
+                resource: dict[str, Any] = change.get("resource") or {}
+                module = str(resource.get("module") or "(root)")
+                rendered.by_action[action] += 1
+                rendered.by_module.setdefault(module, Counter())[action] += 1
+            case "resource_drift":
+                rendered.drifted += 1
+            case "change_summary":
+                rendered.totals = message.get("changes")
+            case "diagnostic":
+                diagnostic: dict[str, Any] = message.get("diagnostic") or {}
+                if diagnostic.get("severity") == "error":
+                    rendered.errors += 1
+                self._output.write(f"{message.get('@message', '')}\n")
+                if diagnostic.get("detail"):
+                    self._output.write(f"  {diagnostic['detail']}\n")
+            case _:
+                pass
+
+    def _write_summary(self, rendered: RenderedPlan) -> None:
+        write = self._output.write
+        if rendered.totals is not None:
+            write(
+                f"Plan: {rendered.totals.get('add', 0)} to add, "
+                f"{rendered.totals.get('change', 0)} to change, "
+                f"{rendered.totals.get('remove', 0)} to destroy.\n"
+            )
+        elif rendered.by_action:
+            write(f"Plan: {_format_counts(rendered.by_action)}.\n")
+        else:
+            write("No changes.\n")
+
+        modules = sorted(
+            rendered.by_module.items(),
+            key=lambda item: (-sum(item[1].values()), item[0]),
+        )
+        for module, counts in modules[: self._maximum_groups]:
+            write(f"  {module}: {_format_counts(counts)}\n")
+        if len(modules) > self._maximum_groups:
+            write(
+                f"  ... and {len(modules) - self._maximum_groups} more "
+                "modules.\n"
+            )
+
+        if rendered.drifted:
+            write(f"Resources changed outside Terraform: {rendered.drifted}\n")
+        if self._details_path is not None:
+            write(f"Full plan details: {self._details_path}\n")
@@ -0,0 +1,327 @@
+import json
+import sys
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from functools import cached_property
+from threading import Lock
+from typing import IO, Any
+
+from .json_stream import JSONStreamReader
+
+type IndexKey = int | str | None
+
+
+def _format_index_key(index_key: IndexKey) -> str:
+    if index_key is None:
+        return ""
+    if isinstance(index_key, int):
+        return f"[{index_key}]"
+    return f"[{json.dumps(index_key)}]"
+
+
+def resource_address(
+    module: str, mode: str, type: str, name: str, index_key: IndexKey
+) -> str:
+    parts = [module] if module else []
+    if mode == "data":
+        parts.append("data")
+    parts.append(f"{type}.{name}{_format_index_key(index_key)}")
+    return ".".join(parts)
+
+
+class _RawResource:
+    def __init__(self, raw_instances: str):
+        self._raw_instances = raw_instances
+
+    @cached_property
+    def instances(self) -> list[dict[str, Any]]:
+        return json.loads(self._raw_instances)
+
+
+class ResourceInstance:
+    def __init__(
+        self,
+        module: str,
+        mode: str,
+        type: str,
+        name: str,
+        provider: str,
+        index_key: IndexKey,
+        resource: _RawResource,
+        position: int,
+    ):
+        self.module = module
+        self.mode = mode
+        self.type = type
+        self.name = name
+        self.provider = provider
+        self.index_key = index_key
+        self._resource = resource
+        self._position = position
+
+    @cached_property
+    def address(self) -> str:
+        return resource_address(
+            self.module, self.mode, self.type, self.name, self.index_key
+        )
+
+    @cached_property
+    def attributes(self) -> Mapping[str, Any]:
+        return self._resource.instances[self._position].get("attributes", {})
+
+    def __repr__(self) -> str:
+        return f"<ResourceInstance {self.address}>"
+
+
+class StateIndex:
+    def __init__(
+        self,
+        lineage: str | None,
+        serial: int | None,
+        instances: list[ResourceInstance],
+        raw_outputs: Mapping[str, str] | None = None,
+    ):
+        self.lineage = lineage
+        self.serial = serial
+        self._instances = instances
+        self._raw_outputs: Mapping[str, str] = (
+            raw_outputs if raw_outputs is not None else {}
+        )
+        self._by_type: dict[str, list[int]] = {}
+        self._by_module: dict[str, list[int]] = {}
+        for position, instance in enumerate(instances):
+            self._by_type.setdefault(instance.type, []).append(position)
+            self._by_module.setdefault(instance.module, []).append(position)
+
+    @cached_property
+    def _by_address(self) -> dict[str, int]:
+        return {
+            instance.address: position
+            for position, instance in enumerate(self._instances)
+        }
+
+    @staticmethod
+    def load(
+        stream: IO[str], cache: "StateIndexCache | None" = None
+    ) -> "StateIndex":
+        return _StateParser(JSONStreamReader(stream), cache).parse()
+
+    @staticmethod
+    def read_version(stream: IO[str]) -> tuple[str | None, int | None]:
+        reader = JSONStreamReader(stream)
+        lineage: str | None = None
+        serial: int | None = None
+        for key in reader.iter_object():
+            match key:
+                case "lineage":
+                    lineage = reader.read_value()
+                case "serial":
+                    serial = reader.read_value()
+                case _:
+                    reader.skip()
+            if lineage is not None and serial is not None:
+                break
+        return lineage, serial
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __iter__(self) -> Iterator[ResourceInstance]:
+        return iter(self._instances)
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._by_address
+
+    def __getitem__(self, address: str) -> ResourceInstance:
+        return self._instances[self._by_address[address]]
+
+    def get(self, address: str) -> ResourceInstance | None:
+        position = self._by_address.get(address)
+        return self._instances[position] if position is not None else None
+
+    @property
+    def types(self) -> list[str]:
+        return list(self._by_type)
+
+    @property
+    def modules(self) -> list[str]:
+        return list(self._by_module)
+
+    def find(
+        self,
+        type: str | None = None,
+        module: str | None = None,
+        mode: str | None = None,
+    ) -> list[ResourceInstance]:
+        candidates: list[int] | range
+        if type is not None and module is not None:
+            by_type = self._by_type.get(type, [])
+            by_module = self._by_module.get(module, [])
+            smaller, larger = sorted([by_type, by_module], key=len)
+            members = set(larger)
+            candidates = [
+                position for position in smaller if position in members
+            ]
+        elif type is not None:
+            candidates = self._by_type.get(type, [])
+        elif module is not None:
+            candidates = self._by_module.get(module, [])
+        else:
+            candidates = range(len(self._instances))
+
+        instances = [self._instances[position] for position in candidates]
+        if mode is not None:
+            instances = [
+                instance for instance in instances if instance.mode == mode
+            ]
+        return instances
+
+    def attribute_values(
+        self,
+        type: str,
+        attribute: str,
+        module: str | None = None,
+        mode: str | None = "managed",
+    ) -> list[Any]:
+        return [
+            instance.attributes.get(attribute)
+            for instance in self.find(type=type, module=module, mode=mode)
+        ]
+
+    @property
+    def output_names(self) -> list[str]:
+        return list(self._raw_outputs)
+
+    def output(self, name: str) -> Any:
+        return json.loads(self._raw_outputs[name]).get("value")
+
+    def outputs(self) -> dict[str, Any]:
+        return {name: self.output(name) for name in self._raw_outputs}
+
+    def is_sensitive_output(self, name: str) -> bool:
+        return bool(json.loads(self._raw_outputs[name]).get("sensitive"))
+
+
+class StateIndexCache:
+    def __init__(self, maximum_size: int = 8):
+        self._maximum_size = maximum_size
+        self._entries: OrderedDict[tuple[str, int], StateIndex] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, lineage: str, serial: int) -> StateIndex | None:
+        with self._lock:
+            index = self._entries.get((lineage, serial))
+            if index is not None:
+                self._entries.move_to_end((lineage, serial))
+            return index
+
+    def put(self, index: StateIndex) -> None:
+        if index.lineage is None or index.serial is None:
+            return
+        with self._lock:
+            self._entries[(index.lineage, index.serial)] = index
+            self._entries.move_to_end((index.lineage, index.serial))
+            while len(self._entries) > self._maximum_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+default_state_index_cache = StateIndexCache()
+
+
+class _StateParser:
+    def __init__(
+        self, reader: JSONStreamReader, cache: StateIndexCache | None
+    ):
+        self._reader = reader
+        self._cache = cache
+        self._lineage: str | None = None
+        self._serial: int | None = None
+        self._instances: list[ResourceInstance] = []
+        self._raw_outputs: dict[str, str] = {}
+
+    def parse(self) -> StateIndex:
+        for key in self._reader.iter_object():
+            match key:
+                case "lineage":
+                    self._lineage = self._reader.read_value()
+                case "serial":
+                    self._serial = self._reader.read_value()
+                case "outputs":
+                    for name in self._reader.iter_object():
+                        self._raw_outputs[name] = self._reader.read_raw()
+                case "resources":
+                    for _ in self._reader.iter_array():
+                        self._parse_resource()
+                case _:
+                    self._reader.skip()
+
+            cached = self._cached()
+            if cached is not None:
+                return cached
+
+        index = StateIndex(
+            self._lineage, self._serial, self._instances, self._raw_outputs
+        )
+        if self._cache is not None:
+            self._cache.put(index)
+        return index
+
+    def _cached(self) -> StateIndex | None:
+        if (
+            self._cache is None
+            or self._lineage is None
+            or self._serial is None
+        ):
+            return None
+        return self._cache.get(self._lineage, self._serial)
+
+    def _parse_resource(self) -> None:
+        header: dict[str, str] = {}
+        index_keys: list[IndexKey] = []
+        raw_instances = "[]"
+        for key in self._reader.iter_object():
+            match key:
+                case "module" | "mode" | "type" | "name" | "provider":
+                    header[key] = self._reader.read_value()
+                case "instances":
+                    self._reader.start_capture()
+                    index_keys = self._parse_index_keys()
+                    raw_instances = self._reader.stop_capture()
+                case _:
+                    self._reader.skip()
+
+        shared = _RawResource(raw_instances)
+        module = sys.intern(header.get("module", ""))
+        mode = sys.intern(header.get("mode", "managed"))
+        type = sys.intern(header.get("type", ""))
+        name = header.get("name", "")
+        provider = sys.intern(header.get("provider", ""))
+        for position, index_key in enumerate(index_keys):
+            self._instances.append(
+                ResourceInstance(
+                    module=module,
+                    mode=mode,
+                    type=type,
+                    name=name,
+                    provider=provider,
+                    index_key=index_key,
+                    resource=shared,
+                    position=position,
+                )
+            )
+
+    def _parse_index_keys(self) -> list[IndexKey]:
+        index_keys: list[IndexKey] = []
+        for _ in self._reader.iter_array():
+            index_key: IndexKey = None
+            for key in self._reader.iter_object():
+                if key == "index_key":
+                    index_key = self._reader.read_value()
+                else:
+                    self._reader.read_raw()
+            index_keys.append(index_key)
+        return index_keys
@@ -0,0 +1,170 @@
+import hashlib
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .plan import PlanTable
+from .policy import PolicyResult
+
+
+def _count_changes(
+    before: Mapping[str, int], after: Mapping[str, int]
+) -> dict[str, int]:
+    deltas = {
+        key: after.get(key, 0) - before.get(key, 0)
+        for key in sorted({*before, *after})
+    }
+    return {key: delta for key, delta in deltas.items() if delta != 0}
+
+
+@dataclass(frozen=True)
+class PlanDiff:
+    added: Mapping[str, str] = field(default_factory=dict[str, str])
+    removed: Mapping[str, str] = field(default_factory=dict[str, str])
+    changed: Mapping[str, tuple[str, str]] = field(
+        default_factory=dict[str, tuple[str, str]]
+    )
+    by_action: Mapping[str, int] = field(default_factory=dict[str, int])
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def render(self) -> str:
+        if self.is_empty:
+            return "Plan matches the previously approved plan."
+        lines = [
+            *(
+                f"  + {address}: {actions}"
+                for address, actions in self.added.items()
+            ),
+            *(
+                f"  - {address}: {actions}"
+                for address, actions in self.removed.items()
+            ),
+            *(
+                f"  ~ {address}: {before} -> {after}"
+                for address, (before, after) in self.changed.items()
+            ),
+        ]
+        return "Plan differs from the previously approved plan:\n" + "\n".join(
+            lines
+        )
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    fingerprint: str
+    by_action: Mapping[str, int]
+    by_type: Mapping[str, int]
+    by_module: Mapping[str, int]
+    changes: Mapping[str, str]
+    digests: Mapping[str, str]
+
+    @staticmethod
+    def of(plan: PlanTable) -> "PlanSummary":
+        changed = plan.select(changed=True)
+        actions = plan.column("actions")
+        fingerprint = hashlib.sha256()
+        changes: dict[str, str] = {}
+        digests: dict[str, str] = {}
+        for position in changed.positions:
+            address = plan.addresses[position]
+            digest = hashlib.sha256(plan.raw_changes[position].encode())
+            fingerprint.update(digest.digest())
+            changes[address] = actions[position]
+            digests[address] = digest.hexdigest()[:16]
+
+        return PlanSummary(
+            fingerprint=fingerprint.hexdigest(),
+            by_action=dict(plan.count_by("actions")),
+            by_type=dict(changed.count_by("type")),
+            by_module=dict(changed.count_by("module")),
+            changes=changes,
+            digests=digests,
+        )
+
+    @staticmethod
+    def merge(summaries: Iterable["PlanSummary"]) -> "PlanSummary":
+        by_action: Counter[str] = Counter()
+        by_type: Counter[str] = Counter()
+        by_module: Counter[str] = Counter()
+        changes: dict[str, str] = {}
+        digests: dict[str, str] = {}
+        for summary in summaries:
+            by_action.update(summary.by_action)
+            by_type.update(summary.by_type)
+            by_module.update(summary.by_module)
+            changes.update(summary.changes)
+            digests.update(summary.digests)
+
+        fingerprint = hashlib.sha256()
+        for address in sorted(digests):
+            fingerprint.update(f"{address}={digests[address]}\n".encode())
+
+        return PlanSummary(
+            fingerprint=fingerprint.hexdigest(),
+            by_action=dict(by_action),
+            by_type=dict(by_type),
+            by_module=dict(by_module),
+            changes=changes,
+            digests=digests,
+        )
+
+    @staticmethod
+    def from_dict(contents: Mapping[str, Any]) -> "PlanSummary":
+        return PlanSummary(
+            fingerprint=contents["fingerprint"],
+            by_action=contents["by_action"],
+            by_type=contents["by_type"],
+            by_module=contents["by_module"],
+            changes=contents["changes"],
+            digests=contents["digests"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "by_action": dict(self.by_action),
+            "by_type": dict(self.by_type),
+            "by_module": dict(self.by_module),
+            "changes": dict(self.changes),
+            "digests": dict(self.digests),
+        }
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changes)
+
+    def diff(self, previous: "PlanSummary") -> PlanDiff:
+        if self.fingerprint == previous.fingerprint:
+            return PlanDiff()
+
+        return PlanDiff(
+            added={
+                address: actions
+                for address, actions in self.changes.items()
+                if address not in previous.changes
+            },
+            removed={
+                address: actions
+                for address, actions in previous.changes.items()
+                if address not in self.changes
+            },
+            changed={
+                address: (previous.changes[address], actions)
+                for address, actions in self.changes.items()
+                if address in previous.changes
+                and previous.digests.get(address) != self.digests[address]
+            },
+            by_action=_count_changes(previous.by_action, self.by_action),
+        )
+
+
+@dataclass(frozen=True)
+class PlanReport:
+    summary: PlanSummary
+    diff: PlanDiff | None = None
+    policy: PolicyResult | None = None
+    applied: bool = False
@@ -1,7 +1,14 @@
 import json
-from collections.abc import Mapping, Sequence
-from tempfile import TemporaryFile
-from typing import IO, Literal
+import shlex
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from typing import IO, TYPE_CHECKING, Literal
+
+from .state import StateIndex, StateIndexCache, default_state_index_cache
+
+if TYPE_CHECKING:
+    from .console import ConsoleSession
+    from .graph import ResourceGraph
+    from .plan import PlanTable
 
 type ConfigurationValue = (
     bool
@@ -19,6 +26,11 @@ type StreamName = Literal["stdout"] | Literal["stderr"]
 type StreamNames = set[StreamName]
 
 
+PLAN_CHANGES_PRESENT = 2
+PLAN_EXIT_CODES = frozenset({0, PLAN_CHANGES_PRESENT})
+WORKSPACE_ENVIRONMENT_VARIABLE = "TF_WORKSPACE"
+
+
 class Result:
     def __init__(
         self, stdout: IO[str] | None = None, stderr: IO[str] | None = None
@@ -27,6 +39,21 @@ class Result:
         self.stderr = stderr
 
 
+class Process:
+    @property
+    def alive(self) -> bool:
+        raise NotImplementedError
+
+    def write(self, text: str) -> None:
+        raise NotImplementedError
+
+    def readline(self, timeout: float | None = None) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
 class Executor:
     def execute(
         self,
@@ -34,7 +61,22 @@ class Executor:
         environment: Environment | None = None,
         stdout: IO[str] | None = None,
         stderr: IO[str] | None = None,
-    ) -> None:
+        exit_codes: Collection[int] | None = None,
+    ) -> int:
+        raise NotImplementedError
+
+    def stream(
+        self,
+        command: Sequence[str],
+        environment: Environment | None = None,
+    ) -> Iterator[str]:
+        raise NotImplementedError
+
+    def spawn(
+        self,
+        command: Sequence[str],
+        environment: Environment | None = None,
+    ) -> Process:
         raise NotImplementedError
 
 
@@ -46,6 +88,8 @@ def _capture_stream(
     capture: StreamNames | None, stream: StreamName
 ) -> IO[str] | None:
     if _captures(capture, stream):
+        from tempfile import TemporaryFile
+
         return TemporaryFile(mode="w+t")
     return None
 
@@ -60,6 +104,7 @@ class Terraform:
         backend_config: BackendConfig | None = None,
         reconfigure: bool = False,
         environment: Environment | None = None,
+        backend: bool = True,
     ):
         base_command = self._build_base_command(chdir)
         command = (
@@ -71,6 +116,9 @@ class Terraform:
         if reconfigure:
             command = command + ["-reconfigure"]
 
+        if not backend:
+            command = command + ["-backend=false"]
+
         self._executor.execute(command, environment=environment)
 
     def validate(
@@ -87,33 +135,113 @@ class Terraform:
 
         self._executor.execute(command, environment=environment)
 
-    def plan(
+    def fmt(
         self,
         chdir: str | None = None,
-        vars: Variables | None = None,
+        check: bool = False,
+        recursive: bool = False,
+        diff: bool = False,
         environment: Environment | None = None,
     ):
         base_command = self._build_base_command(chdir)
-        command = base_command + ["plan"] + self._build_vars(vars)
+        command = base_command + ["fmt"]
+
+        if check:
+            command = command + ["-check"]
+        if recursive:
+            command = command + ["-recursive"]
+        if diff:
+            command = command + ["-diff"]
 
         self._executor.execute(command, environment=environment)
 
-    def apply(
+    def plan(
         self,
         chdir: str | None = None,
         vars: Variables | None = None,
-        autoapprove: bool = False,
         environment: Environment | None = None,
-    ):
+        out: str | None = None,
+        refresh: bool = True,
+        refresh_only: bool = False,
+        detailed_exitcode: bool = False,
+        targets: Sequence[str] | None = None,
+        lock: bool = True,
+    ) -> bool | None:
         base_command = self._build_base_command(chdir)
-        autoapprove_flag = ["-auto-approve"] if autoapprove else []
         command = (
             base_command
-            + ["apply"]
-            + autoapprove_flag
+            + ["plan"]
+            + self._build_vars(vars)
+            + self._build_refresh(refresh, refresh_only)
+            + self._build_targets(targets)
+            + self._build_lock(lock)
+        )
+
+        if out is not None:
+            command = command + [f"-out={out}"]
+
+        if not detailed_exitcode:
+            self._executor.execute(command, environment=environment)
+            return None
+
+        exit_code = self._executor.execute(
+            command + ["-detailed-exitcode"],
+            environment=environment,
+            exit_codes=PLAN_EXIT_CODES,
+        )
+        return exit_code == PLAN_CHANGES_PRESENT
+
+    def stream_plan(
+        self,
+        chdir: str | None = None,
+        vars: Variables | None = None,
+        environment: Environment | None = None,
+        out: str | None = None,
+        refresh: bool = True,
+        refresh_only: bool = False,
+        targets: Sequence[str] | None = None,
+        lock: bool = True,
+    ) -> Iterator[str]:
+        base_command = self._build_base_command(chdir)
+        command = (
+            base_command
+            + ["plan", "-json"]
             + self._build_vars(vars)
+            + self._build_refresh(refresh, refresh_only)
+            + self._build_targets(targets)
+            + self._build_lock(lock)
         )
 
+        if out is not None:
+            command = command + [f"-out={out}"]
+
+        return self._executor.stream(command, environment=environment)
+
+    def apply(
+        self,
+        chdir: str | None = None,
+        vars: Variables | None = None,
+        autoapprove: bool = False,
+        environment: Environment | None = None,
+        plan_file: str | None = None,
+        refresh: bool = True,
+        refresh_only: bool = False,
+        targets: Sequence[str] | None = None,
+    ):
+        base_command = self._build_base_command(chdir)
+        autoapprove_flag = ["-auto-approve"] if autoapprove else []
+        command = base_command + ["apply"] + autoapprove_flag
+
+        if plan_file is not None:
+            command = command + [plan_file]
+        else:
+            command = (
+                command
+                + self._build_vars(vars)
+                + self._build_refresh(refresh, refresh_only)
+                + self._build_targets(targets)
+            )
+
         self._executor.execute(command, environment=environment)
 
     def destroy(
@@ -170,6 +298,135 @@ class Terraform:
         if name is not None:
             command = command + [name]
 
+        return self._execute_capturing(command, environment, capture)
+
+    def show(
+        self,
+        chdir: str | None = None,
+        plan_file: str | None = None,
+        json: bool = False,
+        environment: Environment | None = None,
+        capture: StreamNames | None = None,
+    ) -> Result:
+        base_command = self._build_base_command(chdir)
+        command = base_command + ["show"]
+
+        if json:
+            command = command + ["-json"]
+        if plan_file is not None:
+            command = command + [plan_file]
+
+        return self._execute_capturing(command, environment, capture)
+
+    def graph(
+        self,
+        chdir: str | None = None,
+        environment: Environment | None = None,
+        capture: StreamNames | None = None,
+    ) -> Result:
+        base_command = self._build_base_command(chdir)
+        command = base_command + ["graph"]
+
+        return self._execute_capturing(command, environment, capture)
+
+    def load_graph(
+        self,
+        chdir: str | None = None,
+        environment: Environment | None = None,
+    ) -> "ResourceGraph":
+        from .graph import ResourceGraph
+
+        result = self.graph(
+            chdir=chdir, environment=environment, capture={"stdout"}
+        )
+        if result.stdout is None:
+            raise ValueError("Graph was not captured.")
+
+        with result.stdout:
+            return ResourceGraph.load(result.stdout)
+
+    def console(
+        self,
+        chdir: str | None = None,
+        vars: Variables | None = None,
+        environment: Environment | None = None,
+    ) -> "ConsoleSession":
+        from .console import ConsoleSession
+
+        base_command = self._build_base_command(chdir)
+        command = base_command + ["console"] + self._build_vars(vars)
+
+        return ConsoleSession(
+            self._executor.spawn(command, environment=environment)
+        )
+
+    def load_plan(
+        self,
+        plan_file: str,
+        chdir: str | None = None,
+        environment: Environment | None = None,
+    ) -> "PlanTable":
+        from .plan import PlanTable
+
+        result = self.show(
+            chdir=chdir,
+            plan_file=plan_file,
+            json=True,
+            environment=environment,
+            capture={"stdout"},
+        )
+        if result.stdout is None:
+            raise ValueError("Plan was not captured.")
+
+        with result.stdout:
+            return PlanTable.load(result.stdout)
+
+    def state_pull(
+        self,
+        chdir: str | None = None,
+        environment: Environment | None = None,
+        capture: StreamNames | None = None,
+    ) -> Result:
+        base_command = self._build_base_command(chdir)
+        command = base_command + ["state", "pull"]
+
+        return self._execute_capturing(command, environment, capture)
+
+    def load_state(
+        self,
+        chdir: str | None = None,
+        environment: Environment | None = None,
+        cache: StateIndexCache | None = default_state_index_cache,
+    ) -> StateIndex:
+        result = self.state_pull(
+            chdir=chdir, environment=environment, capture={"stdout"}
+        )
+        if result.stdout is None:
+            raise ValueError("State was not captured.")
+
+        with result.stdout:
+            return StateIndex.load(result.stdout, cache=cache)
+
+    def state_version(
+        self,
+        chdir: str | None = None,
+        environment: Environment | None = None,
+    ) -> tuple[str | None, int | None]:
+        result = self.state_pull(
+            chdir=chdir, environment=environment, capture={"stdout"}
+        )
+        if result.stdout is None:
+            raise ValueError("State was not captured.")
+
+        with result.stdout:
+            return StateIndex.read_version(result.stdout)
+
+    def _execute_capturing(
+        self,
+        command: list[str],
+        environment: Environment | None,
+        capture: StreamNames | None,
+    ) -> Result:
         stdout = _capture_stream(capture, "stdout")
         stderr = _capture_stream(capture, "stderr")
 
@@ -205,6 +462,25 @@ class Terraform:
             for key, value in variables.items()
         ]
 
+    @staticmethod
+    def _build_refresh(refresh: bool, refresh_only: bool) -> list[str]:
+        if refresh_only:
+            return ["-refresh-only"]
+        if not refresh:
+            return ["-refresh=false"]
+        return []
+
+    @staticmethod
+    def _build_targets(targets: Sequence[str] | None) -> list[str]:
+        if targets is None:
+            return []
+
+        return [f"-target={shlex.quote(target)}" for target in targets]
+
+    @staticmethod
+    def _build_lock(lock: bool) -> list[str]:
+        return [] if lock else ["-lock=false"]
+
     @staticmethod
     def _format_configuration_value(
         option_key: str, key: str, value: ConfigurationValue
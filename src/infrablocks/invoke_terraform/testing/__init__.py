@@ -0,0 +1,58 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .fake_terraform import install_fake_terraform
+    from .http_backend import (
+        BackendMetrics,
+        HTTPStateBackend,
+        HTTPStateClient,
+        StateLocked,
+    )
+    from .recording import RecordingExecutor, RecordingTerraformFactory
+    from .replay import ReplayExecutor, ReplayTerraformFactory
+    from .transcript import Replayer, Transcript, TranscriptEntry
+
+_LAZY_EXPORTS = {
+    "BackendMetrics": ".http_backend",
+    "HTTPStateBackend": ".http_backend",
+    "HTTPStateClient": ".http_backend",
+    "RecordingExecutor": ".recording",
+    "RecordingTerraformFactory": ".recording",
+    "ReplayExecutor": ".replay",
+    "ReplayTerraformFactory": ".replay",
+    "Replayer": ".transcript",
+    "StateLocked": ".http_backend",
+    "Transcript": ".transcript",
+    "TranscriptEntry": ".transcript",
+    "install_fake_terraform": ".fake_terraform",
+}
+
+__all__ = [
+    "BackendMetrics",
+    "HTTPStateBackend",
+    "HTTPStateClient",
+    "RecordingExecutor",
+    "RecordingTerraformFactory",
+    "ReplayExecutor",
+    "ReplayTerraformFactory",
+    "Replayer",
+    "StateLocked",
+    "Transcript",
+    "TranscriptEntry",
+    "install_fake_terraform",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
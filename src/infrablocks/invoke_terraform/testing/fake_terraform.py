@@ -0,0 +1,78 @@
+import os
+import shlex
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from infrablocks.invoke_terraform.testing.transcript import (
+    Replayer,
+    Transcript,
+)
+
+TRANSCRIPT_ENVIRONMENT_VARIABLE = "FAKE_TERRAFORM_TRANSCRIPT"
+LATENCY_ENVIRONMENT_VARIABLE = "FAKE_TERRAFORM_LATENCY"
+TIME_SCALE_ENVIRONMENT_VARIABLE = "FAKE_TERRAFORM_TIME_SCALE"
+CURSOR_ENVIRONMENT_VARIABLE = "FAKE_TERRAFORM_CURSOR"
+UNRECORDED_EXIT_CODE = 127
+MODULE = "infrablocks.invoke_terraform.testing.fake_terraform"
+
+
+def install_fake_terraform(
+    directory: Path,
+    transcript: Path,
+    latency: float | None = None,
+    time_scale: float = 1.0,
+) -> Path:
+    source_root = Path(__file__).resolve().parents[3]
+    settings = {
+        TRANSCRIPT_ENVIRONMENT_VARIABLE: str(transcript.resolve()),
+        TIME_SCALE_ENVIRONMENT_VARIABLE: str(time_scale),
+        CURSOR_ENVIRONMENT_VARIABLE: str(
+            transcript.resolve().with_suffix(".cursor")
+        ),
+    }
+    if latency is not None:
+        settings[LATENCY_ENVIRONMENT_VARIABLE] = str(latency)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    binary = directory / "terraform"
+    binary.write_text(
+        "#!/bin/sh\n"
+        + "".join(
+            f"export {name}=${{{name}:-{shlex.quote(value)}}}\n"
+            for name, value in settings.items()
+        )
+        + f"export PYTHONPATH={shlex.quote(str(source_root))}"
+        + "${PYTHONPATH:+:$PYTHONPATH}\n"
+        + f"exec {shlex.quote(sys.executable)} -m {MODULE} "
+        + '"$@"\n'
+    )
+    binary.chmod(0o755)
+    return binary
+
+
+def main(arguments: Sequence[str]) -> int:
+    environment = os.environ
+    latency = environment.get(LATENCY_ENVIRONMENT_VARIABLE)
+    cursor = environment.get(CURSOR_ENVIRONMENT_VARIABLE)
+    replayer = Replayer(
+        Transcript.load(Path(environment[TRANSCRIPT_ENVIRONMENT_VARIABLE])),
+        latency=float(latency) if latency else None,
+        time_scale=float(environment.get(TIME_SCALE_ENVIRONMENT_VARIABLE, 1)),
+        cursor=Path(cursor) if cursor else None,
+    )
+    try:
+        entry = replayer.replay(
+            shlex.quote(argument) for argument in ["terraform", *arguments]
+        )
+    except ValueError as error:
+        sys.stderr.write(f"{error}\n")
+        return UNRECORDED_EXIT_CODE
+
+    sys.stdout.write(entry.stdout)
+    sys.stderr.write(entry.stderr)
+    return entry.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
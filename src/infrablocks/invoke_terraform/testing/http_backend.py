@@ -0,0 +1,372 @@
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Self, cast
+from urllib.parse import parse_qs, urlsplit
+
+STATE_PATH_PREFIX = "/state/"
+LOCK_PATH_PREFIX = "/lock/"
+SIMULATED_LOCK_ID = "simulated-contention"
+
+
+@dataclass(frozen=True)
+class BackendMetrics:
+    requests: Mapping[str, int] = field(default_factory=dict[str, int])
+    lock_conflicts: int = 0
+    simulated_conflicts: int = 0
+    maximum_in_flight: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+class _BackendRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_LOCK(self) -> None:
+        self._dispatch("LOCK")
+
+    def do_UNLOCK(self) -> None:
+        self._dispatch("UNLOCK")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        status, payload = cast(_BackendServer, self.server).backend.handle(
+            method, url.path, query, body
+        )
+        self.send_response(status)
+        if payload:
+            digest = base64.b64encode(hashlib.md5(payload).digest())
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-MD5", digest.decode())
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+
+class _BackendServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], backend: "HTTPStateBackend"):
+        super().__init__(address, _BackendRequestHandler)
+        self.backend = backend
+
+
+class HTTPStateBackend:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        contention: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.contention = contention
+        self._address = (host, port)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._states: dict[str, bytes] = {}
+        self._locks: dict[str, dict[str, Any]] = {}
+        self._requests: Counter[str] = Counter()
+        self._lock_conflicts = 0
+        self._simulated_conflicts = 0
+        self._in_flight = 0
+        self._maximum_in_flight = 0
+        self._server: _BackendServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def start(self) -> Self:
+        if self._server is not None:
+            return self
+        self._server = _BackendServer(self._address, self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise ValueError("Backend must be started before use.")
+        host, port = self._server.server_address[:2]
+        return f"http://{cast(str, host)}:{port}"
+
+    def backend_config(self, name: str = "default") -> dict[str, str]:
+        return {
+            "address": f"{self.url}{STATE_PATH_PREFIX}{name}",
+            "lock_address": f"{self.url}{LOCK_PATH_PREFIX}{name}",
+            "unlock_address": f"{self.url}{LOCK_PATH_PREFIX}{name}",
+            "lock_method": "LOCK",
+            "unlock_method": "UNLOCK",
+        }
+
+    def state(self, name: str = "default") -> dict[str, Any] | None:
+        with self._lock:
+            contents = self._states.get(name)
+        return json.loads(contents) if contents is not None else None
+
+    def put_state(self, state: Mapping[str, Any], name: str = "default"):
+        with self._lock:
+            self._states[name] = json.dumps(state).encode()
+
+    def lock_info(self, name: str = "default") -> dict[str, Any] | None:
+        with self._lock:
+            return self._locks.get(name)
+
+    def metrics(self) -> BackendMetrics:
+        with self._lock:
+            return BackendMetrics(
+                requests=dict(self._requests),
+                lock_conflicts=self._lock_conflicts,
+                simulated_conflicts=self._simulated_conflicts,
+                maximum_in_flight=self._maximum_in_flight,
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._locks.clear()
+            self._requests.clear()
+            self._lock_conflicts = 0
+            self._simulated_conflicts = 0
+            self._maximum_in_flight = 0
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Mapping[str, str],
+        body: bytes,
+    ) -> tuple[int, bytes]:
+        with self._lock:
+            self._requests[method] += 1
+            self._in_flight += 1
+            self._maximum_in_flight = max(
+                self._maximum_in_flight, self._in_flight
+            )
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        try:
+            if delay > 0:
+                time.sleep(delay)
+            return self._handle(method, path, query, body)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handle(
+        self,
+        method: str,
+        path: str,
+        query: Mapping[str, str],
+        body: bytes,
+    ) -> tuple[int, bytes]:
+        match method, path:
+            case "GET", _ if path.startswith(STATE_PATH_PREFIX):
+                return self._get(path.removeprefix(STATE_PATH_PREFIX))
+            case "POST", _ if path.startswith(STATE_PATH_PREFIX):
+                return self._post(
+                    path.removeprefix(STATE_PATH_PREFIX), query.get("ID"), body
+                )
+            case "DELETE", _ if path.startswith(STATE_PATH_PREFIX):
+                return self._delete(path.removeprefix(STATE_PATH_PREFIX))
+            case "LOCK", _ if path.startswith(LOCK_PATH_PREFIX):
+                return self._acquire(path.removeprefix(LOCK_PATH_PREFIX), body)
+            case "UNLOCK", _ if path.startswith(LOCK_PATH_PREFIX):
+                return self._release(path.removeprefix(LOCK_PATH_PREFIX), body)
+            case _:
+                return HTTPStatus.NOT_FOUND, b""
+
+    def _get(self, name: str) -> tuple[int, bytes]:
+        with self._lock:
+            contents = self._states.get(name)
+        if contents is None:
+            return HTTPStatus.NO_CONTENT, b""
+        return HTTPStatus.OK, contents
+
+    def _post(
+        self, name: str, lock_id: str | None, body: bytes
+    ) -> tuple[int, bytes]:
+        with self._lock:
+            held = self._locks.get(name)
+            if held is not None and held.get("ID") != lock_id:
+                self._lock_conflicts += 1
+                return HTTPStatus.LOCKED, json.dumps(held).encode()
+            self._states[name] = body
+        return HTTPStatus.OK, b""
+
+    def _delete(self, name: str) -> tuple[int, bytes]:
+        with self._lock:
+            self._states.pop(name, None)
+        return HTTPStatus.OK, b""
+
+    def _acquire(self, name: str, body: bytes) -> tuple[int, bytes]:
+        info = _lock_info(body)
+        with self._lock:
+            if self.contention and self._random.random() < self.contention:
+                self._simulated_conflicts += 1
+                return HTTPStatus.LOCKED, json.dumps(
+                    {
+                        "ID": SIMULATED_LOCK_ID,
+                        "Operation": "OperationTypeApply",
+                        "Who": "http-backend",
+                    }
+                ).encode()
+            held = self._locks.get(name)
+            if held is not None:
+                self._lock_conflicts += 1
+                return HTTPStatus.LOCKED, json.dumps(held).encode()
+            self._locks[name] = info
+        return HTTPStatus.OK, b""
+
+    def _release(self, name: str, body: bytes) -> tuple[int, bytes]:
+        info = _lock_info(body)
+        with self._lock:
+            held = self._locks.get(name)
+            if held is None:
+                return HTTPStatus.OK, b""
+            if info.get("ID") not in (None, "", held.get("ID")):
+                self._lock_conflicts += 1
+                return HTTPStatus.CONFLICT, json.dumps(held).encode()
+            del self._locks[name]
+        return HTTPStatus.OK, b""
+
+
+def _lock_info(body: bytes) -> dict[str, Any]:
+    try:
+        info = json.loads(body or b"{}")
+    except ValueError:
+        return {}
+    return cast(dict[str, Any], info) if isinstance(info, dict) else {}
+
+
+class StateLocked(Exception):
+    def __init__(self, info: Mapping[str, Any]):
+        super().__init__(f"State is locked by {info.get('ID', 'unknown')}.")
+        self.info = info
+
+
+class HTTPStateClient:
+    def __init__(
+        self,
+        backend_config: Mapping[str, str],
+        retry_max: int = 20,
+        retry_wait: float = 0.01,
+        retry_wait_max: float = 0.5,
+    ):
+        self._config = backend_config
+        self._retry_max = retry_max
+        self._retry_wait = retry_wait
+        self._retry_wait_max = retry_wait_max
+        self.retries = 0
+
+    def lock(self, operation: str = "OperationTypeApply") -> str:
+        lock_id = str(uuid.uuid4())
+        info = json.dumps({"ID": lock_id, "Operation": operation}).encode()
+        wait = self._retry_wait
+        for attempt in range(self._retry_max + 1):
+            status, payload = self._request(
+                self._config.get("lock_method", "LOCK"),
+                self._config["lock_address"],
+                info,
+            )
+            if status == HTTPStatus.OK:
+                return lock_id
+            if attempt == self._retry_max:
+                raise StateLocked(_lock_info(payload))
+            self.retries += 1
+            time.sleep(wait)
+            wait = min(wait * 2, self._retry_wait_max)
+        raise StateLocked({})
+
+    def unlock(self, lock_id: str) -> None:
+        status, payload = self._request(
+            self._config.get("unlock_method", "UNLOCK"),
+            self._config["unlock_address"],
+            json.dumps({"ID": lock_id}).encode(),
+        )
+        if status != HTTPStatus.OK:
+            raise StateLocked(_lock_info(payload))
+
+    def pull(self) -> dict[str, Any] | None:
+        status, payload = self._request("GET", self._config["address"])
+        if status != HTTPStatus.OK or not payload:
+            return None
+        return cast(dict[str, Any], json.loads(payload))
+
+    def push(
+        self, state: Mapping[str, Any], lock_id: str | None = None
+    ) -> None:
+        address = self._config["address"]
+        if lock_id is not None:
+            address = f"{address}?ID={lock_id}"
+        status, payload = self._request(
+            "POST", address, json.dumps(state).encode()
+        )
+        if status != HTTPStatus.OK:
+            raise StateLocked(_lock_info(payload))
+
+    @staticmethod
+    def _request(
+        method: str, url: str, body: bytes | None = None
+    ) -> tuple[int, bytes]:
+        request = urllib.request.Request(url, data=body, method=method)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as error:
+            with error:
+                return error.code, error.read()
@@ -0,0 +1,131 @@
+import io
+import sys
+import time
+from collections.abc import Collection, Iterable, Iterator
+from typing import IO
+
+from invoke.context import Context
+
+from infrablocks.invoke_terraform.terraform import (
+    Environment,
+    Executor,
+    InvokeExecutor,
+    Terraform,
+    TerraformFactory,
+)
+
+from .transcript import Transcript, TranscriptEntry, command_argv
+
+
+class _TeeStream(io.StringIO):
+    def __init__(self, target: IO[str] | None, default: IO[str]):
+        super().__init__()
+        self._target = target if target is not None else default
+
+    def write(self, s: str) -> int:
+        self._target.write(s)
+        return super().write(s)
+
+    def flush(self) -> None:
+        self._target.flush()
+
+
+def _exit_code(error: Exception) -> int:
+    result = getattr(error, "result", None)
+    exited = getattr(result, "exited", None)
+    return exited if isinstance(exited, int) else 1
+
+
+class RecordingExecutor(Executor):
+    def __init__(self, executor: Executor, transcript: Transcript):
+        self._executor = executor
+        self.transcript = transcript
+
+    def execute(
+        self,
+        command: Iterable[str],
+        environment: Environment | None = None,
+        stdout: IO[str] | None = None,
+        stderr: IO[str] | None = None,
+        exit_codes: Collection[int] | None = None,
+    ) -> int:
+        command = list(command)
+        out = _TeeStream(stdout, sys.stdout)
+        err = _TeeStream(stderr, sys.stderr)
+        started = time.monotonic()
+        exit_code = 0
+        try:
+            exit_code = self._executor.execute(
+                command,
+                environment=environment,
+                stdout=out,
+                stderr=err,
+                exit_codes=exit_codes,
+            )
+            return exit_code
+        except Exception as error:
+            exit_code = _exit_code(error)
+            raise
+        finally:
+            self._record(
+                command,
+                out.getvalue(),
+                err.getvalue(),
+                exit_code,
+                time.monotonic() - started,
+            )
+
+    def stream(
+        self,
+        command: Iterable[str],
+        environment: Environment | None = None,
+    ) -> Iterator[str]:
+        command = list(command)
+        lines: list[str] = []
+        started = time.monotonic()
+        exit_code = 0
+        try:
+            for line in self._executor.stream(
+                command, environment=environment
+            ):
+                lines.append(line)
+                yield line
+        except Exception as error:
+            exit_code = _exit_code(error)
+            raise
+        finally:
+            self._record(
+                command,
+                "".join(lines),
+                "",
+                exit_code,
+                time.monotonic() - started,
+            )
+
+    def _record(
+        self,
+        command: list[str],
+        stdout: str,
+        stderr: str,
+        exit_code: int,
+        duration: float,
+    ) -> None:
+        self.transcript.append(
+            TranscriptEntry(
+                argv=command_argv(command),
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=exit_code,
+                duration=duration,
+            )
+        )
+
+
+class RecordingTerraformFactory(TerraformFactory):
+    def __init__(self, transcript: Transcript):
+        self.transcript = transcript
+
+    def build(self, context: Context) -> Terraform:
+        return Terraform(
+            RecordingExecutor(InvokeExecutor(context), self.transcript)
+        )
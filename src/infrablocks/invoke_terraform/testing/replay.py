@@ -0,0 +1,67 @@
+import sys
+from collections.abc import Collection, Iterable, Iterator
+from typing import IO
+
+from invoke.context import Context
+from invoke.exceptions import UnexpectedExit
+from invoke.runners import Result
+
+from infrablocks.invoke_terraform.terraform import (
+    Environment,
+    Executor,
+    Terraform,
+    TerraformFactory,
+)
+
+from .transcript import Replayer, TranscriptEntry
+
+
+def _unexpected_exit(entry: TranscriptEntry) -> UnexpectedExit:
+    return UnexpectedExit(
+        Result(
+            command=" ".join(entry.argv),
+            stdout=entry.stdout,
+            stderr=entry.stderr,
+            exited=entry.exit_code,
+        )
+    )
+
+
+class ReplayExecutor(Executor):
+    def __init__(self, replayer: Replayer):
+        self._replayer = replayer
+
+    def execute(
+        self,
+        command: Iterable[str],
+        environment: Environment | None = None,
+        stdout: IO[str] | None = None,
+        stderr: IO[str] | None = None,
+        exit_codes: Collection[int] | None = None,
+    ) -> int:
+        entry = self._replayer.replay(command)
+        (stdout if stdout is not None else sys.stdout).write(entry.stdout)
+        (stderr if stderr is not None else sys.stderr).write(entry.stderr)
+        allowed = exit_codes if exit_codes is not None else {0}
+        if entry.exit_code not in allowed:
+            raise _unexpected_exit(entry)
+        return entry.exit_code
+
+    def stream(
+        self,
+        command: Iterable[str],
+        environment: Environment | None = None,
+    ) -> Iterator[str]:
+        entry = self._replayer.replay(command)
+        sys.stderr.write(entry.stderr)
+        yield from entry.stdout.splitlines(keepends=True)
+        if entry.exit_code != 0:
+            raise _unexpected_exit(entry)
+
+
+class ReplayTerraformFactory(TerraformFactory):
+    def __init__(self, replayer: Replayer):
+        self._replayer = replayer
+
+    def build(self, context: Context) -> Terraform:
+        return Terraform(ReplayExecutor(self._replayer))
@@ -0,0 +1,141 @@
+import fcntl
+import json
+import shlex
+import threading
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, cast
+
+TRANSCRIPT_VERSION = 1
+
+
+def command_argv(command: Iterable[str]) -> list[str]:
+    return shlex.split(" ".join(command))
+
+
+@dataclass(frozen=True)
+class TranscriptEntry:
+    argv: Sequence[str]
+    stdout: str = ""
+    stderr: str = ""
+    exit_code: int = 0
+    duration: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "argv": list(self.argv),
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "exit_code": self.exit_code,
+            "duration": self.duration,
+        }
+
+    @staticmethod
+    def from_dict(entry: Mapping[str, Any]) -> "TranscriptEntry":
+        return TranscriptEntry(
+            argv=[str(argument) for argument in entry["argv"]],
+            stdout=str(entry.get("stdout", "")),
+            stderr=str(entry.get("stderr", "")),
+            exit_code=int(entry.get("exit_code", 0)),
+            duration=float(entry.get("duration", 0.0)),
+        )
+
+
+@dataclass
+class Transcript:
+    entries: list[TranscriptEntry] = field(
+        default_factory=list[TranscriptEntry]
+    )
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def append(self, entry: TranscriptEntry) -> None:
+        with self._lock:
+            self.entries.append(entry)
+
+    def matching(self, argv: Sequence[str]) -> list[TranscriptEntry]:
+        with self._lock:
+            return [
+                entry for entry in self.entries if list(entry.argv) == argv
+            ]
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            entries = [entry.to_dict() for entry in self.entries]
+        return {"version": TRANSCRIPT_VERSION, "entries": entries}
+
+    @staticmethod
+    def from_dict(contents: Mapping[str, Any]) -> "Transcript":
+        if contents.get("version") != TRANSCRIPT_VERSION:
+            raise ValueError(
+                f"Unsupported transcript version: {contents.get('version')}."
+            )
+        entries = cast(list[Mapping[str, Any]], contents.get("entries", []))
+        return Transcript([TranscriptEntry.from_dict(e) for e in entries])
+
+    @staticmethod
+    def load(path: Path) -> "Transcript":
+        with open(path) as file:
+            return Transcript.from_dict(json.load(file))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+class Replayer:
+    def __init__(
+        self,
+        transcript: Transcript,
+        latency: float | None = None,
+        time_scale: float = 1.0,
+        cursor: Path | None = None,
+    ):
+        self.transcript = transcript
+        self.latency = latency
+        self.time_scale = time_scale
+        self._cursor = cursor
+        self._lock = threading.Lock()
+        self._occurrences: dict[str, int] = {}
+
+    def replay(self, command: Iterable[str]) -> TranscriptEntry:
+        argv = command_argv(command)
+        entries = self.transcript.matching(argv)
+        if not entries:
+            raise ValueError(f"No recorded run of: {shlex.join(argv)}")
+
+        occurrence = self._next_occurrence(shlex.join(argv))
+        entry = entries[min(occurrence, len(entries) - 1)]
+        delay = (
+            self.latency
+            if self.latency is not None
+            else entry.duration * self.time_scale
+        )
+        if delay > 0:
+            time.sleep(delay)
+        return entry
+
+    def _next_occurrence(self, key: str) -> int:
+        if self._cursor is None:
+            with self._lock:
+                occurrence = self._occurrences.get(key, 0)
+                self._occurrences[key] = occurrence + 1
+            return occurrence
+
+        with open(self._cursor, "a+") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            file.seek(0)
+            try:
+                occurrences = cast(dict[str, int], json.loads(file.read()))
+            except ValueError:
+                occurrences = {}
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+            file.seek(0)
+            file.truncate()
+            file.write(json.dumps(occurrences))
+        return occurrence
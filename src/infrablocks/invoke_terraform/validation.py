@@ -0,0 +1,73 @@
+import hashlib
+import os
+from pathlib import Path
+
+from infrablocks.invoke_terraform.terraform import Environment
+
+from .cache import JSONFileCache, plugin_cache_directory
+from .constants import (
+    DATA_DIRECTORY_ENVIRONMENT_VARIABLE,
+    PLUGIN_CACHE_ENVIRONMENT_VARIABLE,
+)
+from .dependencies import ModuleDependencyIndex, directory_files
+
+VALIDATED_SUFFIXES = (".tf", ".tf.json")
+LOCK_FILE = ".terraform.lock.hcl"
+
+
+def validated_files(directory: Path) -> list[os.DirEntry[str]]:
+    return directory_files(directory, VALIDATED_SUFFIXES, names={LOCK_FILE})
+
+
+def offline_data_directory(source_directory: str) -> Path:
+    return Path(source_directory).resolve() / ".terraform" / "validate"
+
+
+def offline_environment(
+    source_directory: str, environment: Environment | None
+) -> dict[str, str]:
+    plugin_cache = plugin_cache_directory(environment or {})
+    Path(plugin_cache).mkdir(parents=True, exist_ok=True)
+    return {
+        **(environment or {}),
+        DATA_DIRECTORY_ENVIRONMENT_VARIABLE: str(
+            offline_data_directory(source_directory)
+        ),
+        PLUGIN_CACHE_ENVIRONMENT_VARIABLE: plugin_cache,
+    }
+
+
+class ValidationCache:
+    def __init__(
+        self,
+        cache: JSONFileCache | None = None,
+        dependency_index: ModuleDependencyIndex | None = None,
+    ):
+        self._cache = (
+            cache if cache is not None else JSONFileCache.named("validations")
+        )
+        self._dependency_index = (
+            dependency_index
+            if dependency_index is not None
+            else ModuleDependencyIndex()
+        )
+
+    def source_digest(self, source_directory: str) -> str:
+        root = Path(source_directory).resolve()
+        digest = hashlib.sha256()
+        for directory in sorted(self._dependency_index.closure(root)):
+            for entry in validated_files(directory):
+                digest.update(os.path.relpath(entry.path, root).encode())
+                digest.update(b"\0")
+                with open(entry.path, "rb") as file:
+                    digest.update(hashlib.sha256(file.read()).digest())
+        self._dependency_index.save()
+        return digest.hexdigest()
+
+    def matches(self, source_directory: str, digest: str) -> bool:
+        key = str(Path(source_directory).resolve())
+        return self._cache.load().get(key) == digest
+
+    def record(self, source_directory: str, digest: str) -> None:
+        key = str(Path(source_directory).resolve())
+        self._cache.store({**self._cache.load(), key: digest})
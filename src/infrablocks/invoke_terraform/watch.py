@@ -0,0 +1,296 @@
+import ctypes
+import os
+import select
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Literal, TextIO
+
+from infrablocks.invoke_terraform.terraform import Terraform
+
+from .configuration import Configuration
+from .dependencies import ModuleDependencyIndex
+from .validation import offline_environment, validated_files
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.3
+
+INOTIFY_MASK = (
+    0x2  # IN_MODIFY
+    | 0x4  # IN_ATTRIB
+    | 0x8  # IN_CLOSE_WRITE
+    | 0x40  # IN_MOVED_FROM
+    | 0x80  # IN_MOVED_TO
+    | 0x100  # IN_CREATE
+    | 0x200  # IN_DELETE
+)
+
+type WatchEvent = Literal["change", "plan", "stop"]
+type Snapshot = dict[str, tuple[int, int]]
+
+
+class _Inotify:
+    def __init__(self):
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self.fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set[Path] = set()
+
+    @staticmethod
+    def create() -> "_Inotify | None":
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return _Inotify()
+        except (OSError, AttributeError):
+            return None
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        for directory in set(directories) - self._watched:
+            descriptor = self._libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), INOTIFY_MASK
+            )
+            if descriptor >= 0:
+                self._watched.add(directory)
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SourceWatcher:
+    def __init__(
+        self,
+        source_directory: str,
+        dependency_index: ModuleDependencyIndex | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        requests: TextIO | None = None,
+        notify: bool = True,
+    ):
+        self._root = Path(source_directory).resolve()
+        self._dependency_index = (
+            dependency_index
+            if dependency_index is not None
+            else ModuleDependencyIndex()
+        )
+        self._interval = interval
+        self._debounce = debounce
+        self._requests = requests.fileno() if requests is not None else None
+        self._buffer = b""
+        self._inotify = _Inotify.create() if notify else None
+        self._snapshot = self.snapshot()
+
+    @property
+    def notifying(self) -> bool:
+        return self._inotify is not None
+
+    def snapshot(self) -> Snapshot:
+        files: Snapshot = {}
+        directories = self._dependency_index.closure(self._root)
+        if self._inotify is not None:
+            self._inotify.watch(directories)
+        for directory in directories:
+            for entry in validated_files(directory):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def wait(self) -> WatchEvent:
+        while True:
+            request = self._pending_request()
+            if request is not None:
+                return request
+
+            descriptors = [
+                descriptor
+                for descriptor in (
+                    self._requests,
+                    self._inotify.fd if self._inotify is not None else None,
+                )
+                if descriptor is not None
+            ]
+            ready: list[int] = []
+            if descriptors:
+                ready, _, _ = select.select(
+                    descriptors, [], [], self._interval
+                )
+            else:
+                time.sleep(self._interval)
+
+            if self._requests is not None and self._requests in ready:
+                self._read_requests()
+                continue
+
+            if self._inotify is not None:
+                if self._inotify.fd not in ready:
+                    continue
+                self._inotify.drain()
+
+            current = self.snapshot()
+            if current != self._snapshot:
+                self._snapshot = self._settle(current)
+                self._dependency_index.save()
+                return "change"
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _settle(self, current: Snapshot) -> Snapshot:
+        while True:
+            time.sleep(self._debounce)
+            if self._inotify is not None:
+                self._inotify.drain()
+            settled = self.snapshot()
+            if settled == current:
+                return settled
+            current = settled
+
+    def _read_requests(self) -> None:
+        if self._requests is None:
+            return
+        data = os.read(self._requests, 4096)
+        if not data:
+            self._requests = None
+            return
+        self._buffer += data
+
+    def _pending_request(self) -> WatchEvent | None:
+        line, separator, remainder = self._buffer.partition(b"\n")
+        if not separator:
+            return None
+        self._buffer = remainder
+        if line.strip().lower() in (b"q", b"quit"):
+            return "stop"
+        return "plan"
+
+
+class WatchSession:
+    def __init__(
+        self,
+        terraform: Terraform,
+        configuration: Configuration,
+        configuration_name: str,
+        output: TextIO | None = None,
+    ):
+        self._terraform = terraform
+        self._configuration = configuration
+        self._configuration_name = configuration_name
+        self._output = output or sys.stderr
+        self._offline_environment = offline_environment(
+            configuration.source_directory, configuration.environment
+        )
+        self._offline_initialised = False
+        self._backend_initialised = False
+
+    def check(self) -> bool:
+        source_directory = self._configuration.source_directory
+        try:
+            self._terraform.fmt(
+                chdir=source_directory, check=True, recursive=True
+            )
+        except Exception:
+            self._report("fmt failed")
+            return False
+
+        try:
+            self._validate()
+        except Exception:
+            self._report("validate failed")
+            return False
+
+        self._report("fmt and validate passed")
+        return True
+
+    def plan(self) -> bool:
+        configuration = self._configuration
+        try:
+            if not self._backend_initialised:
+                if not configuration.init.skip:
+                    self._terraform.init(
+                        chdir=configuration.source_directory,
+                        backend_config=configuration.init.backend_config,
+                        reconfigure=configuration.init.reconfigure,
+                        environment=configuration.environment,
+                    )
+                if configuration.workspace is not None:
+                    self._terraform.select_workspace(
+                        configuration.workspace,
+                        chdir=configuration.source_directory,
+                        or_create=True,
+                        environment=configuration.environment,
+                    )
+                self._backend_initialised = True
+
+            self._terraform.plan(
+                chdir=configuration.source_directory,
+                vars=configuration.variables,
+                environment=configuration.environment,
+                refresh=False,
+            )
+        except Exception:
+            self._report("plan failed")
+            return False
+
+        self._report("plan complete")
+        return True
+
+    def run(self, watcher: SourceWatcher) -> None:
+        self.check()
+        while True:
+            match watcher.wait():
+                case "change":
+                    self.check()
+                case "plan":
+                    self.plan()
+                case "stop":
+                    return
+
+    def _validate(self) -> None:
+        reinitialised = False
+        if not self._offline_initialised:
+            self._initialise_offline()
+            reinitialised = True
+
+        try:
+            self._validate_offline()
+        except Exception:
+            if reinitialised:
+                raise
+            self._initialise_offline()
+            self._validate_offline()
+
+    def _initialise_offline(self) -> None:
+        self._terraform.init(
+            chdir=self._configuration.source_directory,
+            environment=self._offline_environment,
+            backend=False,
+        )
+        self._offline_initialised = True
+
+    def _validate_offline(self) -> None:
+        self._terraform.validate(
+            chdir=self._configuration.source_directory,
+            environment=self._offline_environment,
+        )
+
+    def _report(self, message: str) -> None:
+        print(
+            f"[{time.strftime('%H:%M:%S')}] "
+            + f"{self._configuration_name}: {message}.",
+            file=self._output,
+            flush=True,
+        )
@@ -0,0 +1,83 @@
+import os
+import shutil
+from pathlib import Path
+
+from invoke.context import Context
+
+from infrablocks.invoke_factory import Arguments
+
+from .configuration import Configuration, ConfigureFunction
+from .constants import DATA_DIRECTORY_ENVIRONMENT_VARIABLE
+
+DEFAULT_DATA_DIRECTORY = ".terraform"
+BACKEND_STATE_FILE = "terraform.tfstate"
+WORKSPACE_FILE = "environment"
+EXCLUDED_DATA_ENTRIES = frozenset(
+    {WORKSPACE_FILE, "matrix", "workspaces", "validate"}
+)
+
+
+def data_directory(configuration: Configuration) -> Path:
+    source_directory = Path(configuration.source_directory)
+    configured = (configuration.environment or {}).get(
+        DATA_DIRECTORY_ENVIRONMENT_VARIABLE
+    )
+    if configured:
+        return source_directory / configured
+    return source_directory / DEFAULT_DATA_DIRECTORY
+
+
+def _link_or_copy(source: str, destination: str) -> str:
+    try:
+        if os.path.lexists(destination):
+            if os.path.samefile(source, destination):
+                return destination
+            os.unlink(destination)
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
+
+
+def clone_data_directory(source: Path, target: Path) -> None:
+    target.mkdir(parents=True, exist_ok=True)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            if entry.name in EXCLUDED_DATA_ENTRIES:
+                continue
+            destination = target / entry.name
+            if entry.is_dir(follow_symlinks=False):
+                shutil.copytree(
+                    entry.path,
+                    destination,
+                    symlinks=True,
+                    copy_function=_link_or_copy,
+                    dirs_exist_ok=True,
+                )
+            elif entry.name == BACKEND_STATE_FILE:
+                shutil.copy2(entry.path, destination)
+            else:
+                _link_or_copy(entry.path, str(destination))
+
+
+def workspace_configure_function(
+    workspace: str,
+    source_data_directory: Path,
+    configure_function: ConfigureFunction[Configuration],
+) -> ConfigureFunction[Configuration]:
+    def configure(
+        context: Context, arguments: Arguments, configuration: Configuration
+    ):
+        configure_function(context, arguments, configuration)
+
+        target = (source_data_directory / "workspaces" / workspace).resolve()
+        clone_data_directory(source_data_directory, target)
+
+        configuration.workspace = workspace
+        configuration.init.skip = True
+        configuration.environment = {
+            **(configuration.environment or {}),
+            DATA_DIRECTORY_ENVIRONMENT_VARIABLE: str(target),
+        }
+
+    return configure
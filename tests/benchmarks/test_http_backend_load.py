@@ -0,0 +1,167 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+from invoke.context import Context
+
+from infrablocks.invoke_terraform.matrix import MatrixCell, run_matrix
+from infrablocks.invoke_terraform.terraform import TerraformFactory
+from infrablocks.invoke_terraform.testing import (
+    HTTPStateBackend,
+    HTTPStateClient,
+)
+
+CELLS = int(os.environ.get("HTTP_BACKEND_BENCHMARK_CELLS", "32"))
+WORKERS = int(os.environ.get("HTTP_BACKEND_BENCHMARK_WORKERS", "8"))
+LATENCY_SECONDS = float(
+    os.environ.get("HTTP_BACKEND_BENCHMARK_LATENCY_S", "0.005")
+)
+CONTENTION = float(os.environ.get("HTTP_BACKEND_BENCHMARK_CONTENTION", "0.2"))
+ELAPSED_BUDGET_SECONDS = float(
+    os.environ.get("HTTP_BACKEND_BENCHMARK_BUDGET_S", "30")
+)
+
+CONFIGURATION = """terraform {
+  backend "http" {}
+}
+
+variable "cell" {}
+
+resource "terraform_data" "cell" {
+  input = var.cell
+}
+"""
+
+
+def increment(client: HTTPStateClient) -> int:
+    lock_id = client.lock()
+    try:
+        state = client.pull() or {"version": 4, "serial": 0}
+        state["serial"] += 1
+        client.push(state, lock_id=lock_id)
+        return state["serial"]
+    finally:
+        client.unlock(lock_id)
+
+
+def cells(count: int, backend: HTTPStateBackend, shared: bool):
+    return [
+        MatrixCell(
+            name=f"cell-{index}",
+            backend_config=backend.backend_config(
+                "shared" if shared else f"cell-{index}"
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+def client(cell: MatrixCell) -> HTTPStateClient:
+    assert isinstance(cell.backend_config, dict)
+    return HTTPStateClient(
+        {key: str(value) for key, value in cell.backend_config.items()},
+        retry_max=200,
+        retry_wait=0.002,
+        retry_wait_max=0.05,
+    )
+
+
+def run_increment(cell: MatrixCell) -> int:
+    return increment(client(cell))
+
+
+class TestHTTPBackendLoad:
+    def test_serialises_concurrent_updates_to_a_shared_state(self):
+        with HTTPStateBackend(
+            latency=LATENCY_SECONDS, contention=CONTENTION, seed=7
+        ) as backend:
+            started = time.monotonic()
+            report = run_matrix(
+                cells(CELLS, backend, shared=True),
+                run_increment,
+                maximum_workers=WORKERS,
+            )
+            elapsed = time.monotonic() - started
+            metrics = backend.metrics()
+
+        report.raise_for_failures()
+        assert backend.state("shared") == {"version": 4, "serial": CELLS}
+        assert sorted(result.result for result in report.results) == list(
+            range(1, CELLS + 1)
+        )
+        assert metrics.lock_conflicts + metrics.simulated_conflicts > 0
+        assert elapsed <= ELAPSED_BUDGET_SECONDS, (
+            f"{CELLS} locked updates took {elapsed:.2f}s, budget is "
+            f"{ELAPSED_BUDGET_SECONDS}s."
+        )
+        print(
+            f"\n{CELLS} locked updates over {WORKERS} workers in "
+            f"{elapsed:.2f}s ({CELLS / elapsed:.1f}/s), "
+            f"{metrics.lock_conflicts} lock conflicts, "
+            f"{metrics.simulated_conflicts} simulated conflicts, "
+            f"{metrics.total_requests} requests."
+        )
+
+    def test_independent_workspaces_overlap_under_latency(self):
+        with HTTPStateBackend(latency=LATENCY_SECONDS * 4) as backend:
+            started = time.monotonic()
+            report = run_matrix(
+                cells(CELLS, backend, shared=False),
+                run_increment,
+                maximum_workers=WORKERS,
+            )
+            elapsed = time.monotonic() - started
+            metrics = backend.metrics()
+
+        report.raise_for_failures()
+        assert metrics.lock_conflicts == 0
+        assert metrics.maximum_in_flight > 1
+        serial = CELLS * 4 * LATENCY_SECONDS * 4
+        print(
+            f"\n{CELLS} independent updates in {elapsed:.2f}s "
+            f"(serial estimate {serial:.2f}s), "
+            f"{metrics.maximum_in_flight} requests in flight at peak."
+        )
+
+    @pytest.mark.skipif(
+        shutil.which("terraform") is None, reason="terraform not installed"
+    )
+    def test_concurrent_terraform_applies_against_backend(
+        self, tmp_path: Path
+    ):
+        (tmp_path / "main.tf").write_text(CONFIGURATION)
+
+        def apply(cell: MatrixCell) -> None:
+            terraform = TerraformFactory().build(Context())
+            environment = {"TF_DATA_DIR": str(tmp_path / ".data" / cell.name)}
+            terraform.init(
+                chdir=str(tmp_path),
+                backend_config=cell.backend_config,
+                environment=environment,
+            )
+            terraform.apply(
+                chdir=str(tmp_path),
+                vars={"cell": cell.name},
+                autoapprove=True,
+                environment=environment,
+            )
+
+        with HTTPStateBackend(
+            latency=LATENCY_SECONDS, contention=CONTENTION
+        ) as backend:
+            started = time.monotonic()
+            report = run_matrix(
+                cells(WORKERS, backend, shared=False),
+                apply,
+                maximum_workers=WORKERS,
+            )
+            elapsed = time.monotonic() - started
+
+        report.raise_for_failures()
+        assert all(
+            backend.state(f"cell-{index}") is not None
+            for index in range(WORKERS)
+        )
+        print(f"\n{WORKERS} terraform applies in {elapsed:.2f}s.")
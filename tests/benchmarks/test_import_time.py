@@ -0,0 +1,45 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SOURCE_DIRECTORY = Path(__file__).parents[2] / "src"
+SAMPLES = 5
+
+IMPORT_TIME_BUDGETS_MICROSECONDS = {
+    "infrablocks.invoke_terraform.terraform": int(
+        os.environ.get("TERRAFORM_IMPORT_BUDGET_US", "60000")
+    ),
+}
+
+_IMPORT_TIME_LINE = re.compile(
+    r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$"
+)
+
+
+def cumulative_import_time(module: str) -> int:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, "PYTHONPATH": str(SOURCE_DIRECTORY)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is not None and match.group(2) == module:
+            return int(match.group(1))
+    raise AssertionError(f"No import time reported for {module}.")
+
+
+class TestImportTime:
+    def test_terraform_wrapper_imports_within_budget(self):
+        module = "infrablocks.invoke_terraform.terraform"
+
+        fastest = min(cumulative_import_time(module) for _ in range(SAMPLES))
+
+        assert fastest <= IMPORT_TIME_BUDGETS_MICROSECONDS[module], (
+            f"Importing {module} took {fastest}us, budget is "
+            f"{IMPORT_TIME_BUDGETS_MICROSECONDS[module]}us."
+        )
@@ -0,0 +1,121 @@
+import io
+import os
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.matrix import MatrixCell, run_matrix
+from infrablocks.invoke_terraform.terraform import TerraformFactory
+from infrablocks.invoke_terraform.testing import (
+    Replayer,
+    ReplayTerraformFactory,
+    Transcript,
+    TranscriptEntry,
+    install_fake_terraform,
+)
+
+INVOCATIONS = int(os.environ.get("REPLAY_BENCHMARK_INVOCATIONS", "200"))
+OVERHEAD_BUDGET_MILLISECONDS = float(
+    os.environ.get("REPLAY_OVERHEAD_BUDGET_MS", "20")
+)
+CELLS = int(os.environ.get("REPLAY_BENCHMARK_CELLS", "8"))
+LATENCY_SECONDS = float(os.environ.get("REPLAY_BENCHMARK_LATENCY_S", "0.2"))
+
+TRANSCRIPT = Transcript(
+    [
+        TranscriptEntry(argv=["terraform", "-chdir=web", "init"]),
+        TranscriptEntry(
+            argv=["terraform", "-chdir=web", "plan", "-var=region=eu-west-2"],
+            stdout="Plan: 1 to add, 0 to change, 0 to destroy.\n",
+        ),
+    ]
+)
+
+
+def configure(_context, _arguments, configuration: Configuration):
+    configuration.source_directory = "web"
+    configuration.variables = {"region": "eu-west-2"}
+
+
+def plan_task(factory: TerraformFactory) -> Task[BodyCallable[Any]]:
+    collection = (
+        TerraformTaskCollection(
+            task_factory=TerraformTaskFactory(terraform_factory=factory)
+        )
+        .for_configuration("web")
+        .with_global_configure_function(configure)
+        .create()
+    )
+    return cast(Task[BodyCallable[Any]], collection.tasks["plan"])
+
+
+class TestReplayOverhead:
+    @pytest.fixture(autouse=True)
+    def cache_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("INVOKE_TERRAFORM_CACHE_DIR", str(tmp_path / "c"))
+
+    def test_library_overhead_per_task_within_budget(self):
+        task = plan_task(
+            ReplayTerraformFactory(Replayer(TRANSCRIPT, latency=0))
+        )
+
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for _ in range(INVOCATIONS):
+                task(Context())
+        overhead = (time.perf_counter() - started) / INVOCATIONS * 1000
+
+        assert overhead <= OVERHEAD_BUDGET_MILLISECONDS, (
+            f"Plan task overhead was {overhead:.2f}ms per invocation, "
+            f"budget is {OVERHEAD_BUDGET_MILLISECONDS}ms."
+        )
+        print(f"\nPlan task overhead: {overhead:.3f}ms per invocation.")
+
+    def test_matrix_cells_overlap_fake_terraform_runs(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        TRANSCRIPT.save(tmp_path / "transcript.json")
+        install_fake_terraform(
+            tmp_path / "bin",
+            tmp_path / "transcript.json",
+            latency=LATENCY_SECONDS,
+        )
+        monkeypatch.setenv(
+            "PATH", f"{tmp_path / 'bin'}{os.pathsep}{os.environ['PATH']}"
+        )
+        task = plan_task(TerraformFactory())
+
+        def run(_cell: MatrixCell) -> None:
+            task(Context())
+
+        started = time.monotonic()
+        report = run_matrix(
+            [MatrixCell(name=f"cell-{index}") for index in range(CELLS)],
+            run,
+            maximum_workers=CELLS,
+        )
+        elapsed = time.monotonic() - started
+
+        report.raise_for_failures()
+        serial = CELLS * 2 * LATENCY_SECONDS
+        assert elapsed < serial, (
+            f"{CELLS} cells took {elapsed:.2f}s, no faster than the "
+            f"{serial:.2f}s serial estimate."
+        )
+        print(
+            f"\n{CELLS} replayed plans in {elapsed:.2f}s "
+            f"(serial estimate {serial:.2f}s)."
+        )
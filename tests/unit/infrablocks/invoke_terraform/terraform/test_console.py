@@ -0,0 +1,259 @@
+import json
+import re
+from collections import deque
+from unittest.mock import Mock
+
+import pytest
+
+from infrablocks.invoke_terraform.terraform import (
+    ConsoleSession,
+    ConsoleSessionPool,
+    Executor,
+    Process,
+    Terraform,
+)
+
+_JSONENCODE = re.compile(r"^jsonencode\(\[(.*)\]\)$")
+_UPPER = re.compile(r'^upper\("(.*)"\)$')
+
+
+class FakeConsoleProcess(Process):
+    def __init__(self, values: dict[str, object], prompt: str = "> "):
+        self._values = values
+        self._prompt = prompt
+        self._output: deque[str] = deque()
+        self._alive = True
+        self.expressions: list[str] = []
+
+    @property
+    def alive(self) -> bool:
+        return self._alive
+
+    def write(self, text: str) -> None:
+        for line in text.splitlines():
+            self._output.append(f"\x1b[0m{self._prompt}{line}\r\n")
+            if line == "exit":
+                self._alive = False
+                continue
+            upper = _UPPER.match(line)
+            if upper is not None:
+                self._output.append(f'"{upper.group(1).upper()}"\r\n')
+                continue
+            expression = _JSONENCODE.match(line)
+            if expression is None:
+                continue
+            self.expressions.append(expression.group(1))
+            if expression.group(1) not in self._values:
+                self._output.extend(
+                    [
+                        "╷\r\n",
+                        "│ Error: Reference to undeclared local value\r\n",
+                        "╵\r\n",
+                    ]
+                )
+                continue
+            encoded = json.dumps([self._values[expression.group(1)]])
+            self._output.append(json.dumps(encoded) + "\r\n")
+
+    def readline(self, timeout: float | None = None) -> str:
+        if not self._output:
+            return ""
+        return self._output.popleft()
+
+    def close(self) -> None:
+        self._alive = False
+
+
+VALUES: dict[str, object] = {
+    "local.name": "network",
+    "local.cidrs": ["10.0.0.0/16", "10.1.0.0/16"],
+    "local.tags": {"team": "platform", "cost": 12},
+    'cidrsubnet("10.0.0.0/16", 8, 1)': "10.0.1.0/24",
+}
+
+
+class TestConsoleSession:
+    def test_evaluates_batch_of_expressions_in_order(self):
+        process = FakeConsoleProcess(VALUES)
+        session = ConsoleSession(process)
+
+        values = session.evaluate(
+            [
+                "local.name",
+                "local.cidrs",
+                "local.tags",
+                'cidrsubnet("10.0.0.0/16", 8, 1)',
+            ]
+        )
+
+        assert values == [
+            "network",
+            ["10.0.0.0/16", "10.1.0.0/16"],
+            {"team": "platform", "cost": 12},
+            "10.0.1.0/24",
+        ]
+
+    def test_reuses_process_across_calls(self):
+        process = FakeConsoleProcess(VALUES)
+        session = ConsoleSession(process)
+
+        session.evaluate_one("local.name")
+        session.evaluate_one("local.cidrs")
+
+        assert process.expressions == ["local.name", "local.cidrs"]
+        assert session.alive
+
+    def test_joins_multiline_expressions(self):
+        process = FakeConsoleProcess({"{ a = 1 }": {"a": 1}})
+        session = ConsoleSession(process)
+
+        assert session.evaluate_one("{\n a = 1 }") == {"a": 1}
+
+    def test_keeps_results_containing_echoed_text(self):
+        process = FakeConsoleProcess(
+            {"local.template": 'jsonencode(["a"])'}, prompt=""
+        )
+        session = ConsoleSession(process)
+
+        assert session.evaluate_one("local.template") == 'jsonencode(["a"])'
+
+    def test_reports_failures_and_stays_usable(self):
+        process = FakeConsoleProcess(VALUES)
+        session = ConsoleSession(process)
+
+        with pytest.raises(ValueError, match="local.missing: Error: Ref"):
+            session.evaluate(["local.name", "local.missing"])
+
+        assert session.evaluate_one("local.name") == "network"
+
+    def test_raises_when_process_exits(self):
+        process = Mock(spec=Process)
+        process.readline.return_value = ""
+
+        with pytest.raises(ValueError, match="exited unexpectedly"):
+            ConsoleSession(process).evaluate_one("local.name")
+
+    def test_closes_process_when_batch_times_out(self):
+        process = FakeConsoleProcess(VALUES)
+        process.readline = Mock(side_effect=TimeoutError("Timed out"))
+        session = ConsoleSession(process)
+
+        with pytest.raises(TimeoutError):
+            session.evaluate(["local.name", "local.cidrs"])
+
+        assert not session.alive
+
+
+class TestConsoleSessionPool:
+    def test_reuses_session_per_directory_and_workspace(self):
+        executor = Mock(spec=Executor)
+        executor.spawn.side_effect = lambda *_, **__: FakeConsoleProcess(
+            VALUES
+        )
+        terraform = Terraform(executor)
+        pool = ConsoleSessionPool()
+
+        pool.evaluate(terraform, ["local.name"], chdir="/a", workspace="x")
+        pool.evaluate(terraform, ["local.tags"], chdir="/a", workspace="x")
+        pool.evaluate(terraform, ["local.name"], chdir="/a", workspace="y")
+
+        assert executor.spawn.call_count == 2
+        assert executor.spawn.call_args.kwargs["environment"] == {
+            "TF_WORKSPACE": "y"
+        }
+        assert len(pool) == 2
+
+    def test_keeps_separate_sessions_per_environment(self):
+        executor = Mock(spec=Executor)
+        executor.spawn.side_effect = lambda *_, **__: FakeConsoleProcess(
+            VALUES
+        )
+        terraform = Terraform(executor)
+        pool = ConsoleSessionPool()
+
+        for environment in [
+            {"AWS_PROFILE": "a", "AWS_REGION": "eu-west-1"},
+            {"AWS_REGION": "eu-west-1", "AWS_PROFILE": "a"},
+            {"AWS_PROFILE": "b", "AWS_REGION": "eu-west-1"},
+        ]:
+            pool.evaluate(
+                terraform, ["local.name"], chdir="/a", environment=environment
+            )
+
+        assert executor.spawn.call_count == 2
+        assert len(pool) == 2
+
+    def test_evicts_sessions_that_fail_mid_batch(self):
+        processes: list[FakeConsoleProcess] = []
+
+        def spawn(*_: object, **__: object) -> FakeConsoleProcess:
+            processes.append(FakeConsoleProcess(VALUES))
+            return processes[-1]
+
+        executor = Mock(spec=Executor)
+        executor.spawn.side_effect = spawn
+        terraform = Terraform(executor)
+        pool = ConsoleSessionPool()
+        pool.evaluate(terraform, ["local.name"], chdir="/a")
+        processes[0].readline = Mock(side_effect=TimeoutError("Timed out"))
+
+        with pytest.raises(TimeoutError):
+            pool.evaluate(terraform, ["local.name"], chdir="/a")
+
+        assert len(pool) == 0
+        assert pool.evaluate(terraform, ["local.name"], chdir="/a") == [
+            "network"
+        ]
+        assert len(processes) == 2
+
+    def test_keeps_sessions_after_expression_errors(self):
+        executor = Mock(spec=Executor)
+        executor.spawn.side_effect = lambda *_, **__: FakeConsoleProcess(
+            VALUES
+        )
+        pool = ConsoleSessionPool()
+
+        with pytest.raises(ValueError):
+            pool.evaluate(Terraform(executor), ["local.missing"], chdir="/a")
+
+        assert len(pool) == 1
+
+    def test_evicts_idle_and_least_recently_used_sessions(self):
+        processes: list[FakeConsoleProcess] = []
+
+        def spawn(*_: object, **__: object) -> FakeConsoleProcess:
+            processes.append(FakeConsoleProcess(VALUES))
+            return processes[-1]
+
+        executor = Mock(spec=Executor)
+        executor.spawn.side_effect = spawn
+        terraform = Terraform(executor)
+        pool = ConsoleSessionPool(maximum_sessions=2)
+
+        for directory in ["/a", "/b", "/c"]:
+            pool.session(terraform, chdir=directory)
+
+        assert [process.alive for process in processes] == [
+            False,
+            True,
+            True,
+        ]
+
+        idle_pool = ConsoleSessionPool(idle_timeout=0)
+        idle_pool.session(terraform, chdir="/a")
+        idle_pool.evict_idle()
+
+        assert len(idle_pool) == 0
+        assert not processes[-1].alive
+
+    def test_closes_all_sessions(self):
+        executor = Mock(spec=Executor)
+        process = FakeConsoleProcess(VALUES)
+        executor.spawn.return_value = process
+        pool = ConsoleSessionPool()
+        pool.session(Terraform(executor), chdir="/a")
+
+        pool.close()
+
+        assert not process.alive
+        assert len(pool) == 0
@@ -0,0 +1,127 @@
+from infrablocks.invoke_terraform.terraform import ResourceGraph
+from infrablocks.invoke_terraform.terraform.graph import is_targetable
+
+LEGACY_GRAPH = """digraph {
+	compound = "true"
+	newrank = "true"
+	subgraph "root" {
+		"[root] aws_instance.web (expand)" [label = "aws_instance.web", shape = "box"]
+		"[root] aws_security_group.web (expand)" [label = "aws_security_group.web", shape = "box"]
+		"[root] module.vpc.aws_vpc.main (expand)" [label = "module.vpc.aws_vpc.main", shape = "box"]
+		"[root] provider[\\"registry.terraform.io/hashicorp/aws\\"]" [label = "provider", shape = "diamond"]
+		"[root] aws_instance.web (expand)" -> "[root] aws_security_group.web (expand)"
+		"[root] aws_instance.web (expand)" -> "[root] local.subnet_id (expand)"
+		"[root] local.subnet_id (expand)" -> "[root] module.vpc (close)"
+		"[root] module.vpc (close)" -> "[root] module.vpc.aws_vpc.main (expand)"
+		"[root] module.vpc.aws_vpc.main (expand)" -> "[root] module.vpc.var.cidr (expand)"
+		"[root] module.vpc.var.cidr (expand)" -> "[root] module.vpc (expand)"
+		"[root] aws_security_group.web (expand)" -> "[root] provider[\\"registry.terraform.io/hashicorp/aws\\"]"
+		"[root] data.aws_ami.base (expand)" -> "[root] provider[\\"registry.terraform.io/hashicorp/aws\\"]"
+		"[root] root" -> "[root] aws_instance.web (expand)"
+	}
+}
+"""
+
+RESOURCE_GRAPH = """digraph G {
+  rankdir = "RL";
+  node [shape = rect, fontname = "sans-serif"];
+  "aws_instance.web" [label="aws_instance.web"];
+  "aws_security_group.web" [label="aws_security_group.web"];
+  "aws_instance.web" -> "aws_security_group.web";
+  "aws_s3_bucket.logs" [label="aws_s3_bucket.logs"];
+}
+"""
+
+
+class TestResourceGraph:
+    def test_parses_legacy_graph_into_resource_addresses(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        assert graph.addresses == [
+            "aws_instance.web",
+            "aws_security_group.web",
+            "data.aws_ami.base",
+            "module.vpc",
+            "module.vpc.aws_vpc.main",
+        ]
+
+    def test_parses_resource_only_graph(self):
+        graph = ResourceGraph.parse(RESOURCE_GRAPH.splitlines())
+
+        assert graph.addresses == [
+            "aws_instance.web",
+            "aws_s3_bucket.logs",
+            "aws_security_group.web",
+        ]
+        assert graph.dependencies_of(["aws_s3_bucket.logs"]) == set()
+
+    def test_follows_dependencies_through_locals_and_modules(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        assert graph.dependencies_of(["aws_instance.web"]) == {
+            "aws_security_group.web",
+            "module.vpc",
+            "module.vpc.aws_vpc.main",
+        }
+
+    def test_minimal_targets_drop_addresses_implied_by_others(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        targets = graph.minimal_targets(
+            [
+                "aws_security_group.web",
+                "aws_instance.web",
+                "module.vpc.aws_vpc.main",
+                "data.aws_ami.base",
+            ]
+        )
+
+        assert targets == ["aws_instance.web", "data.aws_ami.base"]
+
+    def test_minimal_targets_drop_addresses_inside_targeted_modules(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        assert graph.minimal_targets(
+            ["module.vpc", "module.vpc.aws_vpc.main"]
+        ) == ["module.vpc"]
+
+    def test_splits_into_components_ignoring_shared_nodes(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        assert graph.components() == [
+            [
+                "aws_instance.web",
+                "aws_security_group.web",
+                "module.vpc",
+                "module.vpc.aws_vpc.main",
+            ],
+            ["data.aws_ami.base"],
+        ]
+
+    def test_roots_cover_component_including_cycles(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        assert graph.roots(graph.components()[0]) == ["aws_instance.web"]
+        assert graph.roots(["module.vpc", "module.vpc.aws_vpc.main"]) == [
+            "module.vpc"
+        ]
+
+    def test_round_trips_through_dict(self):
+        graph = ResourceGraph.parse(LEGACY_GRAPH.splitlines())
+
+        assert ResourceGraph.from_dict(graph.to_dict()) == graph
+
+
+class TestIsTargetable:
+    def test_accepts_resources_data_sources_and_modules(self):
+        assert is_targetable("aws_vpc.main")
+        assert is_targetable("data.aws_ami.base")
+        assert is_targetable("module.vpc")
+        assert is_targetable('module.app["eu"].aws_instance.web')
+
+    def test_rejects_variables_locals_outputs_and_providers(self):
+        assert not is_targetable("var.region")
+        assert not is_targetable("local.subnet_id")
+        assert not is_targetable("output.vpc_id")
+        assert not is_targetable("module.vpc.var.cidr")
+        assert not is_targetable("root")
@@ -1,6 +1,10 @@
+import io
+import sys
 from unittest.mock import Mock
 
+import pytest
 from invoke.context import Context
+from invoke.exceptions import UnexpectedExit
 
 from infrablocks.invoke_terraform.terraform import InvokeExecutor
 
@@ -18,6 +22,7 @@ class TestInvokeExecutor:
             env={},
             out_stream=None,
             err_stream=None,
+            warn=False,
         )
 
     def test_run_invoked_with_env(self):
@@ -34,6 +39,7 @@ class TestInvokeExecutor:
             env={"ENV_VAR": "value"},
             out_stream=None,
             err_stream=None,
+            warn=False,
         )
 
     def test_run_invoked_with_empty_env(self):
@@ -48,4 +54,71 @@ class TestInvokeExecutor:
             env={},
             out_stream=None,
             err_stream=None,
+            warn=False,
         )
+
+    def test_returns_allowed_exit_codes(self):
+        executor = InvokeExecutor(Context())
+
+        exit_code = executor.execute(
+            ["exit", "2"], stdout=io.StringIO(), exit_codes={0, 2}
+        )
+
+        assert exit_code == 2
+
+    def test_raises_for_disallowed_exit_codes(self):
+        executor = InvokeExecutor(Context())
+
+        with pytest.raises(UnexpectedExit):
+            executor.execute(
+                ["exit", "1"], stdout=io.StringIO(), exit_codes={0, 2}
+            )
+
+    def test_stream_yields_output_lines_without_watchers(self):
+        context = Context()
+
+        executor = InvokeExecutor(context)
+
+        lines = list(
+            executor.stream(
+                ["printf", '"one\\ntwo $NAME\\n"'],
+                environment={"NAME": "three"},
+            )
+        )
+
+        assert lines == ["one\n", "two three\n"]
+
+    def test_stream_forwards_stderr_through_sys_stderr(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, "stderr", stderr)
+        executor = InvokeExecutor(Context())
+
+        lines = list(
+            executor.stream(["sh", "-c", "'echo out; echo warning >&2'"])
+        )
+
+        assert lines == ["out\n"]
+        assert stderr.getvalue() == "warning\n"
+
+    def test_stream_raises_on_failure(self):
+        executor = InvokeExecutor(Context())
+
+        with pytest.raises(UnexpectedExit):
+            list(executor.stream(["exit", "3"]))
+
+    def test_spawns_interactive_process_on_terminal(self):
+        executor = InvokeExecutor(Context())
+
+        process = executor.spawn(["cat"], environment={"NAME": "value"})
+        try:
+            process.write("hello\n")
+            lines = [process.readline(timeout=5) for _ in range(2)]
+
+            assert process.alive
+            assert [line.strip() for line in lines] == ["hello", "hello"]
+        finally:
+            process.close()
+
+        assert not process.alive
@@ -0,0 +1,122 @@
+import json
+from io import StringIO
+from typing import Any
+
+import pytest
+
+from infrablocks.invoke_terraform.terraform import PlanTable
+
+AWS = "registry.terraform.io/hashicorp/aws"
+
+
+def resource_change(
+    address: str,
+    type: str,
+    actions: list[str],
+    module: str | None = None,
+    mode: str = "managed",
+    before: Any = None,
+    after: Any = None,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "address": address,
+        "mode": mode,
+        "type": type,
+        "name": address.rsplit(".", 1)[-1],
+        "provider_name": AWS,
+        "change": {"actions": actions, "before": before, "after": after},
+    }
+    if module is not None:
+        result["module_address"] = module
+    return result
+
+
+PLAN = {
+    "format_version": "1.2",
+    "terraform_version": "1.9.0",
+    "planned_values": {
+        "root_module": {"resources": [{"address": "aws_vpc.main"}]}
+    },
+    "resource_changes": [
+        resource_change(
+            "aws_vpc.main",
+            "aws_vpc",
+            ["update"],
+            before={"a": 1},
+            after={"a": 2},
+        ),
+        resource_change(
+            "module.network.aws_subnet.private",
+            "aws_subnet",
+            ["delete", "create"],
+            module="module.network",
+        ),
+        resource_change(
+            "module.network.aws_subnet.public",
+            "aws_subnet",
+            ["no-op"],
+            module="module.network",
+        ),
+        resource_change(
+            "data.aws_ami.ubuntu", "aws_ami", ["read"], mode="data"
+        ),
+    ],
+    "prior_state": {"values": {"root_module": {"resources": []}}},
+}
+
+
+@pytest.fixture
+def plan() -> PlanTable:
+    return PlanTable.load(StringIO(json.dumps(PLAN, indent=2)))
+
+
+class TestPlanTable:
+    def test_reads_versions_and_addresses(self, plan: PlanTable):
+        assert plan.format_version == "1.2"
+        assert plan.terraform_version == "1.9.0"
+        assert plan.addresses == [
+            "aws_vpc.main",
+            "module.network.aws_subnet.private",
+            "module.network.aws_subnet.public",
+            "data.aws_ami.ubuntu",
+        ]
+
+    def test_interns_column_values(self, plan: PlanTable):
+        types = plan.column("type")
+
+        assert types.values == ["aws_vpc", "aws_subnet", "aws_ami"]
+        assert list(types.codes) == [0, 1, 1, 2]
+
+    def test_selects_by_columns(self, plan: PlanTable):
+        assert plan.select(type="aws_subnet", action="delete").addresses == [
+            "module.network.aws_subnet.private"
+        ]
+        assert plan.select(module="module.network").addresses == [
+            "module.network.aws_subnet.private",
+            "module.network.aws_subnet.public",
+        ]
+        assert plan.select(changed=True).addresses == [
+            "aws_vpc.main",
+            "module.network.aws_subnet.private",
+        ]
+        assert len(plan.select(type="aws_instance")) == 0
+
+    def test_counts_by_column(self, plan: PlanTable):
+        assert plan.count_by("actions") == {
+            "update": 1,
+            "delete,create": 1,
+            "no-op": 1,
+            "read": 1,
+        }
+        assert plan.select(changed=True).count_by("type") == {
+            "aws_vpc": 1,
+            "aws_subnet": 1,
+        }
+
+    def test_decodes_change_values_lazily(self, plan: PlanTable):
+        change = plan["aws_vpc.main"]
+
+        assert "change" not in vars(change)
+        assert change.actions == ("update",)
+        assert change.before == {"a": 1}
+        assert change.after == {"a": 2}
@@ -0,0 +1,128 @@
+import json
+from io import StringIO
+from typing import Any
+
+import pytest
+
+from infrablocks.invoke_terraform.terraform import (
+    DestroyGuard,
+    ForbiddenActions,
+    NoPublicBuckets,
+    PlanSelection,
+    PlanTable,
+    Policy,
+    RequiredTags,
+    Rule,
+    Violation,
+)
+
+
+def change(
+    address: str, type: str, actions: list[str], after: Any = None
+) -> dict[str, Any]:
+    return {
+        "address": address,
+        "mode": "managed",
+        "type": type,
+        "change": {"actions": actions, "before": None, "after": after},
+    }
+
+
+PLAN = {
+    "resource_changes": [
+        change(
+            "aws_s3_bucket.logs",
+            "aws_s3_bucket",
+            ["create"],
+            {"acl": "public-read", "tags": {"team": "platform"}},
+        ),
+        change(
+            "aws_s3_bucket_public_access_block.logs",
+            "aws_s3_bucket_public_access_block",
+            ["create"],
+            {"block_public_acls": False, "block_public_policy": True},
+        ),
+        change("aws_db_instance.main", "aws_db_instance", ["delete"]),
+        change(
+            "aws_vpc.main",
+            "aws_vpc",
+            ["update"],
+            {"tags": {"team": "platform", "cost-centre": "42"}},
+        ),
+        change("aws_vpc.unchanged", "aws_vpc", ["no-op"], {"tags": {}}),
+    ]
+}
+
+
+@pytest.fixture
+def plan() -> PlanTable:
+    return PlanTable.load(StringIO(json.dumps(PLAN)))
+
+
+class CountingRule(Rule):
+    def __init__(self, types: frozenset[str] | None):
+        self.types = types
+        self.batches: list[list[str]] = []
+
+    def evaluate(self, changes: PlanSelection) -> list[Violation]:
+        self.batches.append(changes.addresses)
+        return []
+
+
+class TestPolicy:
+    def test_reports_violations_in_plan_order(self, plan: PlanTable):
+        policy = Policy(
+            [
+                RequiredTags(frozenset({"team", "cost-centre"})),
+                NoPublicBuckets(),
+                DestroyGuard(types=frozenset({"aws_db_instance"})),
+            ]
+        )
+
+        result = policy.evaluate(plan)
+
+        assert not result.passed
+        assert [str(violation) for violation in result.violations] == [
+            "no-public-buckets: aws_s3_bucket.logs: "
+            "bucket ACL 'public-read' is public.",
+            "required-tags: aws_s3_bucket.logs: "
+            "missing required tags: cost-centre.",
+            "no-public-buckets: aws_s3_bucket_public_access_block.logs: "
+            "public access block disables block_public_acls.",
+            "destroy-guard: aws_db_instance.main: "
+            "action 'delete' is forbidden.",
+        ]
+
+    def test_passes_when_no_rule_matches(self, plan: PlanTable):
+        policy = Policy(
+            [ForbiddenActions(frozenset({"delete"}), frozenset({"aws_vpc"}))]
+        )
+
+        result = policy.evaluate(plan)
+
+        assert result.passed
+        result.raise_for_violations()
+
+    def test_evaluates_rules_once_per_changed_type_batch(
+        self, plan: PlanTable
+    ):
+        typed = CountingRule(frozenset({"aws_vpc", "aws_lambda_function"}))
+        untyped = CountingRule(None)
+
+        Policy([typed, untyped]).evaluate(plan)
+
+        assert typed.batches == [["aws_vpc.main"]]
+        assert untyped.batches == [
+            [
+                "aws_s3_bucket.logs",
+                "aws_s3_bucket_public_access_block.logs",
+                "aws_db_instance.main",
+                "aws_vpc.main",
+            ]
+        ]
+
+    def test_raises_for_violations(self, plan: PlanTable):
+        result = Policy([DestroyGuard()]).evaluate(plan)
+
+        with pytest.raises(ValueError, match="aws_db_instance.main"):
+            result.raise_for_violations()
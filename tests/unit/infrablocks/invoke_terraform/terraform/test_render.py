@@ -0,0 +1,91 @@
+import gzip
+import json
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+from infrablocks.invoke_terraform.terraform import PlanRenderer
+
+
+def planned_change(address: str, action: str, module: str = "") -> str:
+    resource: dict[str, Any] = {"addr": address}
+    if module:
+        resource["module"] = module
+    return (
+        json.dumps(
+            {
+                "type": "planned_change",
+                "change": {"resource": resource, "action": action},
+            }
+        )
+        + "\n"
+    )
+
+
+LINES = [
+    '{"type": "version", "terraform": "1.9.0"}\n',
+    planned_change("aws_vpc.main", "update"),
+    planned_change("module.network.aws_subnet.a", "create", "module.network"),
+    planned_change("module.network.aws_subnet.b", "create", "module.network"),
+    planned_change("module.network.aws_route.r", "delete", "module.network"),
+    '{"type": "resource_drift", "change": {}}\n',
+    json.dumps(
+        {
+            "type": "diagnostic",
+            "@message": "Warning: Deprecated attribute",
+            "diagnostic": {"severity": "warning", "detail": "Use x."},
+        }
+    )
+    + "\n",
+    json.dumps(
+        {
+            "type": "change_summary",
+            "changes": {"add": 2, "change": 1, "remove": 1},
+        }
+    )
+    + "\n",
+    "not json\n",
+]
+
+
+class TestPlanRenderer:
+    def test_writes_condensed_summary_grouped_by_module(self):
+        output = StringIO()
+
+        rendered = PlanRenderer(output).render(LINES)
+
+        assert output.getvalue() == (
+            "Warning: Deprecated attribute\n"
+            "  Use x.\n"
+            "Plan: 2 to add, 1 to change, 1 to destroy.\n"
+            "  module.network: 2 create, 1 delete\n"
+            "  (root): 1 update\n"
+            "Resources changed outside Terraform: 1\n"
+        )
+        assert rendered.by_action == {"create": 2, "update": 1, "delete": 1}
+        assert rendered.errors == 0
+
+    def test_limits_number_of_groups(self):
+        output = StringIO()
+        lines = [
+            planned_change(
+                f"module.m{index}.x.y", "create", f"module.m{index}"
+            )
+            for index in range(3)
+        ]
+
+        PlanRenderer(output, maximum_groups=1).render(lines)
+
+        assert (
+            output.getvalue().splitlines()[-1] == "  ... and 2 more modules."
+        )
+
+    def test_spills_full_details_to_compressed_file(self, tmp_path: Path):
+        output = StringIO()
+        details_path = tmp_path / "details" / "plan.jsonl.gz"
+
+        PlanRenderer(output, details_path).render(iter(LINES))
+
+        with gzip.open(details_path, "rt") as details:
+            assert details.read() == "".join(LINES)
+        assert f"Full plan details: {details_path}\n" in output.getvalue()
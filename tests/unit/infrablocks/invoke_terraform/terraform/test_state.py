@@ -0,0 +1,217 @@
+import json
+from io import StringIO
+from typing import Any
+
+import pytest
+
+from infrablocks.invoke_terraform.terraform import StateIndex, StateIndexCache
+from infrablocks.invoke_terraform.terraform.json_stream import (
+    JSONStreamReader,
+)
+
+AWS = 'provider["registry.terraform.io/hashicorp/aws"]'
+
+
+def resource(
+    type: str,
+    name: str,
+    instances: list[dict[str, Any]],
+    module: str | None = None,
+    mode: str = "managed",
+) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "mode": mode,
+        "type": type,
+        "name": name,
+        "provider": AWS,
+        "instances": [
+            {"schema_version": 0, "sensitive_attributes": [], **instance}
+            for instance in instances
+        ],
+    }
+    if module is not None:
+        result["module"] = module
+    return result
+
+
+STATE = {
+    "version": 4,
+    "terraform_version": "1.9.0",
+    "serial": 42,
+    "lineage": "0c1b7c7e-lineage",
+    "outputs": {
+        "vpc_id": {"value": "vpc-123", "type": "string"},
+    },
+    "resources": [
+        resource("aws_vpc", "main", [{"attributes": {"id": "vpc-123"}}]),
+        resource(
+            "aws_subnet",
+            "private",
+            [
+                {"index_key": 0, "attributes": {"id": "subnet-a"}},
+                {"index_key": 1, "attributes": {"id": "subnet-b"}},
+            ],
+            module="module.network",
+        ),
+        resource(
+            "aws_subnet",
+            "public",
+            [
+                {
+                    "index_key": "eu-west-2a",
+                    "attributes": {"id": "subnet-c", "tags": {"x": "}]"}},
+                }
+            ],
+        ),
+        resource(
+            "aws_ami",
+            "ubuntu",
+            [{"attributes": {"id": "ami-1"}}],
+            mode="data",
+        ),
+    ],
+    "check_results": None,
+}
+
+
+def load(state: dict[str, Any], **kwargs: Any) -> StateIndex:
+    return StateIndex.load(StringIO(json.dumps(state, indent=2)), **kwargs)
+
+
+class TestJSONStreamReader:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    def test_reads_values_across_chunk_boundaries(self, chunk_size: int):
+        reader = JSONStreamReader(
+            StringIO('{"a": "x\\"}", "b": [1, {"c": null}], "d": -1.5e3}'),
+            chunk_size=chunk_size,
+        )
+
+        values = {key: reader.read_value() for key in reader.iter_object()}
+
+        assert values == {"a": 'x"}', "b": [1, {"c": None}], "d": -1500.0}
+
+    def test_returns_raw_text_of_values(self):
+        reader = JSONStreamReader(StringIO('[{"a": [1, 2]}, true]'))
+
+        raw = [reader.read_raw() for _ in reader.iter_array()]
+
+        assert raw == ['{"a": [1, 2]}', "true"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 5, 1024])
+    def test_scans_raw_text_across_chunk_boundaries(self, chunk_size: int):
+        values = [
+            '{"a": "}]\\"[{", "b": [{"c": []}, "\\\\"]}',
+            '"x\\"y"',
+            "-12.5e3",
+            "[]",
+        ]
+        reader = JSONStreamReader(
+            StringIO("[" + ", ".join(values) + "]"), chunk_size=chunk_size
+        )
+
+        raw = [reader.read_raw() for _ in reader.iter_array()]
+
+        assert raw == values
+        assert [json.loads(value) for value in raw] == [
+            json.loads(value) for value in values
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+    def test_captures_text_consumed_while_iterating(self, chunk_size: int):
+        reader = JSONStreamReader(
+            StringIO('[ {"a": 1, "b": {"c": [2, 3]}}, 4]'),
+            chunk_size=chunk_size,
+        )
+        keys: list[str] = []
+
+        for _ in reader.iter_array():
+            reader.start_capture()
+            if reader.peek() == "{":
+                for key in reader.iter_object():
+                    keys.append(key)
+                    reader.read_raw()
+            else:
+                reader.read_raw()
+            keys.append(reader.stop_capture())
+
+        assert keys == ["a", "b", '{"a": 1, "b": {"c": [2, 3]}}', "4"]
+
+    def test_raises_on_truncated_input(self):
+        reader = JSONStreamReader(StringIO('{"a": [1, 2'))
+
+        with pytest.raises(ValueError):
+            for _ in reader.iter_object():
+                reader.skip()
+
+
+class TestStateIndex:
+    def test_reads_lineage_and_serial(self):
+        state = load(STATE)
+
+        assert state.lineage == "0c1b7c7e-lineage"
+        assert state.serial == 42
+
+    def test_indexes_instances_by_address(self):
+        state = load(STATE)
+
+        assert [instance.address for instance in state] == [
+            "aws_vpc.main",
+            "module.network.aws_subnet.private[0]",
+            "module.network.aws_subnet.private[1]",
+            'aws_subnet.public["eu-west-2a"]',
+            "data.aws_ami.ubuntu",
+        ]
+        assert state["aws_vpc.main"].attributes == {"id": "vpc-123"}
+        assert "aws_vpc.other" not in state
+
+    def test_decodes_attributes_lazily(self):
+        state = load(STATE)
+
+        instance = state['aws_subnet.public["eu-west-2a"]']
+
+        assert "attributes" not in vars(instance)
+        assert instance.attributes["tags"] == {"x": "}]"}
+
+    def test_finds_instances_by_type_and_module(self):
+        state = load(STATE)
+
+        assert state.attribute_values(
+            "aws_subnet", "id", module="module.network"
+        ) == ["subnet-a", "subnet-b"]
+        assert state.attribute_values("aws_subnet", "id") == [
+            "subnet-a",
+            "subnet-b",
+            "subnet-c",
+        ]
+        assert [instance.address for instance in state.find(module="")] == [
+            "aws_vpc.main",
+            'aws_subnet.public["eu-west-2a"]',
+            "data.aws_ami.ubuntu",
+        ]
+        assert [instance.address for instance in state.find(mode="data")] == [
+            "data.aws_ami.ubuntu"
+        ]
+
+    def test_reads_outputs(self):
+        state = load(STATE)
+
+        assert state.output_names == ["vpc_id"]
+        assert state.output("vpc_id") == "vpc-123"
+
+    def test_reuses_cached_index_for_same_lineage_and_serial(self):
+        cache = StateIndexCache()
+
+        first = load(STATE, cache=cache)
+        second = load(STATE, cache=cache)
+        third = load({**STATE, "serial": 43}, cache=cache)
+
+        assert second is first
+        assert third is not first
+
+    def test_evicts_least_recently_used_indexes(self):
+        cache = StateIndexCache(maximum_size=1)
+
+        first = load(STATE, cache=cache)
+        load({**STATE, "serial": 43}, cache=cache)
+
+        assert load(STATE, cache=cache) is not first
@@ -0,0 +1,124 @@
+import json
+from io import StringIO
+from typing import Any
+
+from infrablocks.invoke_terraform.terraform import PlanSummary, PlanTable
+
+
+def plan(*changes: tuple[str, list[str], Any]) -> PlanTable:
+    return PlanTable.load(
+        StringIO(
+            json.dumps(
+                {
+                    "resource_changes": [
+                        {
+                            "address": address,
+                            "type": address.split(".")[-2],
+                            "module_address": (
+                                "module.network"
+                                if address.startswith("module.network")
+                                else None
+                            ),
+                            "change": {"actions": actions, "after": after},
+                        }
+                        for address, actions, after in changes
+                    ]
+                }
+            )
+        )
+    )
+
+
+FIRST = plan(
+    ("aws_vpc.main", ["update"], {"a": 1}),
+    ("module.network.aws_subnet.a", ["create"], {}),
+    ("module.network.aws_subnet.b", ["no-op"], {}),
+    ("aws_iam_role.ci", ["delete"], None),
+)
+
+
+class TestPlanSummary:
+    def test_counts_by_action_type_and_module(self):
+        summary = PlanSummary.of(FIRST)
+
+        assert summary.by_action == {
+            "update": 1,
+            "create": 1,
+            "no-op": 1,
+            "delete": 1,
+        }
+        assert summary.by_type == {
+            "aws_vpc": 1,
+            "aws_subnet": 1,
+            "aws_iam_role": 1,
+        }
+        assert summary.by_module == {"": 2, "module.network": 1}
+        assert summary.has_changes
+
+    def test_merges_summaries_of_disjoint_plans(self):
+        first = PlanSummary.of(plan(("aws_vpc.main", ["update"], {"a": 1})))
+        second = PlanSummary.of(
+            plan(
+                ("aws_iam_role.ci", ["delete"], None),
+                ("aws_s3_bucket.logs", ["no-op"], {}),
+            )
+        )
+
+        merged = PlanSummary.merge([first, second])
+
+        assert merged.by_action == {"update": 1, "delete": 1, "no-op": 1}
+        assert merged.changes == {
+            "aws_vpc.main": "update",
+            "aws_iam_role.ci": "delete",
+        }
+        assert (
+            merged.fingerprint
+            == PlanSummary.merge([second, first]).fingerprint
+        )
+
+    def test_fingerprint_is_stable_and_ignores_no_op_changes(self):
+        same = plan(
+            ("aws_vpc.main", ["update"], {"a": 1}),
+            ("module.network.aws_subnet.a", ["create"], {}),
+            ("aws_iam_role.ci", ["delete"], None),
+        )
+
+        assert PlanSummary.of(same).fingerprint == (
+            PlanSummary.of(FIRST).fingerprint
+        )
+        assert PlanSummary.of(FIRST).diff(PlanSummary.of(same)).is_empty
+
+    def test_diffs_against_previous_summary(self):
+        second = plan(
+            ("aws_vpc.main", ["update"], {"a": 2}),
+            ("module.network.aws_subnet.a", ["create"], {}),
+            ("aws_s3_bucket.logs", ["create"], {}),
+        )
+
+        diff = PlanSummary.of(second).diff(PlanSummary.of(FIRST))
+
+        assert diff.added == {"aws_s3_bucket.logs": "create"}
+        assert diff.removed == {"aws_iam_role.ci": "delete"}
+        assert diff.changed == {"aws_vpc.main": ("update", "update")}
+        assert diff.by_action == {"create": 1, "delete": -1, "no-op": -1}
+
+    def test_renders_diff(self):
+        second = plan(
+            ("aws_vpc.main", ["update"], {"a": 2}),
+            ("module.network.aws_subnet.a", ["create"], {}),
+            ("aws_s3_bucket.logs", ["create"], {}),
+        )
+
+        diff = PlanSummary.of(second).diff(PlanSummary.of(FIRST))
+
+        assert diff.render() == (
+            "Plan differs from the previously approved plan:\n"
+            "  + aws_s3_bucket.logs: create\n"
+            "  - aws_iam_role.ci: delete\n"
+            "  ~ aws_vpc.main: update -> update"
+        )
+
+    def test_round_trips_through_dict(self):
+        summary = PlanSummary.of(FIRST)
+
+        assert PlanSummary.from_dict(summary.to_dict()) == summary
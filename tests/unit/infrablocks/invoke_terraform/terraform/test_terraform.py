@@ -9,6 +9,9 @@ from infrablocks.invoke_terraform.terraform import (
     Terraform,
     Variables,
 )
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    write_to_stdout,
+)
 
 
 class TestTerraform:
@@ -61,6 +64,17 @@ class TestTerraform:
             environment=None,
         )
 
+    def test_init_executes_without_backend(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.init(chdir="/some/dir", backend=False)
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "-chdir=/some/dir", "init", "-backend=false"],
+            environment=None,
+        )
+
     def test_init_executes_with_reconfigure(self):
         executor = Mock(spec=Executor)
         terraform = Terraform(executor)
@@ -113,6 +127,79 @@ class TestTerraform:
             ["terraform", "plan", '-var="foo=1"'], environment=None
         )
 
+    def test_plan_executes_without_refresh(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.plan(refresh=False, out="plan.tfplan")
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "plan", "-refresh=false", "-out=plan.tfplan"],
+            environment=None,
+        )
+
+    def test_plan_executes_refresh_only(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.plan(refresh_only=True)
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "plan", "-refresh-only"], environment=None
+        )
+
+    def test_apply_executes_refresh_only(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.apply(autoapprove=True, refresh_only=True)
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "apply", "-auto-approve", "-refresh-only"],
+            environment=None,
+        )
+
+    def test_plan_executes_with_targets(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.plan(targets=["aws_vpc.main", 'aws_subnet.private["a"]'])
+
+        executor.execute.assert_called_once_with(
+            [
+                "terraform",
+                "plan",
+                "-target=aws_vpc.main",
+                "-target='aws_subnet.private[\"a\"]'",
+            ],
+            environment=None,
+        )
+
+    def test_apply_executes_with_targets(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.apply(autoapprove=True, targets=["module.vpc"])
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "apply", "-auto-approve", "-target=module.vpc"],
+            environment=None,
+        )
+
+    def test_plan_reports_changes_with_detailed_exitcode(self):
+        executor = Mock(spec=Executor)
+        executor.execute.return_value = 2
+        terraform = Terraform(executor)
+
+        changed = terraform.plan(detailed_exitcode=True)
+
+        assert changed is True
+        executor.execute.assert_called_once_with(
+            ["terraform", "plan", "-detailed-exitcode"],
+            environment=None,
+            exit_codes=frozenset({0, 2}),
+        )
+
     def test_plan_executes_with_environment(self):
         executor = Mock(spec=Executor)
         terraform = Terraform(executor)
@@ -124,6 +211,16 @@ class TestTerraform:
             ["terraform", "plan"], environment=environment
         )
 
+    def test_plan_executes_with_out(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.plan(out="plan.tfplan")
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "plan", "-out=plan.tfplan"], environment=None
+        )
+
     def test_output_executes(self):
         executor = Mock(spec=Executor)
         terraform = Terraform(executor)
@@ -289,6 +386,55 @@ class TestTerraform:
             ["terraform", "validate", "-json"], environment=None
         )
 
+    def test_fmt_executes(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.fmt()
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "fmt"], environment=None
+        )
+
+    def test_fmt_executes_with_check_recursive_and_diff(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+        environment = {"ENV_VAR": "value"}
+
+        terraform.fmt(
+            chdir="/some/dir",
+            check=True,
+            recursive=True,
+            diff=True,
+            environment=environment,
+        )
+
+        executor.execute.assert_called_once_with(
+            [
+                "terraform",
+                "-chdir=/some/dir",
+                "fmt",
+                "-check",
+                "-recursive",
+                "-diff",
+            ],
+            environment=environment,
+        )
+
+    def test_console_spawns_console_process(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+        environment = {"TF_WORKSPACE": "staging"}
+
+        terraform.console(
+            chdir="/some/dir", vars={"region": "eu"}, environment=environment
+        )
+
+        executor.spawn.assert_called_once_with(
+            ["terraform", "-chdir=/some/dir", "console", '-var="region=eu"'],
+            environment=environment,
+        )
+
     def test_apply_executes(self):
         executor = Mock(spec=Executor)
         terraform = Terraform(executor)
@@ -808,3 +954,114 @@ class TestTerraform:
             ["terraform", "workspace", "select", workspace],
             environment=environment,
         )
+
+    def test_state_pull_executes(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.state_pull(chdir="/some/dir")
+
+        executor.execute.assert_called_once_with(
+            ["terraform", "-chdir=/some/dir", "state", "pull"],
+            environment=None,
+            stdout=None,
+            stderr=None,
+        )
+
+    def test_load_state_indexes_pulled_state(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+        executor.execute.side_effect = write_to_stdout(
+            '{"version": 4, "serial": 3, "lineage": "abc", "resources": ['
+            '{"mode": "managed", "type": "aws_vpc", "name": "main",'
+            ' "provider": "provider[\\"registry.terraform.io/hashicorp/aws\\"]",'
+            ' "instances": [{"attributes": {"id": "vpc-1"}}]}]}'
+        )
+
+        state = terraform.load_state(cache=None)
+
+        assert state.serial == 3
+        assert state["aws_vpc.main"].attributes == {"id": "vpc-1"}
+
+    def test_state_version_reads_only_lineage_and_serial(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+        executor.execute.side_effect = write_to_stdout(
+            '{"version": 4, "serial": 7, "lineage": "abc", "resources": ['
+        )
+
+        version = terraform.state_version(chdir="/some/dir")
+
+        assert version == ("abc", 7)
+
+    def test_load_graph_parses_graph_output(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+        executor.execute.side_effect = write_to_stdout(
+            'digraph {\n  "aws_subnet.private" -> "aws_vpc.main";\n}\n'
+        )
+
+        graph = terraform.load_graph(chdir="/some/dir")
+
+        assert executor.execute.call_args.args[0] == [
+            "terraform",
+            "-chdir=/some/dir",
+            "graph",
+        ]
+        assert graph.dependencies_of(["aws_subnet.private"]) == {
+            "aws_vpc.main"
+        }
+
+    def test_show_executes_with_json_and_plan_file(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+
+        terraform.show(chdir="/some/dir", plan_file="plan.tfplan", json=True)
+
+        executor.execute.assert_called_once_with(
+            [
+                "terraform",
+                "-chdir=/some/dir",
+                "show",
+                "-json",
+                "plan.tfplan",
+            ],
+            environment=None,
+            stdout=None,
+            stderr=None,
+        )
+
+    def test_load_plan_tabulates_shown_plan(self):
+        executor = Mock(spec=Executor)
+        terraform = Terraform(executor)
+        executor.execute.side_effect = write_to_stdout(
+            '{"format_version": "1.2", "resource_changes": ['
+            '{"address": "aws_vpc.main", "type": "aws_vpc",'
+            ' "change": {"actions": ["create"], "after": {"cidr": "x"}}}]}'
+        )
+
+        plan = terraform.load_plan("plan.tfplan")
+
+        assert plan.format_version == "1.2"
+        assert plan["aws_vpc.main"].after == {"cidr": "x"}
+
+    def test_stream_plan_streams_json_plan(self):
+        executor = Mock(spec=Executor)
+        executor.stream.return_value = iter(['{"type": "version"}\n'])
+        terraform = Terraform(executor)
+
+        lines = list(
+            terraform.stream_plan(chdir="/some/dir", out="plan.tfplan")
+        )
+
+        assert lines == ['{"type": "version"}\n']
+        executor.stream.assert_called_once_with(
+            [
+                "terraform",
+                "-chdir=/some/dir",
+                "plan",
+                "-json",
+                "-out=plan.tfplan",
+            ],
+            environment=None,
+        )
@@ -0,0 +1,199 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from invoke.collection import Collection
+from invoke.context import Context
+from invoke.exceptions import Exit
+from invoke.tasks import task
+
+from infrablocks.invoke_terraform import (
+    Configuration,
+    TaskDaemon,
+    default_configuration_memo,
+    default_output_resolver,
+)
+from infrablocks.invoke_terraform.client import connect, run
+
+invocations: list[str] = []
+
+
+@task
+def describe(context: Context, name: str = "world"):
+    invocations.append(name)
+    print(f"hello {name} from {os.getcwd()}")
+    print(os.environ.get("DEPLOYMENT", "unset"), file=sys.stderr)
+
+
+def configure_deployment(_context, _arguments, configuration: Configuration):
+    invocations.append("configure")
+    configuration.workspace = os.environ.get("DEPLOYMENT")
+
+
+@task
+def workspace(context: Context):
+    configuration = Configuration.create_empty()
+    default_configuration_memo.memoize("workspace", configure_deployment)(
+        context, {}, configuration
+    )
+    print(configuration.workspace)
+
+
+@task
+def fail(context: Context):
+    raise Exit("broken", code=3)
+
+
+@task
+def crash(context: Context):
+    raise RuntimeError("unexpected")
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    directory = tempfile.mkdtemp(prefix="itd")
+    yield os.path.join(directory, "daemon.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(socket_path: str) -> Iterator[TaskDaemon]:
+    daemon = TaskDaemon(
+        Collection("tasks", describe, workspace, fail, crash),
+        socket_path=socket_path,
+    )
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while connection_unavailable(socket_path):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(5)
+
+
+def connection_unavailable(socket_path: str) -> bool:
+    connection = connect(socket_path)
+    if connection is None:
+        return True
+    connection.close()
+    return False
+
+
+class TestTaskDaemon:
+    def test_runs_tasks_with_request_cwd_and_environment(
+        self, daemon: TaskDaemon, tmp_path: Path
+    ):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        code = run(
+            ["describe", "--name", "network"],
+            socket_path=daemon.socket_path,
+            cwd=str(tmp_path),
+            environment={"DEPLOYMENT": "production"},
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        assert code == 0
+        assert stdout.getvalue() == f"hello network from {tmp_path}\n"
+        assert stderr.getvalue() == "production\n"
+        assert os.getcwd() != str(tmp_path)
+        assert "DEPLOYMENT" not in os.environ
+
+    def test_serves_repeated_invocations_from_one_process(
+        self, daemon: TaskDaemon
+    ):
+        invocations.clear()
+
+        for name in ["a", "b", "c"]:
+            run(
+                ["describe", "--name", name],
+                socket_path=daemon.socket_path,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        assert invocations == ["a", "b", "c"]
+
+    def test_scopes_warm_caches_to_the_request_environment(
+        self, daemon: TaskDaemon
+    ):
+        invocations.clear()
+
+        def workspace_for(deployment: str) -> str:
+            stdout = io.StringIO()
+            run(
+                ["workspace"],
+                socket_path=daemon.socket_path,
+                environment={"DEPLOYMENT": deployment},
+                stdout=stdout,
+                stderr=io.StringIO(),
+            )
+            return stdout.getvalue().strip()
+
+        workspaces = [
+            workspace_for(deployment)
+            for deployment in ["staging", "staging", "production"]
+        ]
+
+        assert workspaces == ["staging", "staging", "production"]
+        assert invocations == ["configure", "configure"]
+
+    def test_resolves_outputs_afresh_for_each_request(
+        self, daemon: TaskDaemon, monkeypatch: pytest.MonkeyPatch
+    ):
+        clear = Mock()
+        monkeypatch.setattr(default_output_resolver, "clear", clear)
+
+        for _ in range(2):
+            run(
+                ["describe"],
+                socket_path=daemon.socket_path,
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        assert clear.call_count == 2
+
+    def test_returns_task_exit_codes(self, daemon: TaskDaemon):
+        stderr = io.StringIO()
+
+        failed = run(
+            ["fail"],
+            socket_path=daemon.socket_path,
+            stdout=io.StringIO(),
+            stderr=stderr,
+        )
+        crashed = run(
+            ["crash"],
+            socket_path=daemon.socket_path,
+            stdout=io.StringIO(),
+            stderr=stderr,
+        )
+
+        assert failed == 3
+        assert crashed == 1
+        assert "broken" in stderr.getvalue()
+        assert "RuntimeError: unexpected" in stderr.getvalue()
+
+    def test_refuses_to_start_when_already_running(self, daemon: TaskDaemon):
+        with pytest.raises(ValueError, match="already listening"):
+            TaskDaemon(
+                Collection("tasks"), socket_path=daemon.socket_path
+            ).serve_forever()
+
+
+class TestClient:
+    def test_returns_none_without_daemon(self, socket_path: str):
+        assert run(["describe"], socket_path=socket_path) is None
@@ -0,0 +1,231 @@
+from pathlib import Path
+
+from invoke.context import MockContext
+from invoke.runners import Result
+
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.dependencies import (
+    ModuleDependencyIndex,
+    changed_files,
+    changed_lines,
+    directory_files,
+    module_sources,
+)
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+class TestModuleSources:
+    def test_finds_sources_of_module_blocks(self):
+        contents = """
+module "network" {
+  source = "../modules/network"
+  cidr   = "10.0.0.0/16"
+}
+
+module "cluster" {
+  source  = "terraform-aws-modules/eks/aws"
+  version = "~> 20.0"
+}
+"""
+
+        assert module_sources(contents) == [
+            "../modules/network",
+            "terraform-aws-modules/eks/aws",
+        ]
+
+    def test_ignores_commented_out_module_blocks(self):
+        contents = """
+# module "network" {
+#   source = "../modules/network"
+# }
+"""
+
+        assert module_sources(contents) == []
+
+    def test_ignores_source_attributes_outside_module_blocks(self):
+        contents = """
+resource "aws_s3_object" "object" {
+  source = "./file.txt"
+}
+
+module "network" {
+  tags   = { Name = "${var.name}" }
+  source = "./network"
+}
+"""
+
+        assert module_sources(contents) == ["./network"]
+
+
+class TestDirectoryFiles:
+    def test_lists_files_by_suffix_and_name_in_order(self, tmp_path: Path):
+        for name in ["variables.tf", "main.tf", "a.tf.json", "README.md"]:
+            write(tmp_path / name, "")
+        write(tmp_path / ".terraform.lock.hcl", "")
+        (tmp_path / "nested.tf").mkdir()
+
+        entries = directory_files(
+            tmp_path, (".tf", ".tf.json"), names={".terraform.lock.hcl"}
+        )
+
+        assert [entry.name for entry in entries] == [
+            ".terraform.lock.hcl",
+            "a.tf.json",
+            "main.tf",
+            "variables.tf",
+        ]
+
+    def test_returns_nothing_for_missing_directories(self, tmp_path: Path):
+        assert directory_files(tmp_path / "missing", (".tf",)) == []
+
+
+class TestModuleDependencyIndex:
+    def test_follows_local_module_references_transitively(
+        self, tmp_path: Path
+    ):
+        write(
+            tmp_path / "roots" / "app" / "main.tf",
+            'module "service" {\n  source = "../../modules/service"\n}\n',
+        )
+        write(
+            tmp_path / "modules" / "service" / "main.tf",
+            'module "network" {\n  source = "../network"\n}\n',
+        )
+        write(tmp_path / "modules" / "network" / "main.tf", "")
+        index = ModuleDependencyIndex(JSONFileCache(tmp_path / "cache.json"))
+
+        closure = index.closure(tmp_path / "roots" / "app")
+
+        assert closure == {
+            (tmp_path / "roots" / "app").resolve(),
+            (tmp_path / "modules" / "service").resolve(),
+            (tmp_path / "modules" / "network").resolve(),
+        }
+
+    def test_selects_configurations_whose_closure_contains_changed_files(
+        self, tmp_path: Path
+    ):
+        write(
+            tmp_path / "roots" / "app" / "main.tf",
+            'module "network" {\n  source = "../../modules/network"\n}\n',
+        )
+        write(tmp_path / "roots" / "database" / "main.tf", "")
+        network = write(tmp_path / "modules" / "network" / "main.tf", "")
+        index = ModuleDependencyIndex(JSONFileCache(tmp_path / "cache.json"))
+
+        affected = index.affected_configurations(
+            {
+                "app": tmp_path / "roots" / "app",
+                "database": tmp_path / "roots" / "database",
+            },
+            [network, tmp_path / "README.md"],
+        )
+
+        assert affected == ["app"]
+
+    def test_persists_index_to_cache(self, tmp_path: Path):
+        write(
+            tmp_path / "app" / "main.tf",
+            'module "network" {\n  source = "./network"\n}\n',
+        )
+        cache = JSONFileCache(tmp_path / "cache.json")
+        ModuleDependencyIndex(cache).affected_configurations(
+            {"app": tmp_path / "app"}, []
+        )
+
+        directories = cache.load()["directories"]
+
+        assert directories[str((tmp_path / "app").resolve())]["modules"] == [
+            str((tmp_path / "app" / "network").resolve())
+        ]
+
+    def test_reuses_cached_entries_while_files_are_unchanged(
+        self, tmp_path: Path
+    ):
+        write(
+            tmp_path / "app" / "main.tf",
+            'module "network" {\n  source = "./network"\n}\n',
+        )
+        cache = JSONFileCache(tmp_path / "cache.json")
+        ModuleDependencyIndex(cache).affected_configurations(
+            {"app": tmp_path / "app"}, []
+        )
+        contents = cache.load()
+        entry = contents["directories"][str((tmp_path / "app").resolve())]
+        entry["modules"] = ["/cached/module"]
+        cache.store(contents)
+
+        modules = ModuleDependencyIndex(cache).local_modules(tmp_path / "app")
+
+        assert modules == [Path("/cached/module")]
+
+    def test_rereads_directory_when_files_change(self, tmp_path: Path):
+        main = write(
+            tmp_path / "app" / "main.tf",
+            'module "network" {\n  source = "./network"\n}\n',
+        )
+        cache = JSONFileCache(tmp_path / "cache.json")
+        ModuleDependencyIndex(cache).affected_configurations(
+            {"app": tmp_path / "app"}, []
+        )
+        main.write_text('module "other" {\n  source = "./other-module"\n}\n')
+
+        modules = ModuleDependencyIndex(cache).local_modules(tmp_path / "app")
+
+        assert modules == [(tmp_path / "app" / "other-module").resolve()]
+
+
+class TestChangedFiles:
+    def test_lists_files_changed_since_merge_base(self):
+        context = MockContext(
+            run={
+                "git rev-parse --show-toplevel": Result("/repo\n"),
+                "git merge-base origin/main HEAD": Result("abc123\n"),
+                "git diff --name-only abc123": Result(
+                    "roots/app/main.tf\nmodules/network/main.tf\n"
+                ),
+            }
+        )
+
+        files = changed_files(context, "origin/main")
+
+        assert files == [
+            Path("/repo/roots/app/main.tf"),
+            Path("/repo/modules/network/main.tf"),
+        ]
+
+
+class TestChangedLines:
+    def test_lists_lines_changed_since_merge_base(self):
+        context = MockContext(
+            run={
+                "git rev-parse --show-toplevel": Result("/repo\n"),
+                "git merge-base origin/main HEAD": Result("abc123\n"),
+                "git diff --unified=0 --no-color --no-renames abc123": Result(
+                    "diff --git a/roots/app/main.tf b/roots/app/main.tf\n"
+                    "--- a/roots/app/main.tf\n"
+                    "+++ b/roots/app/main.tf\n"
+                    "@@ -3 +3,2 @@ resource\n"
+                    "-  name = 1\n"
+                    "+  name = 2\n"
+                    "+  size = 3\n"
+                    "@@ -9,2 +10,0 @@ resource\n"
+                    "diff --git a/roots/app/old.tf b/roots/app/old.tf\n"
+                    "--- a/roots/app/old.tf\n"
+                    "+++ /dev/null\n"
+                    "@@ -1,3 +0,0 @@\n"
+                ),
+            }
+        )
+
+        lines = changed_lines(context, "origin/main")
+
+        assert lines == {
+            Path("/repo/roots/app/main.tf"): {3, 4, 10},
+            Path("/repo/roots/app/old.tf"): {1},
+        }
@@ -0,0 +1,217 @@
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import MockContext
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    RootModuleIndex,
+    TerraformTaskCollection,
+    TerraformTaskCollectionGroup,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.lazy import LazyCollection
+from infrablocks.invoke_terraform.terraform import Terraform
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+BACKEND = """
+terraform {
+  backend "s3" {
+    bucket = "state"
+  }
+}
+"""
+
+PROVIDER = """
+provider "aws" {
+  region = "eu-west-2"
+}
+"""
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+class TestRootModuleIndex:
+    def test_discovers_directories_with_backend_or_provider_blocks(
+        self, tmp_path: Path
+    ):
+        write(tmp_path / "stacks" / "network" / "main.tf", BACKEND)
+        write(tmp_path / "stacks" / "cluster" / "providers.tf", PROVIDER)
+        write(tmp_path / "modules" / "service" / "main.tf", "")
+        index = RootModuleIndex(JSONFileCache(tmp_path / "cache.json"))
+
+        modules = index.discover(tmp_path)
+
+        assert [
+            (module.name, module.backend, module.providers)
+            for module in modules
+        ] == [
+            ("stacks-cluster", None, ("aws",)),
+            ("stacks-network", "s3", ()),
+        ]
+
+    def test_skips_hidden_and_excluded_directories(self, tmp_path: Path):
+        write(tmp_path / ".terraform" / "modules" / "x" / "main.tf", BACKEND)
+        write(tmp_path / "node_modules" / "main.tf", BACKEND)
+        index = RootModuleIndex(JSONFileCache(tmp_path / "cache.json"))
+
+        assert index.discover(tmp_path) == []
+
+    def test_rejects_directories_with_colliding_names(self, tmp_path: Path):
+        write(tmp_path / "a-b" / "main.tf", BACKEND)
+        write(tmp_path / "a" / "b" / "main.tf", BACKEND)
+        index = RootModuleIndex(JSONFileCache(tmp_path / "cache.json"))
+
+        with pytest.raises(ValueError, match="'a-b'"):
+            index.discover(tmp_path)
+
+    def test_reuses_cached_descriptions_for_unchanged_directories(
+        self, tmp_path: Path
+    ):
+        write(tmp_path / "network" / "main.tf", BACKEND)
+        cache = JSONFileCache(tmp_path / "cache.json")
+        RootModuleIndex(cache).discover(tmp_path)
+        contents = cache.load()
+        key = str((tmp_path / "network").resolve())
+        contents["directories"][key]["backend"] = "cached"
+        cache.store(contents)
+
+        modules = RootModuleIndex(cache).discover(tmp_path)
+
+        assert [module.backend for module in modules] == ["cached"]
+
+    def test_rescans_directories_whose_files_changed(self, tmp_path: Path):
+        main = write(tmp_path / "network" / "main.tf", BACKEND)
+        cache = JSONFileCache(tmp_path / "cache.json")
+        RootModuleIndex(cache).discover(tmp_path)
+        main.write_text(BACKEND.replace('"s3"', '"gcs"') + "\n")
+
+        modules = RootModuleIndex(cache).discover(tmp_path)
+
+        assert [module.backend for module in modules] == ["gcs"]
+
+
+class TestDiscoveredConfigurations:
+    def test_creates_lazy_collection_per_discovered_root_module(
+        self, tmp_path: Path
+    ):
+        write(tmp_path / "network" / "main.tf", BACKEND)
+        write(tmp_path / "cluster" / "main.tf", BACKEND)
+
+        collection = (
+            TerraformTaskCollectionGroup()
+            .for_group("stacks")
+            .with_discovered_configurations(
+                tmp_path,
+                TerraformTaskCollection(),
+                RootModuleIndex(JSONFileCache(tmp_path / "cache.json")),
+            )
+            .create()
+        )
+
+        assert set(collection.collections.keys()) == {"network", "cluster"}
+        assert all(
+            isinstance(child, LazyCollection) and not child.is_materialised
+            for child in collection.collections.values()
+        )
+
+    def test_configures_source_directory_of_discovered_root_module(
+        self, tmp_path: Path
+    ):
+        write(tmp_path / "network" / "main.tf", BACKEND)
+        terraform = Mock(spec=Terraform)
+        template = TerraformTaskCollection(
+            task_factory=TerraformTaskFactory(
+                terraform_factory=MockTerraformFactory(terraform)
+            )
+        ).with_global_configure_function(
+            lambda context, arguments, configuration: setattr(
+                configuration, "workspace", "production"
+            )
+        )
+
+        collection = (
+            TerraformTaskCollectionGroup()
+            .for_group("stacks")
+            .with_discovered_configurations(
+                tmp_path,
+                template,
+                RootModuleIndex(JSONFileCache(tmp_path / "cache.json")),
+            )
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection["network.plan"])
+        task(MockContext())
+
+        terraform.select_workspace.assert_called_once_with(
+            "production",
+            chdir=str((tmp_path / "network").resolve()),
+            or_create=True,
+            environment={},
+        )
+
+    def test_discovered_directory_overrides_template_source_directory(
+        self, tmp_path: Path
+    ):
+        write(tmp_path / "network" / "main.tf", BACKEND)
+        terraform = Mock(spec=Terraform)
+
+        def configure(_context, _arguments, configuration: Configuration):
+            configuration.source_directory = "deployments/default"
+            configuration.workspace = "production"
+
+        template = TerraformTaskCollection(
+            task_factory=TerraformTaskFactory(
+                terraform_factory=MockTerraformFactory(terraform)
+            )
+        ).with_global_configure_function(configure)
+
+        collection = (
+            TerraformTaskCollectionGroup()
+            .for_group("stacks")
+            .with_discovered_configurations(
+                tmp_path,
+                template,
+                RootModuleIndex(JSONFileCache(tmp_path / "cache.json")),
+            )
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection["network.plan"])
+        task(MockContext())
+
+        assert terraform.select_workspace.call_args.kwargs["chdir"] == str(
+            (tmp_path / "network").resolve()
+        )
+
+
+class TestLazyCollection:
+    def test_builds_collection_on_first_access(self):
+        factory = Mock(
+            side_effect=lambda: (
+                TerraformTaskCollection().for_configuration("network").create()
+            )
+        )
+
+        collection = LazyCollection("network", factory)
+
+        factory.assert_not_called()
+        assert set(collection.tasks.keys()) == {
+            "validate",
+            "plan",
+            "apply",
+            "destroy",
+            "output",
+        }
+        assert set(collection.tasks.keys()) == set(collection.task_names)
+        factory.assert_called_once()
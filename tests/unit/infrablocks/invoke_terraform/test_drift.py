@@ -0,0 +1,179 @@
+import json
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    DriftDetector,
+    DriftReport,
+    RefreshStore,
+    TerraformTaskCollection,
+    TerraformTaskCollectionGroup,
+    parameter,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.drift import DriftHistory, DriftResult
+from infrablocks.invoke_terraform.fingerprints import plan_key
+from infrablocks.invoke_terraform.terraform import Terraform
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def collection(root: Path, name: str) -> TerraformTaskCollection:
+    def configure(_context, arguments, configuration: Configuration):
+        configuration.source_directory = str(root / name)
+        configuration.variables = {"region": arguments.get("region", "none")}
+
+    return (
+        TerraformTaskCollection()
+        .for_configuration(name)
+        .with_global_parameters(parameter(name="region", default="eu"))
+        .with_global_configure_function(configure)
+    )
+
+
+def plan_side_effect(drifted: set[str], failing: set[str]):
+    def plan(chdir: str, **_: Any) -> bool:
+        name = Path(chdir).name
+        if name in failing:
+            raise RuntimeError("Error acquiring the state lock")
+        return name in drifted
+
+    return plan
+
+
+def detector(terraform: Mock, root: Path, **kwargs: Any) -> DriftDetector:
+    return DriftDetector(
+        terraform_factory=MockTerraformFactory(terraform),
+        history=DriftHistory(JSONFileCache(root / "drift.json")),
+        maximum_workers=2,
+        **kwargs,
+    )
+
+
+class TestDriftDetector:
+    def test_reports_drifted_clean_and_failed_targets(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.plan.side_effect = plan_side_effect({"dns"}, {"queue"})
+        targets = [
+            target
+            for name in ["network", "dns", "queue"]
+            for target in collection(tmp_path, name).drift_targets()
+        ]
+
+        report = detector(terraform, tmp_path).detect(Context(), targets)
+
+        statuses = {result.name: result.status for result in report.results}
+        assert statuses == {
+            "network": "clean",
+            "dns": "drifted",
+            "queue": "failed",
+        }
+        assert terraform.plan.call_args.kwargs["refresh_only"] is True
+        assert terraform.plan.call_args.kwargs["detailed_exitcode"] is True
+        assert terraform.plan.call_args.kwargs["vars"] == {"region": "eu"}
+        assert report.metrics()["drifted"] == 1
+        assert json.loads(report.to_json())["results"][2]["error"] == (
+            "RuntimeError: Error acquiring the state lock"
+        )
+
+    def test_checks_each_workspace_in_its_own_data_directory(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        terraform.plan.return_value = False
+        targets = (
+            collection(tmp_path, "network")
+            .with_workspaces(["staging", "production"])
+            .drift_targets()
+        )
+
+        report = detector(terraform, tmp_path).detect(Context(), targets)
+
+        assert [result.name for result in report.results] == [
+            "network:staging",
+            "network:production",
+        ]
+        environments = [
+            call.kwargs["environment"]
+            for call in terraform.plan.call_args_list
+        ]
+        assert sorted(
+            environment["TF_WORKSPACE"] for environment in environments
+        ) == ["production", "staging"]
+        assert len({env["TF_DATA_DIR"] for env in environments}) == 2
+
+    def test_reports_drift_to_refresh_store(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.plan.return_value = True
+        store = RefreshStore(JSONFileCache(tmp_path / "refreshes.json"))
+
+        detector(terraform, tmp_path, refresh_store=store).detect(
+            Context(), collection(tmp_path, "network").drift_targets()
+        )
+
+        assert store.drift_reported(plan_key(str(tmp_path / "network"), None))
+
+
+class TestDriftHistory:
+    def test_prioritises_recent_drift_then_unknown_then_longest(
+        self, tmp_path: Path
+    ):
+        history = DriftHistory(JSONFileCache(tmp_path / "drift.json"))
+        history.record(
+            [
+                DriftResult(name="quick", status="clean", duration=1),
+                DriftResult(name="slow", status="clean", duration=30),
+                DriftResult(name="drifty", status="drifted", duration=2),
+            ]
+        )
+        targets = [
+            target
+            for name in ["quick", "slow", "new", "drifty"]
+            for target in collection(tmp_path, name).drift_targets()
+        ]
+
+        ordered = history.prioritise(targets)
+
+        assert [target.name for target in ordered] == [
+            "drifty",
+            "new",
+            "slow",
+            "quick",
+        ]
+
+    def test_smooths_durations(self, tmp_path: Path):
+        history = DriftHistory(JSONFileCache(tmp_path / "drift.json"))
+
+        history.record([DriftResult(name="a", status="clean", duration=10)])
+        history.record([DriftResult(name="a", status="clean", duration=20)])
+
+        assert history.entry("a")["duration"] == 15
+
+
+class TestGroupDriftTask:
+    def test_writes_json_report_for_group_members(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.plan.side_effect = plan_side_effect({"dns"}, set())
+        group = (
+            TerraformTaskCollectionGroup()
+            .for_group("all")
+            .with_drift_detector(detector(terraform, tmp_path))
+        )
+        for name in ["network", "dns"]:
+            group = group.with_configuration(
+                collection(tmp_path, name), str(tmp_path / name)
+            )
+        task = cast(Task[BodyCallable[Any]], group.create().tasks["drift"])
+        report_path = tmp_path / "report.json"
+
+        report = cast(DriftReport, task(Context(), report=str(report_path)))
+
+        assert [result.name for result in report.drifted] == ["dns"]
+        assert json.loads(report_path.read_text())["metrics"]["targets"] == 2
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from infrablocks.invoke_terraform import PlanFingerprintStore
+from infrablocks.invoke_terraform.fingerprints import plan_key
+from infrablocks.invoke_terraform.terraform import PlanSummary
+
+
+def summary(fingerprint: str) -> PlanSummary:
+    return PlanSummary(
+        fingerprint=fingerprint,
+        by_action={"create": 1},
+        by_type={"aws_vpc": 1},
+        by_module={"": 1},
+        changes={"aws_vpc.main": "create"},
+        digests={"aws_vpc.main": fingerprint},
+    )
+
+
+class TestPlanFingerprintStore:
+    def test_matches_approved_fingerprints(self, tmp_path: Path):
+        store = PlanFingerprintStore(tmp_path)
+
+        store.approve("network#default", summary("abc"))
+
+        assert store.matches("network#default", "abc")
+        assert not store.matches("network#default", "def")
+        assert not store.matches("cluster#default", "abc")
+
+    def test_persists_approved_summaries(self, tmp_path: Path):
+        PlanFingerprintStore(tmp_path).approve(
+            "network#default", summary("abc")
+        )
+
+        store = PlanFingerprintStore(tmp_path)
+
+        assert store.matches("network#default", "abc")
+        assert store.approved("network#default") == summary("abc")
+        assert store.approved("cluster#default") is None
+
+    def test_keys_plans_by_directory_and_workspace(self, tmp_path: Path):
+        assert plan_key(str(tmp_path), None) == f"{tmp_path.resolve()}#default"
+        assert plan_key(str(tmp_path), "production") == (
+            f"{tmp_path.resolve()}#production"
+        )
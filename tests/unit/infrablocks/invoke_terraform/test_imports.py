@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SOURCE_DIRECTORY = Path(__file__).parents[4] / "src"
+
+
+def loaded_modules(statement: str) -> set[str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{statement}\nprint('\\n'.join(sys.modules))",
+        ],
+        env={**os.environ, "PYTHONPATH": str(SOURCE_DIRECTORY)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.splitlines())
+
+
+class TestImports:
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import infrablocks.invoke_terraform",
+            "import infrablocks.invoke_terraform.terraform",
+            "from infrablocks.invoke_terraform.terraform import Terraform",
+            "import infrablocks.invoke_terraform.client",
+            "import infrablocks.invoke_terraform.testing",
+            "import infrablocks.invoke_terraform.validation",
+        ],
+    )
+    def test_does_not_import_invoke_eagerly(self, statement: str):
+        modules = loaded_modules(statement)
+
+        assert "invoke" not in modules
+        assert "infrablocks.invoke_factory" not in modules
+
+    def test_imports_invoke_when_task_names_are_used(self):
+        modules = loaded_modules(
+            "from infrablocks.invoke_terraform import TerraformTaskCollection"
+        )
+
+        assert "invoke.collection" in modules
+
+    def test_resolves_all_public_names(self):
+        import infrablocks.invoke_terraform as package
+        import infrablocks.invoke_terraform.terraform as terraform
+        import infrablocks.invoke_terraform.testing as testing
+
+        for module in [package, terraform, testing]:
+            for name in module.__all__:
+                assert getattr(module, name) is not None
+
+    def test_raises_attribute_error_for_unknown_names(self):
+        import infrablocks.invoke_terraform as package
+
+        with pytest.raises(AttributeError):
+            getattr(package, "Unknown")
@@ -0,0 +1,147 @@
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Linter,
+    LintReport,
+    ModuleDependencyIndex,
+    TerraformTaskCollection,
+    TerraformTaskCollectionGroup,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.terraform import Terraform
+from infrablocks.invoke_terraform.validation import ValidationCache
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def configurations(root: Path) -> dict[str, str]:
+    write(root / "app" / "main.tf", 'resource "null_resource" "app" {}\n')
+    write(root / "database" / "main.tf", 'resource "null_resource" "db" {}\n')
+    return {"app": str(root / "app"), "database": str(root / "database")}
+
+
+def linter(terraform: Mock, root: Path) -> Linter:
+    return Linter(
+        terraform_factory=MockTerraformFactory(terraform),
+        cache=ValidationCache(
+            cache=JSONFileCache(root / "cache" / "lint.json"),
+            dependency_index=ModuleDependencyIndex(
+                JSONFileCache(root / "cache" / "dependencies.json")
+            ),
+        ),
+        maximum_workers=2,
+    )
+
+
+@pytest.fixture(autouse=True)
+def plugin_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("TF_PLUGIN_CACHE_DIR", str(tmp_path / "plugins"))
+
+
+class TestLinter:
+    def test_checks_formatting_and_validates_every_configuration(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        targets = configurations(tmp_path)
+
+        report = linter(terraform, tmp_path).lint(Context(), targets)
+
+        assert [result.name for result in report.results] == [
+            "app",
+            "database",
+        ]
+        assert not report.failed
+        assert sorted(
+            call.kwargs["chdir"] for call in terraform.fmt.call_args_list
+        ) == [targets["app"], targets["database"]]
+        terraform.fmt.assert_any_call(
+            chdir=targets["app"], check=True, recursive=True
+        )
+        assert all(
+            call.kwargs["backend"] is False
+            for call in terraform.init.call_args_list
+        )
+        assert terraform.validate.call_count == 2
+
+    def test_skips_unchanged_configurations(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        targets = configurations(tmp_path)
+        lint = linter(terraform, tmp_path)
+        lint.lint(Context(), targets)
+        write(tmp_path / "app" / "outputs.tf", 'output "id" { value = 1 }\n')
+        terraform.reset_mock()
+
+        report = linter(terraform, tmp_path).lint(Context(), targets)
+
+        assert [result.name for result in report.skipped] == ["database"]
+        terraform.fmt.assert_called_once_with(
+            chdir=targets["app"], check=True, recursive=True
+        )
+
+    def test_reports_all_failures_together(self, tmp_path: Path):
+        def fmt(chdir: str, **_: Any):
+            if chdir.endswith("app"):
+                raise RuntimeError("main.tf")
+
+        def validate(chdir: str, **_: Any):
+            if chdir.endswith("database"):
+                raise RuntimeError("Missing argument")
+
+        terraform = Mock(spec=Terraform)
+        terraform.fmt.side_effect = fmt
+        terraform.validate.side_effect = validate
+        targets = configurations(tmp_path)
+        lint = linter(terraform, tmp_path)
+
+        report = lint.lint(Context(), targets)
+
+        assert [result.name for result in report.failed] == [
+            "app",
+            "database",
+        ]
+        assert "app: fmt failed\n    main.tf" in report.render()
+        assert "database: validate failed" in report.render()
+        with pytest.raises(ValueError, match="0 of 2 configurations"):
+            report.raise_for_failures()
+
+        terraform.reset_mock(side_effect=True)
+        rerun = lint.lint(Context(), targets)
+
+        assert not rerun.skipped
+        assert not rerun.failed
+
+
+class TestGroupLintTask:
+    def test_lints_group_members(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        targets = configurations(tmp_path)
+        group = (
+            TerraformTaskCollectionGroup()
+            .for_group("all")
+            .with_linter(linter(terraform, tmp_path))
+        )
+        for name, directory in targets.items():
+            group = group.with_configuration(
+                TerraformTaskCollection().for_configuration(name), directory
+            )
+        task = cast(Task[BodyCallable[Any]], group.create().tasks["lint"])
+
+        report = cast(LintReport, task(Context()))
+
+        assert len(report.results) == 2
+        assert terraform.validate.call_count == 2
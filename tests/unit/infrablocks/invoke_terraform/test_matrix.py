@@ -0,0 +1,177 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    MatrixCell,
+    MatrixReport,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.lazy import LazyTask
+from infrablocks.invoke_terraform.matrix import run_matrix
+from infrablocks.invoke_terraform.terraform import Terraform
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+CELLS = [
+    MatrixCell(
+        name="eu-west-1",
+        variables={"region": "eu-west-1"},
+        workspace="eu-west-1",
+        backend_config={"key": "eu-west-1.tfstate"},
+    ),
+    MatrixCell(
+        name="us-east-1",
+        variables={"region": "us-east-1"},
+        workspace="us-east-1",
+        environment={"AWS_PROFILE": "us"},
+    ),
+]
+
+
+def matrix_collection(
+    terraform: Mock, source_directory: Path
+) -> TerraformTaskCollection:
+    def configure(_context, _arguments, configuration: Configuration):
+        configuration.source_directory = str(source_directory)
+        configuration.variables = {"region": "default", "size": "small"}
+        configuration.environment = {
+            "TF_PLUGIN_CACHE_DIR": str(source_directory / "plugins")
+        }
+
+    return (
+        TerraformTaskCollection(
+            task_factory=TerraformTaskFactory(
+                terraform_factory=MockTerraformFactory(terraform)
+            )
+        )
+        .for_configuration("network")
+        .with_global_configure_function(configure)
+        .with_matrix(cell for cell in CELLS)
+    )
+
+
+class TestRunMatrix:
+    def test_bounds_concurrency_and_keeps_cell_order(self):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def run(cell: MatrixCell) -> str:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return cell.name.upper()
+
+        report = run_matrix(
+            [MatrixCell(name=str(index)) for index in range(6)],
+            run,
+            maximum_workers=2,
+        )
+
+        assert peak <= 2
+        assert [result.result for result in report.results] == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+            "5",
+        ]
+
+    def test_aggregates_failures_into_one_report(self):
+        def run(cell: MatrixCell) -> None:
+            if cell.name == "b":
+                raise RuntimeError("backend unavailable\nmore detail")
+
+        report = run_matrix([MatrixCell("a"), MatrixCell("b")], run)
+
+        assert [result.cell for result in report.failed] == ["b"]
+        assert "b: failed" in report.render()
+        assert "RuntimeError: backend unavailable" in report.render()
+        with pytest.raises(ValueError, match="1 of 2 cells succeeded"):
+            report.raise_for_failures()
+
+
+class TestMatrixTasks:
+    def test_adds_matrix_tasks_when_matrix_configured(self, tmp_path: Path):
+        collection = matrix_collection(Mock(spec=Terraform), tmp_path).create()
+
+        assert {"plan-matrix", "apply-matrix"} <= set(collection.tasks.keys())
+        assert (
+            "plan-matrix"
+            not in (
+                TerraformTaskCollection().for_configuration("network").create()
+            ).tasks
+        )
+
+    def test_runs_each_cell_with_isolated_data_directory(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        collection = matrix_collection(terraform, tmp_path).create()
+        task = cast(Task[BodyCallable[Any]], collection["plan-matrix"])
+
+        report = cast(MatrixReport, task(Context()))
+
+        assert [result.cell for result in report.succeeded] == [
+            "eu-west-1",
+            "us-east-1",
+        ]
+        plans = sorted(
+            terraform.plan.call_args_list,
+            key=lambda call: call.kwargs["vars"]["region"],
+        )
+        assert [call.kwargs["vars"] for call in plans] == [
+            {"region": "eu-west-1", "size": "small"},
+            {"region": "us-east-1", "size": "small"},
+        ]
+        environments = [call.kwargs["environment"] for call in plans]
+        assert [
+            environment["TF_DATA_DIR"] for environment in environments
+        ] == [
+            str(tmp_path.resolve() / ".terraform" / "matrix" / "eu-west-1"),
+            str(tmp_path.resolve() / ".terraform" / "matrix" / "us-east-1"),
+        ]
+        assert {
+            environment["TF_PLUGIN_CACHE_DIR"] for environment in environments
+        } == {str(tmp_path / "plugins")}
+        assert environments[1]["AWS_PROFILE"] == "us"
+        terraform.init.assert_any_call(
+            chdir=str(tmp_path),
+            backend_config={"key": "eu-west-1.tfstate"},
+            reconfigure=False,
+            environment=environments[0],
+        )
+
+    def test_reports_failed_cells_after_running_all(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.apply.side_effect = [RuntimeError("boom"), None]
+        collection = matrix_collection(terraform, tmp_path).create()
+        task = cast(Task[BodyCallable[Any]], collection["apply-matrix"])
+
+        with pytest.raises(ValueError, match="1 of 2 cells succeeded"):
+            task(Context())
+
+        assert terraform.apply.call_count == 2
+
+    def test_creates_lazy_matrix_tasks_in_lazy_mode(self, tmp_path: Path):
+        collection = (
+            matrix_collection(Mock(spec=Terraform), tmp_path)
+            .with_lazy_tasks()
+            .create()
+        )
+
+        assert isinstance(collection["plan-matrix"], LazyTask)
@@ -0,0 +1,163 @@
+from typing import Any, cast
+from unittest.mock import Mock
+
+from invoke.config import Config
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import Arguments, BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    ConfigurationMemo,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.terraform import (
+    Policy,
+    RequiredTags,
+    Terraform,
+)
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def counting_configure_function(calls: list[Arguments]):
+    def configure(
+        _context: Context, arguments: Arguments, configuration: Configuration
+    ):
+        calls.append(arguments)
+        configuration.source_directory = "deployments/network"
+        configuration.variables = {"region": "eu-west-2", "tags": ["a"]}
+        configuration.environment = {"AWS_PROFILE": "network"}
+
+    return configure
+
+
+def memoized_collection(
+    terraform: Mock, calls: list[Arguments], memo: ConfigurationMemo
+) -> TerraformTaskCollection:
+    return (
+        TerraformTaskCollection(
+            task_factory=TerraformTaskFactory(
+                terraform_factory=MockTerraformFactory(terraform)
+            )
+        )
+        .for_configuration("network")
+        .with_global_configure_function(counting_configure_function(calls))
+        .with_memoized_configuration(memo)
+    )
+
+
+class TestConfigurationFingerprint:
+    def test_is_equal_for_equal_configurations(self):
+        first = Configuration.create_empty()
+        second = Configuration.create_empty()
+        first.variables = {"region": "eu-west-2", "tags": {"a": "1"}}
+        second.variables = {"tags": {"a": "1"}, "region": "eu-west-2"}
+
+        assert first.fingerprint() == second.fingerprint()
+
+    def test_changes_when_nested_configuration_changes(self):
+        configuration = Configuration.create_empty()
+        before = configuration.fingerprint()
+
+        configuration.init.backend_config = {"key": "network.tfstate"}
+
+        assert configuration.fingerprint() != before
+
+    def test_includes_policy_rules(self):
+        first = Configuration.create_empty()
+        second = Configuration.create_empty()
+        first.policy = Policy([RequiredTags(tags=frozenset({"owner"}))])
+        second.policy = Policy([RequiredTags(tags=frozenset({"team"}))])
+
+        assert first.fingerprint() != second.fingerprint()
+
+
+class TestConfigurationMemo:
+    def test_configures_once_for_same_arguments_and_context(self):
+        calls: list[Arguments] = []
+        memo = ConfigurationMemo()
+        configure = memo.memoize("network", counting_configure_function(calls))
+        context = Context()
+
+        first = Configuration.create_empty()
+        second = Configuration.create_empty()
+        configure(context, {"region": "eu-west-2"}, first)
+        configure(context, {"region": "eu-west-2"}, second)
+
+        assert len(calls) == 1
+        assert second == first
+
+    def test_configures_again_for_different_arguments_or_context(self):
+        calls: list[Arguments] = []
+        memo = ConfigurationMemo()
+        configure = memo.memoize("network", counting_configure_function(calls))
+
+        configure(Context(), {}, Configuration.create_empty())
+        configure(
+            Context(), {"region": "us-east-1"}, Configuration.create_empty()
+        )
+        configure(
+            Context(config=Config(overrides={"terraform": {"profile": "b"}})),
+            {},
+            Configuration.create_empty(),
+        )
+
+        assert len(calls) == 3
+
+    def test_returns_independent_copies(self):
+        calls: list[Arguments] = []
+        memo = ConfigurationMemo()
+        configure = memo.memoize("network", counting_configure_function(calls))
+        first = Configuration.create_empty()
+        configure(Context(), {}, first)
+        cast(list[str], first.variables["tags"]).append("b")
+        first.environment = {}
+
+        second = Configuration.create_empty()
+        configure(Context(), {}, second)
+
+        assert second.variables == {"region": "eu-west-2", "tags": ["a"]}
+        assert second.environment == {"AWS_PROFILE": "network"}
+
+
+class TestMemoizedTaskCollection:
+    def test_configures_once_across_tasks(self):
+        terraform = Mock(spec=Terraform)
+        calls: list[Arguments] = []
+        collection = memoized_collection(
+            terraform, calls, ConfigurationMemo()
+        ).create()
+        plan = cast(Task[BodyCallable[Any]], collection["plan"])
+        apply = cast(Task[BodyCallable[Any]], collection["apply"])
+
+        plan(Context())
+        apply(Context())
+
+        assert len(calls) == 1
+        terraform.apply.assert_called_once()
+        assert terraform.apply.call_args.kwargs["vars"] == {
+            "region": "eu-west-2",
+            "tags": ["a"],
+        }
+
+    def test_does_not_memoize_by_default(self):
+        terraform = Mock(spec=Terraform)
+        calls: list[Arguments] = []
+        collection = (
+            TerraformTaskCollection(
+                task_factory=TerraformTaskFactory(
+                    terraform_factory=MockTerraformFactory(terraform)
+                )
+            )
+            .for_configuration("network")
+            .with_global_configure_function(counting_configure_function(calls))
+            .create()
+        )
+
+        cast(Task[BodyCallable[Any]], collection["plan"])(Context())
+        cast(Task[BodyCallable[Any]], collection["apply"])(Context())
+
+        assert len(calls) == 2
@@ -0,0 +1,300 @@
+import io
+import json
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import IO, Any
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import Context
+
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.outputs import OutputResolver, OutputSource
+from infrablocks.invoke_terraform.terraform import (
+    Environment,
+    Executor,
+    StateIndex,
+    Terraform,
+    TerraformFactory,
+)
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def state(outputs: dict[str, Any], serial: int = 1) -> StateIndex:
+    return StateIndex.load(
+        io.StringIO(
+            json.dumps(
+                {
+                    "version": 4,
+                    "serial": serial,
+                    "lineage": "lineage-1",
+                    "outputs": outputs,
+                    "resources": [],
+                }
+            )
+        )
+    )
+
+
+def resolver_for(
+    terraform: Mock, cache: JSONFileCache | None = None
+) -> OutputResolver:
+    resolver = OutputResolver(
+        terraform_factory=MockTerraformFactory(terraform)
+    )
+    if cache is not None:
+        resolver.enable_disk_cache(time_to_live=60, cache=cache)
+    return resolver
+
+
+def resolver_for_executor(
+    executor: Mock, cache: JSONFileCache | None = None
+) -> OutputResolver:
+    terraform_factory = Mock(spec=TerraformFactory)
+    terraform_factory.build.return_value = Terraform(executor)
+    resolver = OutputResolver(terraform_factory=terraform_factory)
+    if cache is not None:
+        resolver.enable_disk_cache(time_to_live=60, cache=cache)
+    return resolver
+
+
+def write_state(outputs: dict[str, Any], serial: int = 1):
+    def side_effect(
+        command: Sequence[str],
+        environment: Environment | None = None,
+        stdout: IO[str] | None = None,
+        stderr: IO[str] | None = None,
+    ):
+        if stdout is not None and list(command[-2:]) == ["state", "pull"]:
+            stdout.write(
+                json.dumps(
+                    {
+                        "version": 4,
+                        "serial": serial,
+                        "lineage": "lineage-1",
+                        "outputs": outputs,
+                        "resources": [],
+                    }
+                )
+            )
+        return 0
+
+    return side_effect
+
+
+def commands(executor: Mock) -> list[list[str]]:
+    return [list(call.args[0]) for call in executor.execute.call_args_list]
+
+
+class TestOutputResolver:
+    def test_resolves_output_value_from_state(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.return_value = state(
+            {"vpc_id": {"value": "vpc-123", "type": "string"}}
+        )
+        resolver = resolver_for(terraform)
+
+        value = resolver.output(Context(), "deployments/network", "vpc_id")
+
+        assert value == "vpc-123"
+
+    def test_loads_state_once_for_repeated_resolves(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.return_value = state(
+            {
+                "vpc_id": {"value": "vpc-123", "type": "string"},
+                "subnet_ids": {"value": ["a", "b"], "type": "list"},
+            }
+        )
+        resolver = resolver_for(terraform)
+        context = Context()
+
+        resolver.prefetch(context, [OutputSource("deployments/network")] * 3)
+        resolver.output(context, "deployments/network", "vpc_id")
+        resolver.output(context, "deployments/network", "subnet_ids")
+
+        terraform.init.assert_called_once()
+        terraform.load_state.assert_called_once()
+
+    def test_resolves_each_workspace_separately(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.return_value = state(
+            {"vpc_id": {"value": "vpc-123", "type": "string"}}
+        )
+        resolver = resolver_for(terraform)
+        context = Context()
+
+        resolver.output(
+            context, "deployments/network", "vpc_id", workspace="staging"
+        )
+        resolver.output(
+            context, "deployments/network", "vpc_id", workspace="production"
+        )
+
+        environments = [
+            call.kwargs["environment"]
+            for call in terraform.load_state.call_args_list
+        ]
+        assert environments == [
+            {"TF_WORKSPACE": "staging"},
+            {"TF_WORKSPACE": "production"},
+        ]
+
+    def test_raises_for_unknown_output(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.return_value = state({})
+        resolver = resolver_for(terraform)
+
+        with pytest.raises(ValueError, match="'vpc_id'"):
+            resolver.output(Context(), "deployments/network", "vpc_id")
+
+    def test_uses_unexpired_disk_cache_entries(self, tmp_path: Path):
+        cache = JSONFileCache(tmp_path / "outputs.json")
+        source = OutputSource("deployments/network")
+        cache.store(
+            {
+                source.key: {
+                    "lineage": "lineage-1",
+                    "serial": 4,
+                    "values": {"vpc_id": "vpc-cached"},
+                    "fetched_at": time.time(),
+                }
+            }
+        )
+        terraform = Mock(spec=Terraform)
+        terraform.state_version.return_value = ("lineage-1", 4)
+        resolver = resolver_for(terraform, cache)
+
+        value = resolver.output(Context(), "deployments/network", "vpc_id")
+
+        assert value == "vpc-cached"
+        terraform.load_state.assert_not_called()
+
+    def test_reloads_disk_cache_entries_for_newer_serials(
+        self, tmp_path: Path
+    ):
+        cache = JSONFileCache(tmp_path / "outputs.json")
+        source = OutputSource("deployments/network")
+        cache.store(
+            {
+                source.key: {
+                    "lineage": "lineage-1",
+                    "serial": 4,
+                    "values": {"vpc_id": "vpc-cached"},
+                    "fetched_at": time.time(),
+                }
+            }
+        )
+        terraform = Mock(spec=Terraform)
+        terraform.state_version.return_value = ("lineage-1", 5)
+        terraform.load_state.return_value = state(
+            {"vpc_id": {"value": "vpc-new", "type": "string"}}, 5
+        )
+        resolver = resolver_for(terraform, cache)
+
+        value = resolver.output(Context(), "deployments/network", "vpc_id")
+
+        assert value == "vpc-new"
+
+    def test_runs_init_and_state_pull_once_per_source(self):
+        executor = Mock(spec=Executor)
+        executor.execute.side_effect = write_state(
+            {"vpc_id": {"value": "vpc-1", "type": "string"}}
+        )
+        resolver = resolver_for_executor(executor)
+        context = Context()
+
+        values = [
+            resolver.output(context, "deployments/network", "vpc_id")
+            for _ in range(3)
+        ]
+
+        assert values == ["vpc-1"] * 3
+        assert commands(executor) == [
+            ["terraform", "-chdir=deployments/network", "init"],
+            ["terraform", "-chdir=deployments/network", "state", "pull"],
+        ]
+
+    def test_revalidates_disk_cache_entries_once_per_run(self, tmp_path: Path):
+        cache = JSONFileCache(tmp_path / "outputs.json")
+        source = OutputSource("deployments/network")
+        cache.store(
+            {
+                source.key: {
+                    "lineage": "lineage-1",
+                    "serial": 1,
+                    "values": {"vpc_id": "vpc-cached"},
+                    "fetched_at": time.time(),
+                }
+            }
+        )
+        executor = Mock(spec=Executor)
+        executor.execute.side_effect = write_state(
+            {"vpc_id": {"value": "vpc-1", "type": "string"}}
+        )
+        resolver = resolver_for_executor(executor, cache)
+        context = Context()
+
+        values = [
+            resolver.output(context, "deployments/network", "vpc_id")
+            for _ in range(3)
+        ]
+
+        assert values == ["vpc-cached"] * 3
+        assert [command[2:] for command in commands(executor)] == [
+            ["init"],
+            ["state", "pull"],
+        ]
+
+    def test_retries_sources_whose_fetch_failed(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.side_effect = [
+            RuntimeError("Error: state lock"),
+            state({"vpc_id": {"value": "vpc-1", "type": "string"}}),
+        ]
+        resolver = resolver_for(terraform)
+        context = Context()
+
+        with pytest.raises(RuntimeError):
+            resolver.output(context, "deployments/network", "vpc_id")
+        value = resolver.output(context, "deployments/network", "vpc_id")
+
+        assert value == "vpc-1"
+        terraform.state_version.assert_not_called()
+
+    def test_does_not_store_sensitive_outputs_on_disk(self, tmp_path: Path):
+        cache = JSONFileCache(tmp_path / "outputs.json")
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.return_value = state(
+            {
+                "password": {
+                    "value": "secret",
+                    "type": "string",
+                    "sensitive": True,
+                }
+            }
+        )
+        resolver = resolver_for(terraform, cache)
+
+        value = resolver.output(Context(), "deployments/database", "password")
+
+        assert value == "secret"
+        assert cache.load() == {}
+
+    def test_refetches_after_invalidation(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_state.side_effect = [
+            state({"vpc_id": {"value": "vpc-1", "type": "string"}}),
+            state({"vpc_id": {"value": "vpc-2", "type": "string"}}, 2),
+        ]
+        resolver = resolver_for(terraform)
+        context = Context()
+
+        first = resolver.output(context, "deployments/network", "vpc_id")
+        resolver.invalidate(OutputSource("deployments/network"))
+        second = resolver.output(context, "deployments/network", "vpc_id")
+
+        assert (first, second) == ("vpc-1", "vpc-2")
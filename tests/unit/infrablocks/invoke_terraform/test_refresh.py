@@ -0,0 +1,127 @@
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+from invoke.context import MockContext
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    RefreshPolicy,
+    RefreshStore,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.fingerprints import plan_key
+from infrablocks.invoke_terraform.terraform import Terraform
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def refresh_policy(root: Path, maximum_age: float = 3600) -> RefreshPolicy:
+    return RefreshPolicy(
+        maximum_age=maximum_age,
+        store=RefreshStore(JSONFileCache(root / "refreshes.json")),
+    )
+
+
+def task(
+    terraform: Mock, policy: RefreshPolicy, task_name: str
+) -> Task[BodyCallable[Any]]:
+    def configure(_context, _arguments, configuration: Configuration):
+        configuration.source_directory = "/deployments/network"
+        configuration.workspace = "production"
+        configuration.refresh_policy = policy
+
+    collection = (
+        TerraformTaskCollection(
+            task_factory=TerraformTaskFactory(
+                terraform_factory=MockTerraformFactory(terraform)
+            )
+        )
+        .for_configuration("network")
+        .with_global_configure_function(configure)
+        .with_refresh_only_task()
+        .create()
+    )
+    return cast(Task[BodyCallable[Any]], collection.tasks[task_name])
+
+
+KEY = plan_key("/deployments/network", "production")
+
+
+class TestRefreshPolicy:
+    def test_refreshes_when_never_refreshed(self, tmp_path: Path):
+        assert refresh_policy(tmp_path).should_refresh(KEY)
+
+    def test_skips_refresh_within_maximum_age(self, tmp_path: Path):
+        policy = refresh_policy(tmp_path, maximum_age=60)
+        policy.store.record_refresh(KEY, at=1000)
+
+        assert not policy.should_refresh(KEY, now=1030)
+        assert policy.should_refresh(KEY, now=1060)
+
+    def test_refreshes_when_drift_reported(self, tmp_path: Path):
+        policy = refresh_policy(tmp_path)
+        policy.store.record_refresh(KEY)
+        policy.store.report_drift(KEY)
+
+        assert policy.should_refresh(KEY)
+
+        policy.store.record_refresh(KEY)
+
+        assert not policy.should_refresh(KEY)
+
+
+class TestRefreshAwareTasks:
+    def test_plan_skips_refresh_for_recently_refreshed_state(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        policy = refresh_policy(tmp_path)
+        plan = task(terraform, policy, "plan")
+
+        plan(MockContext())
+        plan(MockContext())
+
+        first, second = terraform.plan.call_args_list
+        assert "refresh" not in first.kwargs
+        assert second.kwargs["refresh"] is False
+
+    def test_apply_refreshes_after_drift_is_reported(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        policy = refresh_policy(tmp_path)
+        policy.store.record_refresh(KEY)
+        policy.store.report_drift(KEY)
+
+        task(terraform, policy, "apply")(MockContext())
+
+        assert "refresh" not in terraform.apply.call_args.kwargs
+        assert not policy.store.drift_reported(KEY)
+
+    def test_does_not_create_refresh_only_task_by_default(self):
+        collection = (
+            TerraformTaskCollection().for_configuration("network").create()
+        )
+
+        assert "refresh-only" not in collection.tasks
+
+    def test_refresh_only_task_refreshes_state_and_records_it(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        policy = refresh_policy(tmp_path)
+
+        task(terraform, policy, "refresh-only")(MockContext())
+
+        terraform.apply.assert_called_once_with(
+            chdir="/deployments/network",
+            vars={},
+            autoapprove=True,
+            environment={},
+            refresh_only=True,
+        )
+        assert policy.store.last_refreshed(KEY) is not None
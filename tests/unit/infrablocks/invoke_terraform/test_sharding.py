@@ -0,0 +1,228 @@
+import json
+from collections.abc import Sequence
+from io import StringIO
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import Context, MockContext
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    ModuleDependencyIndex,
+    ResourceGraphIndex,
+    ShardedPlanner,
+    ShardedPlanReport,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.sharding import partition
+from infrablocks.invoke_terraform.terraform import (
+    PlanTable,
+    ResourceGraph,
+    StateIndex,
+    Terraform,
+)
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+GRAPH = ResourceGraph(
+    dependencies={
+        "aws_instance.web": ["aws_security_group.web", "var.region"],
+        "aws_security_group.web": ['provider["aws"]'],
+        "aws_s3_bucket.logs": ['provider["aws"]'],
+        "aws_s3_bucket_policy.logs": ["aws_s3_bucket.logs"],
+        "aws_iam_role.ci": ['provider["aws"]'],
+        'provider["aws"]': ["var.region"],
+        "var.region": [],
+    }
+)
+
+
+def plan_table(addresses: Sequence[str]) -> PlanTable:
+    return PlanTable.load(
+        StringIO(
+            json.dumps(
+                {
+                    "resource_changes": [
+                        {
+                            "address": address,
+                            "type": address.split(".")[-2],
+                            "change": {"actions": ["create"], "after": {}},
+                        }
+                        for address in addresses
+                    ]
+                }
+            )
+        )
+    )
+
+
+def state(serial: int) -> StateIndex:
+    return StateIndex("lineage", serial, [])
+
+
+def mock_terraform(
+    extra: Sequence[str] = (), failing: str | None = None
+) -> Mock:
+    terraform = Mock(spec=Terraform)
+    terraform.load_graph.return_value = GRAPH
+    terraform.load_state.return_value = state(1)
+    planned: dict[str, Sequence[str]] = {}
+
+    def stream_plan(out: str, targets: Sequence[str], **_: Any):
+        if failing in targets:
+            raise RuntimeError("Error: Invalid target")
+        planned[out] = [*targets, *extra]
+        return iter(["{}\n"])
+
+    def load_plan(plan_file: str, **_: Any) -> PlanTable:
+        return plan_table(planned[plan_file])
+
+    terraform.stream_plan.side_effect = stream_plan
+    terraform.load_plan.side_effect = load_plan
+    return terraform
+
+
+def planner(terraform: Mock, root: Path, maximum_shards: int = 8):
+    return ShardedPlanner(
+        terraform_factory=MockTerraformFactory(terraform),
+        graph_index=ResourceGraphIndex(
+            cache=JSONFileCache(root / "graphs.json"),
+            dependency_index=ModuleDependencyIndex(
+                JSONFileCache(root / "dependencies.json")
+            ),
+        ),
+        maximum_shards=maximum_shards,
+    )
+
+
+def configuration(root: Path) -> Configuration:
+    configuration = Configuration.create_empty()
+    configuration.source_directory = str(root)
+    return configuration
+
+
+class TestPartition:
+    def test_balances_components_across_shards(self):
+        shards = partition(GRAPH, maximum_shards=2)
+
+        assert [(shard.targets, shard.size) for shard in shards] == [
+            (["aws_iam_role.ci", "aws_instance.web"], 3),
+            (["aws_s3_bucket_policy.logs"], 2),
+        ]
+
+    def test_does_not_shard_a_single_component(self):
+        graph = ResourceGraph(
+            dependencies={"aws_instance.web": ["aws_security_group.web"]}
+        )
+
+        assert partition(graph, maximum_shards=8) == []
+
+
+class TestShardedPlanner:
+    def test_plans_shards_in_parallel_and_merges_summaries(
+        self, tmp_path: Path
+    ):
+        terraform = mock_terraform()
+
+        report = planner(terraform, tmp_path).plan(
+            Context(), configuration(tmp_path)
+        )
+
+        assert report.fallback is None
+        assert report.summary is not None
+        assert report.summary.by_action == {"create": 3}
+        assert len(report.shards) == 3
+        assert all(
+            call.kwargs["lock"] is False
+            for call in terraform.stream_plan.call_args_list
+        )
+        assert "Planned 3 shards" in report.render()
+
+    def test_falls_back_when_a_shard_fails(self, tmp_path: Path):
+        terraform = mock_terraform(failing="aws_iam_role.ci")
+
+        report = planner(terraform, tmp_path).plan(
+            Context(), configuration(tmp_path)
+        )
+
+        assert report.summary is None
+        assert report.fallback == (
+            "shard 3 failed: RuntimeError: Error: Invalid target"
+        )
+
+    def test_falls_back_when_shards_overlap(self, tmp_path: Path):
+        terraform = mock_terraform(extra=["aws_vpc.shared"])
+
+        report = planner(terraform, tmp_path).plan(
+            Context(), configuration(tmp_path)
+        )
+
+        assert report.fallback == (
+            "shards overlap on 1 addresses (first aws_vpc.shared)"
+        )
+
+    def test_falls_back_when_state_changes_during_planning(
+        self, tmp_path: Path
+    ):
+        terraform = mock_terraform()
+        terraform.load_state.side_effect = [state(1), state(2)]
+
+        report = planner(terraform, tmp_path).plan(
+            Context(), configuration(tmp_path)
+        )
+
+        assert report.fallback == "state changed while shards were planning"
+
+
+class TestShardedPlanTask:
+    def task(self, terraform: Mock, root: Path) -> Task[BodyCallable[Any]]:
+        def configure(_context, _arguments, configuration: Configuration):
+            configuration.source_directory = str(root)
+
+        collection = (
+            TerraformTaskCollection(
+                task_factory=TerraformTaskFactory(
+                    terraform_factory=MockTerraformFactory(terraform)
+                )
+            )
+            .for_configuration("web")
+            .with_global_configure_function(configure)
+            .with_sharded_plan_task(maximum_shards=2)
+            .create()
+        )
+        return cast(Task[BodyCallable[Any]], collection.tasks["plan-sharded"])
+
+    @pytest.fixture(autouse=True)
+    def cache_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("INVOKE_TERRAFORM_CACHE_DIR", str(tmp_path / "c"))
+
+    def test_reports_sharded_plan(self, tmp_path: Path):
+        terraform = mock_terraform()
+
+        report = cast(
+            ShardedPlanReport, self.task(terraform, tmp_path)(MockContext())
+        )
+
+        assert len(report.shards) == 2
+        terraform.plan.assert_not_called()
+
+    def test_runs_full_plan_on_fallback(self, tmp_path: Path):
+        terraform = mock_terraform(failing="aws_instance.web")
+
+        report = cast(
+            ShardedPlanReport, self.task(terraform, tmp_path)(MockContext())
+        )
+
+        assert report.fallback is not None
+        terraform.plan.assert_called_once_with(
+            chdir=str(tmp_path), vars={}, environment={}
+        )
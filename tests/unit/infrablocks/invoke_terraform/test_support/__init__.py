@@ -1,5 +1,7 @@
+from .executor import write_to_stdout
 from .terraform_factory import MockTerraformFactory
 
 __all__ = [
     "MockTerraformFactory",
+    "write_to_stdout",
 ]
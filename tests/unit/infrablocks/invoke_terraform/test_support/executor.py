@@ -0,0 +1,18 @@
+from collections.abc import Callable, Sequence
+from typing import IO
+
+from infrablocks.invoke_terraform.terraform import Environment
+
+
+def write_to_stdout(value: str) -> Callable[..., None]:
+    def side_effect(
+        command: Sequence[str],
+        environment: Environment | None = None,
+        stdout: IO[str] | None = None,
+        stderr: IO[str] | None = None,
+    ):
+        if stdout:
+            stdout.write(value)
+        return None
+
+    return side_effect
@@ -0,0 +1,252 @@
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import MockContext
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    ModuleDependencyIndex,
+    ResourceGraphIndex,
+    TargetSelector,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+    factory,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.targeting import (
+    changed_addresses,
+    source_blocks,
+)
+from infrablocks.invoke_terraform.terraform import ResourceGraph, Terraform
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+MAIN = """locals {
+  name = "web"
+}
+
+resource "aws_security_group" "web" {
+  name = local.name
+}
+
+# resource "aws_instance" "commented" {}
+
+resource "aws_instance" "web" {
+  vpc_security_group_ids = [aws_security_group.web.id]
+  subnet_id              = module.vpc.subnet_id
+}
+
+data "aws_ami" "base" {
+  most_recent = true
+}
+
+module "vpc" {
+  source = "../../modules/vpc"
+}
+"""
+
+GRAPH = ResourceGraph(
+    dependencies={
+        "aws_instance.web": ["aws_security_group.web", "module.vpc"],
+        "aws_security_group.web": [],
+        "module.vpc": ["module.vpc.aws_vpc.main"],
+        "module.vpc.aws_vpc.main": [],
+    }
+)
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def source_tree(root: Path) -> Path:
+    source = root / "deployments" / "web"
+    write(source / "main.tf", MAIN)
+    write(
+        root / "modules" / "vpc" / "main.tf",
+        'resource "aws_vpc" "main" {\n  cidr_block = var.cidr\n}\n',
+    )
+    write(root / "modules" / "vpc" / "variables.tf", 'variable "cidr" {}\n')
+    return source
+
+
+def graph_index(root: Path) -> ResourceGraphIndex:
+    return ResourceGraphIndex(
+        cache=JSONFileCache(root / "cache" / "graphs.json"),
+        dependency_index=ModuleDependencyIndex(
+            JSONFileCache(root / "cache" / "dependencies.json")
+        ),
+    )
+
+
+class TestSourceBlocks:
+    def test_finds_line_ranges_of_addressable_blocks(self):
+        blocks = source_blocks(MAIN)
+
+        assert [
+            (block.address, block.first_line, block.last_line)
+            for block in blocks
+        ] == [
+            ("aws_security_group.web", 5, 7),
+            ("aws_instance.web", 11, 14),
+            ("data.aws_ami.base", 16, 18),
+            ("module.vpc", 20, 22),
+        ]
+
+
+class TestChangedAddresses:
+    def test_maps_changed_lines_to_enclosing_blocks(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+
+        addresses = changed_addresses(source, {source / "main.tf": {6, 12}})
+
+        assert addresses == ["aws_instance.web", "aws_security_group.web"]
+
+    def test_maps_module_changes_to_module_addresses(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+        module = tmp_path / "modules" / "vpc"
+
+        addresses = changed_addresses(
+            source,
+            {module / "main.tf": {2}, module / "variables.tf": {1}},
+        )
+
+        assert addresses == ["module.vpc", "module.vpc.aws_vpc.main"]
+
+    def test_ignores_files_outside_the_configuration(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+
+        addresses = changed_addresses(source, {tmp_path / "README.md": {1}})
+
+        assert addresses == []
+
+    def test_requires_full_plan_for_changes_outside_blocks(
+        self, tmp_path: Path
+    ):
+        source = source_tree(tmp_path)
+
+        assert changed_addresses(source, {source / "main.tf": {2}}) is None
+        assert (
+            changed_addresses(source, {source / "terraform.tfvars": {1}})
+            is None
+        )
+
+
+class TestTargetSelector:
+    def test_selects_minimal_targets_with_dependencies(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+        terraform = Mock(spec=Terraform)
+        terraform.load_graph.return_value = GRAPH
+
+        selection = TargetSelector(graph_index(tmp_path)).select(
+            terraform, str(source), {source / "main.tf": {6, 12}}
+        )
+
+        assert selection is not None
+        assert selection.changed == [
+            "aws_instance.web",
+            "aws_security_group.web",
+        ]
+        assert selection.targets == ["aws_instance.web"]
+        assert selection.closure == [
+            "aws_instance.web",
+            "aws_security_group.web",
+            "module.vpc",
+            "module.vpc.aws_vpc.main",
+        ]
+
+    def test_reuses_cached_graph_until_sources_change(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+        terraform = Mock(spec=Terraform)
+        terraform.load_graph.return_value = GRAPH
+        index = graph_index(tmp_path)
+
+        index.graph(terraform, str(source))
+        cached = graph_index(tmp_path).graph(terraform, str(source))
+
+        assert cached == GRAPH
+        terraform.load_graph.assert_called_once()
+
+        write(tmp_path / "modules" / "vpc" / "outputs.tf", 'output "id" {}\n')
+        index.graph(terraform, str(source))
+
+        assert terraform.load_graph.call_count == 2
+
+
+class TestTargetedPlanTask:
+    def task(self, terraform: Mock, source: Path) -> Task[BodyCallable[Any]]:
+        def configure(_context, _arguments, configuration: Configuration):
+            configuration.source_directory = str(source)
+
+        collection = (
+            TerraformTaskCollection(
+                task_factory=TerraformTaskFactory(
+                    terraform_factory=MockTerraformFactory(terraform)
+                )
+            )
+            .for_configuration("web")
+            .with_global_configure_function(configure)
+            .with_targeted_plan_task(base_ref="origin/release")
+            .create()
+        )
+        return cast(Task[BodyCallable[Any]], collection.tasks["plan-targeted"])
+
+    @pytest.fixture(autouse=True)
+    def cache_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("INVOKE_TERRAFORM_CACHE_DIR", str(tmp_path / "c"))
+
+    def test_plans_selected_targets_with_warning(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        source = source_tree(tmp_path)
+        terraform = Mock(spec=Terraform)
+        terraform.load_graph.return_value = GRAPH
+        changed_lines = Mock(return_value={source / "main.tf": {12}})
+        monkeypatch.setattr(factory, "changed_lines", changed_lines)
+
+        self.task(terraform, source)(MockContext())
+
+        assert changed_lines.call_args.args[1] == "origin/release"
+        assert terraform.plan.call_args.kwargs["targets"] == [
+            "aws_instance.web"
+        ]
+        assert "Warning: fast path" in capsys.readouterr().err
+
+    def test_falls_back_to_full_plan_when_changes_are_unmapped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        source = source_tree(tmp_path)
+        terraform = Mock(spec=Terraform)
+        monkeypatch.setattr(
+            factory,
+            "changed_lines",
+            Mock(return_value={source / "main.tf": {2}}),
+        )
+
+        self.task(terraform, source)(MockContext())
+
+        assert "targets" not in terraform.plan.call_args.kwargs
+        terraform.load_graph.assert_not_called()
+
+    def test_skips_plan_when_nothing_is_touched(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        source = source_tree(tmp_path)
+        terraform = Mock(spec=Terraform)
+        monkeypatch.setattr(factory, "changed_lines", Mock(return_value={}))
+
+        self.task(terraform, source)(MockContext())
+
+        terraform.plan.assert_not_called()
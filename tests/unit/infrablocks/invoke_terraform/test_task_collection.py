@@ -1,5 +1,6 @@
+from pathlib import Path
 from typing import Any, cast
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
 
 import pytest
 from invoke.context import MockContext
@@ -11,9 +12,11 @@ from infrablocks.invoke_terraform import (
     TerraformTaskFactory,
     parameter,
 )
+from infrablocks.invoke_terraform.cache import JSONFileCache
 from infrablocks.invoke_terraform.terraform import (
     Terraform,
 )
+from infrablocks.invoke_terraform.validation import ValidationCache
 from tests.unit.infrablocks.invoke_terraform.test_support import (
     MockTerraformFactory,
 )
@@ -194,6 +197,40 @@ class TestTaskCollection:
             environment={"EXTRA_ENV_VAR": "value"},
         )
 
+    def test_allows_validate_configure_function_to_disable_backend(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform),
+            validation_cache=ValidationCache(
+                cache=JSONFileCache(tmp_path / "validations.json")
+            ),
+        )
+
+        def global_configure(context, arguments, configuration):
+            configuration.source_directory = str(tmp_path)
+            configuration.environment = {}
+            configuration.init.backend_config = {"bucket": "state"}
+
+        def validate_configure(context, arguments, configuration):
+            configuration.backend = False
+
+        collection = (
+            TerraformTaskCollection(task_factory=task_factory)
+            .for_configuration("collection")
+            .with_global_configure_function(global_configure)
+            .with_extra_task_configure_function("validate", validate_configure)
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection.tasks["validate"])
+
+        task(MockContext())
+
+        terraform.init.assert_called_once_with(
+            chdir=str(tmp_path), environment=ANY, backend=False
+        )
+
     @pytest.mark.parametrize(
         "task_name", ["validate", "plan", "apply", "destroy", "output"]
     )
@@ -234,3 +271,191 @@ class TestTaskCollection:
             reconfigure=True,
             environment={"EXTRA_ENV_VAR": "value"},
         )
+
+
+class TestCompositeTaskCollection:
+    def test_does_not_create_composite_tasks_by_default(self):
+        collection = (
+            TerraformTaskCollection().for_configuration("collection").create()
+        )
+
+        assert "plan-apply" not in collection.tasks
+
+    @pytest.mark.parametrize(
+        "task_name", ["validate-plan", "plan-apply", "apply-output"]
+    )
+    def test_creates_composite_tasks_when_requested(self, task_name: str):
+        collection = (
+            TerraformTaskCollection()
+            .for_configuration("collection")
+            .with_composite_tasks()
+            .create()
+        )
+
+        assert collection.tasks[task_name] is not None
+
+    def test_combines_parameters_of_component_tasks(self):
+        collection = (
+            TerraformTaskCollection()
+            .for_configuration("collection")
+            .with_composite_tasks()
+            .with_global_parameters(
+                parameter(name="foo", help="Foo parameter", default=10),
+            )
+            .with_extra_task_parameters(
+                "plan",
+                parameter(name="bar", help="Bar parameter", default="twenty"),
+            )
+            .with_extra_task_parameters(
+                "apply",
+                parameter(name="bar", help="Bar parameter", default="twenty"),
+                parameter(name="baz", help="Baz parameter", default=True),
+            )
+            .create()
+        )
+
+        task_parameters = get_parameters(collection.tasks["plan-apply"])
+
+        assert task_parameters == [
+            {"name": "foo", "default": 10, "help": "Foo parameter"},
+            {"name": "bar", "default": "twenty", "help": "Bar parameter"},
+            {"name": "baz", "default": True, "help": "Baz parameter"},
+        ]
+
+    def test_runs_configure_functions_of_component_tasks_in_order(self):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def global_configure(context, arguments, configuration):
+            configuration.source_directory = "/some/path"
+
+        def plan_configure(context, arguments, configuration):
+            configuration.variables = {"stage": "plan"}
+            configuration.environment = {"PLAN": "1"}
+
+        def apply_configure(context, arguments, configuration):
+            configuration.environment = {
+                **configuration.environment,
+                "APPLY": "1",
+            }
+
+        collection = (
+            TerraformTaskCollection(task_factory=task_factory)
+            .for_configuration("collection")
+            .with_composite_tasks()
+            .with_global_configure_function(global_configure)
+            .with_extra_task_configure_function("plan", plan_configure)
+            .with_extra_task_configure_function("apply", apply_configure)
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection.tasks["plan-apply"])
+
+        task(MockContext())
+
+        terraform.init.assert_called_once_with(
+            chdir="/some/path",
+            backend_config={},
+            reconfigure=False,
+            environment={"PLAN": "1", "APPLY": "1"},
+        )
+        assert terraform.plan.call_args.kwargs["vars"] == {"stage": "plan"}
+
+
+class TestLazyTaskCollection:
+    @pytest.mark.parametrize(
+        "task_name", ["validate", "plan", "apply", "destroy", "output"]
+    )
+    def test_does_not_build_tasks_on_create(self, task_name: str):
+        task_factory = Mock(wraps=TerraformTaskFactory())
+
+        collection = (
+            TerraformTaskCollection(task_factory=task_factory)
+            .for_configuration("collection")
+            .with_lazy_tasks()
+            .create()
+        )
+
+        assert collection.tasks[task_name] is not None
+        getattr(task_factory, f"create_{task_name}_task").assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("task_name", "description"),
+        [
+            ("validate", "Validate the collection Terraform configuration."),
+            ("plan", "Plan the collection Terraform configuration."),
+            ("apply", "Apply the collection Terraform configuration."),
+            ("destroy", "Destroy the collection Terraform configuration."),
+            ("output", "Output from the collection Terraform configuration."),
+        ],
+    )
+    def test_precomputes_names_and_descriptions(
+        self, task_name: str, description: str
+    ):
+        collection = (
+            TerraformTaskCollection()
+            .for_configuration("collection")
+            .with_lazy_tasks()
+            .create()
+        )
+
+        task = cast(Task[BodyCallable[Any]], collection.tasks[task_name])
+
+        assert task.name == task_name
+        assert task.__doc__ == description
+
+    @pytest.mark.parametrize(
+        "task_name", ["validate", "plan", "apply", "destroy", "output"]
+    )
+    def test_defines_parameters_on_lazy_task(self, task_name: str):
+        collection = (
+            TerraformTaskCollection()
+            .for_configuration("collection")
+            .with_lazy_tasks()
+            .with_global_parameters(
+                parameter(name="foo", help="Foo parameter", default=10),
+            )
+            .with_extra_task_parameters(
+                task_name,
+                parameter(name="baz", help="Baz parameter", default=True),
+            )
+            .create()
+        )
+
+        task_parameters = get_parameters(collection.tasks[task_name])
+
+        assert task_parameters == [
+            {"name": "foo", "default": 10, "help": "Foo parameter"},
+            {"name": "baz", "default": True, "help": "Baz parameter"},
+        ]
+
+    @pytest.mark.parametrize(
+        "task_name", ["validate", "plan", "apply", "destroy", "output"]
+    )
+    def test_builds_task_once_on_first_execution(self, task_name: str):
+        terraform = Mock(spec=Terraform)
+        task_factory = Mock(
+            wraps=TerraformTaskFactory(
+                terraform_factory=MockTerraformFactory(terraform)
+            )
+        )
+
+        def configure(context, arguments, configuration):
+            configuration.source_directory = "/some/path"
+
+        collection = (
+            TerraformTaskCollection(task_factory=task_factory)
+            .for_configuration("collection")
+            .with_lazy_tasks()
+            .with_global_configure_function(configure)
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection.tasks[task_name])
+
+        task(MockContext())
+        task(MockContext())
+
+        getattr(task_factory, f"create_{task_name}_task").assert_called_once()
+        assert terraform.init.call_count == 2
+        assert task.times_called == 2
@@ -0,0 +1,151 @@
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import MockContext
+from invoke.runners import Result
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    ModuleDependencyIndex,
+    TerraformTaskCollection,
+    TerraformTaskCollectionGroup,
+    TerraformTaskFactory,
+    parameter,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.terraform import Terraform
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def build_group(
+    terraform: Mock, directories: dict[str, Path], cache_path: Path
+) -> TerraformTaskCollectionGroup:
+    task_factory = TerraformTaskFactory(
+        terraform_factory=MockTerraformFactory(terraform)
+    )
+    group = (
+        TerraformTaskCollectionGroup()
+        .for_group("all")
+        .with_dependency_index(
+            ModuleDependencyIndex(JSONFileCache(cache_path))
+        )
+    )
+    for name, directory in directories.items():
+
+        def configure(context, arguments, configuration, directory=directory):
+            configuration.source_directory = str(directory)
+
+        group = group.with_configuration(
+            TerraformTaskCollection(task_factory=task_factory)
+            .for_configuration(name)
+            .with_global_configure_function(configure),
+            str(directory),
+        )
+    return group
+
+
+class TestTaskCollectionGroup:
+    def test_includes_member_collections(self, tmp_path: Path):
+        collection = build_group(
+            Mock(spec=Terraform),
+            {"app": tmp_path / "app", "database": tmp_path / "database"},
+            tmp_path / "cache.json",
+        ).create()
+
+        assert collection.name == "all"
+        assert set(collection.collections.keys()) == {"app", "database"}
+        assert "app.plan" in collection
+
+    @pytest.mark.parametrize("task_name", ["plan", "apply"])
+    def test_runs_task_for_every_configuration_by_default(
+        self, tmp_path: Path, task_name: str
+    ):
+        terraform = Mock(spec=Terraform)
+        collection = build_group(
+            terraform,
+            {"app": tmp_path / "app", "database": tmp_path / "database"},
+            tmp_path / "cache.json",
+        ).create()
+        task = cast(Task[BodyCallable[Any]], collection.tasks[task_name])
+
+        task(MockContext())
+
+        assert [
+            call.kwargs["chdir"]
+            for call in getattr(terraform, task_name).call_args_list
+        ] == [str(tmp_path / "app"), str(tmp_path / "database")]
+
+    def test_runs_only_affected_configurations_when_base_ref_given(
+        self, tmp_path: Path
+    ):
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "main.tf").write_text(
+            'module "network" {\n  source = "../modules/network"\n}\n'
+        )
+        (tmp_path / "database").mkdir()
+        terraform = Mock(spec=Terraform)
+        collection = build_group(
+            terraform,
+            {"app": tmp_path / "app", "database": tmp_path / "database"},
+            tmp_path / "cache.json",
+        ).create()
+        task = cast(Task[BodyCallable[Any]], collection.tasks["plan"])
+        context = MockContext(
+            run={
+                "git rev-parse --show-toplevel": Result(f"{tmp_path}\n"),
+                "git merge-base origin/main HEAD": Result("abc123\n"),
+                "git diff --name-only abc123": Result(
+                    "modules/network/variables.tf\n"
+                ),
+            }
+        )
+
+        task(context, affected_since="origin/main")
+
+        terraform.plan.assert_called_once_with(
+            chdir=str(tmp_path / "app"), vars={}, environment={}
+        )
+
+    def test_raises_when_group_name_not_set(self):
+        with pytest.raises(ValueError):
+            TerraformTaskCollectionGroup().create()
+
+    def test_passes_parameter_defaults_to_lazy_member_tasks(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def configure(context, arguments, configuration):
+            configuration.source_directory = "/some/path"
+            configuration.workspace = arguments["workspace"]
+
+        collection = (
+            TerraformTaskCollectionGroup()
+            .for_group("all")
+            .with_configuration(
+                TerraformTaskCollection(task_factory=task_factory)
+                .for_configuration("app")
+                .with_lazy_tasks()
+                .with_global_parameters(
+                    parameter(name="workspace", default="default")
+                )
+                .with_global_configure_function(configure),
+                "/some/path",
+            )
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection.tasks["plan"])
+
+        task(MockContext())
+
+        terraform.select_workspace.assert_called_once_with(
+            "default", chdir="/some/path", or_create=True, environment={}
+        )
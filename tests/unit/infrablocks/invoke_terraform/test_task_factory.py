@@ -1,16 +1,24 @@
+import json
 from io import StringIO
-from typing import Any
-from unittest.mock import Mock
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import ANY, Mock
 
+import pytest
 from invoke.context import Context
 from invoke.tasks import Task
 
 from infrablocks.invoke_terraform import (
     Configuration,
+    PlanFingerprintStore,
     TerraformTaskFactory,
 )
 from infrablocks.invoke_terraform.terraform import (
     BackendConfig,
+    DestroyGuard,
+    PlanReport,
+    PlanTable,
+    Policy,
     Result,
     Terraform,
     Variables,
@@ -34,6 +42,25 @@ def get_parameters(task: Task | None) -> list[dict[str, Any]]:
     ]
 
 
+def plan_table(*actions: list[str]) -> PlanTable:
+    return PlanTable.load(
+        StringIO(
+            json.dumps(
+                {
+                    "resource_changes": [
+                        {
+                            "address": f"aws_vpc.vpc{index}",
+                            "type": "aws_vpc",
+                            "change": {"actions": change_actions},
+                        }
+                        for index, change_actions in enumerate(actions)
+                    ]
+                }
+            )
+        )
+    )
+
+
 class TestTaskFactory:
     def test_plan_includes_configuration_name_in_docstring(self):
         terraform = Mock(spec=Terraform)
@@ -173,6 +200,36 @@ class TestTaskFactory:
             chdir=source_directory, vars={}, environment=environment
         )
 
+    def test_plan_renders_condensed_plan_when_configured(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        terraform = Mock(spec=Terraform)
+        terraform.stream_plan.return_value = iter(
+            ['{"type": "change_summary", "changes": {"add": 1}}\n']
+        )
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        details_path = tmp_path / "details.jsonl.gz"
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.plan_output = "condensed"
+            configuration.plan_details_path = str(details_path)
+
+        plan = task_factory.create_plan_task("database", configure, [])
+
+        plan(Context())
+
+        terraform.plan.assert_not_called()
+        terraform.stream_plan.assert_called_once_with(
+            chdir="/some/path", vars={}, environment={}, out=None
+        )
+        assert "Plan: 1 to add, 0 to change, 0 to destroy." in (
+            capsys.readouterr().out
+        )
+        assert details_path.exists()
+
     def test_apply_includes_configuration_name_in_docstring(self):
         terraform = Mock(spec=Terraform)
         task_factory = TerraformTaskFactory(
@@ -284,6 +341,196 @@ class TestTaskFactory:
             environment=environment,
         )
 
+    def test_apply_applies_saved_plan_when_policy_passes(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["create"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        source_directory = "/some/path"
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = source_directory
+            configuration.policy = Policy([DestroyGuard()])
+
+        apply = task_factory.create_apply_task("loadbalancer", configure, [])
+
+        result = cast(PlanReport | None, apply(Context()))
+
+        assert result is not None and result.applied
+        assert result.policy is not None and result.policy.passed
+        plan_file = terraform.plan.call_args.kwargs["out"]
+        terraform.load_plan.assert_called_once_with(
+            plan_file, chdir=source_directory, environment={}
+        )
+        terraform.apply.assert_called_once_with(
+            chdir=source_directory,
+            autoapprove=True,
+            environment={},
+            plan_file=plan_file,
+        )
+
+    @pytest.mark.parametrize("answer", ["no", EOFError()])
+    def test_apply_does_not_apply_saved_plan_without_approval(
+        self, answer: str | EOFError, monkeypatch: pytest.MonkeyPatch
+    ):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["create"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        monkeypatch.setattr("builtins.input", Mock(side_effect=[answer]))
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.policy = Policy([DestroyGuard()])
+            configuration.auto_approve = False
+
+        apply = task_factory.create_apply_task("loadbalancer", configure, [])
+
+        with pytest.raises(ValueError, match="loadbalancer was cancelled"):
+            apply(Context())
+
+        terraform.apply.assert_not_called()
+
+    def test_apply_applies_saved_plan_once_approved(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["create"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        monkeypatch.setattr("builtins.input", Mock(return_value="yes"))
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.policy = Policy([DestroyGuard()])
+            configuration.auto_approve = False
+
+        apply = task_factory.create_apply_task("loadbalancer", configure, [])
+
+        result = cast(PlanReport | None, apply(Context()))
+
+        assert result is not None and result.applied
+        terraform.apply.assert_called_once()
+
+    def test_apply_does_not_apply_when_policy_is_violated(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["delete", "create"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.policy = Policy([DestroyGuard()])
+
+        apply = task_factory.create_apply_task("loadbalancer", configure, [])
+
+        with pytest.raises(ValueError, match="destroy-guard: aws_vpc.vpc0"):
+            apply(Context())
+
+        terraform.apply.assert_not_called()
+
+    def test_plan_warns_about_violations_when_not_enforced(
+        self, capsys: pytest.CaptureFixture[str]
+    ):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["delete"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.policy = Policy([DestroyGuard()], enforce=False)
+
+        plan = task_factory.create_plan_task("loadbalancer", configure, [])
+
+        plan(Context())
+
+        assert capsys.readouterr().err == (
+            "Warning: plan violates advisory policy:\n"
+            "  destroy-guard: aws_vpc.vpc0: action 'delete' is forbidden.\n"
+        )
+
+    def test_plan_returns_policy_result_when_not_enforced(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["delete"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.policy = Policy([DestroyGuard()], enforce=False)
+
+        plan = task_factory.create_plan_task("loadbalancer", configure, [])
+
+        result = cast(PlanReport | None, plan(Context()))
+
+        terraform.plan.assert_called_once_with(
+            chdir="/some/path", vars={}, environment={}, out=ANY
+        )
+        assert result is not None and result.policy is not None
+        assert [
+            violation.address for violation in result.policy.violations
+        ] == ["aws_vpc.vpc0"]
+
+    def test_apply_skips_plan_matching_approved_plan(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["create"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        store = PlanFingerprintStore(tmp_path)
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.plan_store = store
+            configuration.unchanged_plan = "skip"
+
+        apply = task_factory.create_apply_task("loadbalancer", configure, [])
+
+        first = cast(PlanReport | None, apply(Context()))
+        second = cast(PlanReport | None, apply(Context()))
+
+        assert first is not None and first.applied
+        assert second is not None and not second.applied
+        assert second.diff is not None and second.diff.is_empty
+        assert terraform.apply.call_count == 1
+
+    def test_plan_reports_diff_against_approved_plan(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        store = PlanFingerprintStore(tmp_path)
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.plan_store = store
+
+        terraform.load_plan.return_value = plan_table(["create"])
+        task_factory.create_apply_task("loadbalancer", configure, [])(
+            Context()
+        )
+        terraform.load_plan.return_value = plan_table(["create"], ["delete"])
+        plan = task_factory.create_plan_task("loadbalancer", configure, [])
+
+        report = cast(PlanReport | None, plan(Context()))
+
+        assert report is not None and report.diff is not None
+        assert report.diff.added == {"aws_vpc.vpc1": "delete"}
+        assert not report.applied
+        assert capsys.readouterr().err == (
+            "Plan differs from the previously approved plan:\n"
+            "  + aws_vpc.vpc1: delete\n"
+        )
+
     def test_destroy_includes_configuration_name_in_docstring(self):
         terraform = Mock(spec=Terraform)
         task_factory = TerraformTaskFactory(
@@ -684,3 +931,136 @@ class TestTaskFactory:
         output_value = output(Context())
 
         assert output_value == "output_value"
+
+    def test_validate_plan_initialises_once_and_selects_workspace_once(self):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        source_directory = "/some/path"
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = source_directory
+            configuration.workspace = "staging"
+            configuration.variables = {"foo": 1}
+
+        validate_plan = task_factory.create_validate_plan_task(
+            "loadbalancer", configure, []
+        )
+
+        validate_plan(Context())
+
+        terraform.init.assert_called_once()
+        terraform.select_workspace.assert_called_once()
+        terraform.validate.assert_called_once_with(
+            chdir=source_directory, json=False, environment={}
+        )
+        terraform.plan.assert_called_once_with(
+            chdir=source_directory, vars={"foo": 1}, environment={}
+        )
+
+    def test_plan_apply_applies_the_saved_plan(self):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        source_directory = "/some/path"
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = source_directory
+            configuration.variables = {"foo": 1}
+
+        plan_apply = task_factory.create_plan_apply_task(
+            "loadbalancer", configure, []
+        )
+
+        plan_apply(Context())
+
+        terraform.init.assert_called_once()
+        plan_file = terraform.plan.call_args.kwargs["out"]
+        terraform.plan.assert_called_once_with(
+            chdir=source_directory,
+            vars={"foo": 1},
+            environment={},
+            out=plan_file,
+        )
+        terraform.apply.assert_called_once_with(
+            chdir=source_directory,
+            autoapprove=True,
+            environment={},
+            plan_file=plan_file,
+        )
+
+    def test_plan_apply_does_not_apply_without_approval(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        terraform = Mock(spec=Terraform)
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+        monkeypatch.setattr("builtins.input", Mock(side_effect=EOFError))
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.auto_approve = False
+
+        plan_apply = task_factory.create_plan_apply_task(
+            "loadbalancer", configure, []
+        )
+
+        with pytest.raises(ValueError, match="loadbalancer was cancelled"):
+            plan_apply(Context())
+
+        terraform.plan.assert_called_once()
+        terraform.apply.assert_not_called()
+
+    def test_plan_apply_plans_once_when_policy_configured(self):
+        terraform = Mock(spec=Terraform)
+        terraform.load_plan.return_value = plan_table(["create"])
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.policy = Policy([DestroyGuard()])
+
+        plan_apply = task_factory.create_plan_apply_task(
+            "loadbalancer", configure, []
+        )
+
+        result = cast(PlanReport | None, plan_apply(Context()))
+
+        assert result is not None and result.applied
+        terraform.plan.assert_called_once()
+        terraform.load_plan.assert_called_once()
+        assert (
+            terraform.apply.call_args.kwargs["plan_file"]
+            == (terraform.plan.call_args.kwargs["out"])
+        )
+
+    def test_apply_output_returns_output_after_apply(self):
+        terraform = Mock(spec=Terraform)
+        terraform.output.return_value = Result(
+            stdout=StringIO("output_value\n"), stderr=None
+        )
+        task_factory = TerraformTaskFactory(
+            terraform_factory=MockTerraformFactory(terraform)
+        )
+
+        def configure(_context, _, configuration: Configuration):
+            configuration.source_directory = "/some/path"
+            configuration.output.capture_stdout = True
+
+        apply_output = task_factory.create_apply_output_task(
+            "loadbalancer", configure, []
+        )
+
+        output_value = apply_output(Context())
+
+        assert output_value == "output_value"
+        terraform.init.assert_called_once()
+        terraform.apply.assert_called_once()
+        assert apply_output.__doc__ == (
+            "Apply and output from the loadbalancer Terraform configuration."
+        )
@@ -0,0 +1,145 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import Context
+
+from infrablocks.invoke_terraform import (
+    Configuration,
+    ModuleDependencyIndex,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.terraform import Terraform
+from infrablocks.invoke_terraform.validation import ValidationCache
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def validation_cache(root: Path) -> ValidationCache:
+    return ValidationCache(
+        cache=JSONFileCache(root / "cache" / "validations.json"),
+        dependency_index=ModuleDependencyIndex(
+            JSONFileCache(root / "cache" / "dependencies.json")
+        ),
+    )
+
+
+def source_tree(root: Path) -> Path:
+    source = root / "deployments" / "network"
+    write(
+        source / "main.tf",
+        'module "vpc" {\n  source = "../../modules/vpc"\n}\n',
+    )
+    write(
+        root / "modules" / "vpc" / "main.tf", 'resource "aws_vpc" "vpc" {}\n'
+    )
+    return source
+
+
+def offline_validate_task(
+    terraform: Mock, root: Path, source: Path, json: bool = False
+):
+    def configure(_context, _, configuration: Configuration):
+        configuration.source_directory = str(source)
+        configuration.validate.backend = False
+        configuration.validate.json = json
+        configuration.environment = {
+            "TF_PLUGIN_CACHE_DIR": str(root / "plugins")
+        }
+
+    return TerraformTaskFactory(
+        terraform_factory=MockTerraformFactory(terraform),
+        validation_cache=validation_cache(root),
+    ).create_validate_task("network", configure, [])
+
+
+class TestValidationCache:
+    def test_digest_changes_when_local_module_changes(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+        cache = validation_cache(tmp_path)
+        before = cache.source_digest(str(source))
+
+        write(
+            tmp_path / "modules" / "vpc" / "main.tf",
+            'resource "aws_vpc" "main" {}\n',
+        )
+
+        assert cache.source_digest(str(source)) != before
+
+    def test_digest_ignores_unrelated_files(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+        cache = validation_cache(tmp_path)
+        before = cache.source_digest(str(source))
+
+        write(source / "README.md", "notes")
+
+        assert cache.source_digest(str(source)) == before
+
+
+class TestOfflineValidate:
+    def test_initialises_without_backend_in_isolated_data_directory(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+
+        offline_validate_task(terraform, tmp_path, source)(Context())
+
+        environment = {
+            "TF_PLUGIN_CACHE_DIR": str(tmp_path / "plugins"),
+            "TF_DATA_DIR": str(source.resolve() / ".terraform" / "validate"),
+        }
+        terraform.init.assert_called_once_with(
+            chdir=str(source), environment=environment, backend=False
+        )
+        terraform.validate.assert_called_once_with(
+            chdir=str(source), json=False, environment=environment
+        )
+        terraform.select_workspace.assert_not_called()
+
+    def test_skips_unchanged_configuration(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+
+        offline_validate_task(terraform, tmp_path, source)(Context())
+        offline_validate_task(terraform, tmp_path, source)(Context())
+
+        terraform.validate.assert_called_once()
+
+    def test_revalidates_after_source_change(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+
+        offline_validate_task(terraform, tmp_path, source)(Context())
+        write(source / "variables.tf", 'variable "region" {}\n')
+        offline_validate_task(terraform, tmp_path, source)(Context())
+
+        assert terraform.validate.call_count == 2
+
+    def test_does_not_record_failed_validation(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.validate.side_effect = [RuntimeError("invalid"), None]
+        source = source_tree(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            offline_validate_task(terraform, tmp_path, source)(Context())
+        offline_validate_task(terraform, tmp_path, source)(Context())
+
+        assert terraform.validate.call_count == 2
+
+    def test_always_runs_when_json_requested(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+
+        offline_validate_task(terraform, tmp_path, source, True)(Context())
+        offline_validate_task(terraform, tmp_path, source, True)(Context())
+
+        assert terraform.validate.call_count == 2
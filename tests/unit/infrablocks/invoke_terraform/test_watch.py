@@ -0,0 +1,229 @@
+import io
+import os
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import MockContext
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    ModuleDependencyIndex,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.cache import JSONFileCache
+from infrablocks.invoke_terraform.terraform import Terraform
+from infrablocks.invoke_terraform.watch import SourceWatcher, WatchSession
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def source_tree(root: Path) -> Path:
+    source = root / "deployments" / "network"
+    write(
+        source / "main.tf",
+        'module "vpc" {\n  source = "../../modules/vpc"\n}\n',
+    )
+    write(
+        root / "modules" / "vpc" / "main.tf", 'resource "aws_vpc" "vpc" {}\n'
+    )
+    return source
+
+
+def watcher(
+    root: Path, source: Path, requests: Any = None, notify: bool = True
+) -> SourceWatcher:
+    return SourceWatcher(
+        str(source),
+        dependency_index=ModuleDependencyIndex(
+            JSONFileCache(root / "cache" / "dependencies.json")
+        ),
+        interval=0.01,
+        debounce=0.01,
+        requests=requests,
+        notify=notify,
+    )
+
+
+def configuration(root: Path, source: Path) -> Configuration:
+    configuration = Configuration.create_empty()
+    configuration.source_directory = str(source)
+    configuration.variables = {"region": "eu-west-1"}
+    configuration.environment = {"TF_PLUGIN_CACHE_DIR": str(root / "plugins")}
+    return configuration
+
+
+class TestSourceWatcher:
+    @pytest.mark.parametrize("notify", [True, False])
+    def test_reports_changes_to_local_modules(
+        self, tmp_path: Path, notify: bool
+    ):
+        source = source_tree(tmp_path)
+        watch = watcher(tmp_path, source, notify=notify)
+
+        write(
+            tmp_path / "modules" / "vpc" / "variables.tf",
+            'variable "cidr" {}\n',
+        )
+
+        assert watch.wait() == "change"
+        watch.close()
+
+    def test_reads_plan_and_quit_requests(self, tmp_path: Path):
+        source = source_tree(tmp_path)
+        reader, writer = os.pipe()
+        with os.fdopen(reader) as requests, os.fdopen(writer, "w") as input:
+            watch = watcher(tmp_path, source, requests)
+            input.write("\nplan\nq\n")
+            input.flush()
+
+            assert watch.wait() == "plan"
+            assert watch.wait() == "plan"
+            assert watch.wait() == "stop"
+            watch.close()
+
+
+class TestWatchSession:
+    def test_initialises_offline_once_across_checks(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+        session = WatchSession(
+            terraform,
+            configuration(tmp_path, source),
+            "network",
+            output=io.StringIO(),
+        )
+
+        assert session.check()
+        assert session.check()
+
+        terraform.init.assert_called_once()
+        assert terraform.init.call_args.kwargs["backend"] is False
+        terraform.fmt.assert_called_with(
+            chdir=str(source), check=True, recursive=True
+        )
+        assert terraform.validate.call_count == 2
+
+    def test_reinitialises_when_validate_fails(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.validate.side_effect = [None, RuntimeError("module"), None]
+        source = source_tree(tmp_path)
+        session = WatchSession(
+            terraform,
+            configuration(tmp_path, source),
+            "network",
+            output=io.StringIO(),
+        )
+
+        session.check()
+
+        assert session.check()
+        assert terraform.init.call_count == 2
+
+    def test_reports_failures_and_continues(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.fmt.side_effect = RuntimeError("unformatted")
+        source = source_tree(tmp_path)
+        output = io.StringIO()
+        session = WatchSession(
+            terraform, configuration(tmp_path, source), "network", output
+        )
+
+        assert not session.check()
+        assert "network: fmt failed." in output.getvalue()
+        terraform.validate.assert_not_called()
+
+    def test_plans_without_refresh_reusing_backend_init(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+        session = WatchSession(
+            terraform,
+            configuration(tmp_path, source),
+            "network",
+            output=io.StringIO(),
+        )
+
+        session.plan()
+        session.plan()
+
+        terraform.init.assert_called_once_with(
+            chdir=str(source),
+            backend_config={},
+            reconfigure=False,
+            environment={"TF_PLUGIN_CACHE_DIR": str(tmp_path / "plugins")},
+        )
+        terraform.plan.assert_called_with(
+            chdir=str(source),
+            vars={"region": "eu-west-1"},
+            environment={"TF_PLUGIN_CACHE_DIR": str(tmp_path / "plugins")},
+            refresh=False,
+        )
+
+    def test_runs_until_stopped(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+        watch = Mock(spec=SourceWatcher)
+        watch.wait.side_effect = ["change", "plan", "stop"]
+
+        WatchSession(
+            terraform,
+            configuration(tmp_path, source),
+            "network",
+            output=io.StringIO(),
+        ).run(watch)
+
+        assert terraform.validate.call_count == 2
+        terraform.plan.assert_called_once()
+
+
+class TestWatchTask:
+    def test_is_not_created_by_default(self):
+        collection = (
+            TerraformTaskCollection().for_configuration("network").create()
+        )
+
+        assert "watch" not in collection.tasks
+
+    def test_watches_configured_source_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        terraform = Mock(spec=Terraform)
+        source = source_tree(tmp_path)
+        monkeypatch.setattr(
+            SourceWatcher, "wait", Mock(side_effect=KeyboardInterrupt)
+        )
+
+        def configure(_context, _arguments, configuration: Configuration):
+            configuration.source_directory = str(source)
+            configuration.environment = {
+                "TF_PLUGIN_CACHE_DIR": str(tmp_path / "plugins")
+            }
+
+        collection = (
+            TerraformTaskCollection(
+                task_factory=TerraformTaskFactory(
+                    terraform_factory=MockTerraformFactory(terraform)
+                )
+            )
+            .for_configuration("network")
+            .with_global_configure_function(configure)
+            .with_watch_task(interval=0.01)
+            .create()
+        )
+
+        task = cast(Task[BodyCallable[Any]], collection.tasks["watch"])
+
+        task(MockContext())
+
+        terraform.validate.assert_called_once()
@@ -0,0 +1,140 @@
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+from invoke.context import Context
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    MatrixReport,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.terraform import Result, Terraform
+from infrablocks.invoke_terraform.workspaces import clone_data_directory
+from tests.unit.infrablocks.invoke_terraform.test_support import (
+    MockTerraformFactory,
+)
+
+
+def write(path: Path, contents: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents)
+    return path
+
+
+def initialised_data_directory(root: Path) -> Path:
+    data_directory = root / ".terraform"
+    write(data_directory / "providers" / "aws" / "terraform-provider", "bin")
+    write(data_directory / "modules" / "modules.json", "{}")
+    write(data_directory / "terraform.tfstate", '{"backend": {}}')
+    write(data_directory / "environment", "default")
+    return data_directory
+
+
+class TestCloneDataDirectory:
+    def test_hardlinks_providers_and_modules(self, tmp_path: Path):
+        source = initialised_data_directory(tmp_path)
+        target = tmp_path / "clone"
+
+        clone_data_directory(source, target)
+
+        provider = Path("providers") / "aws" / "terraform-provider"
+        assert (target / provider).stat().st_ino == (
+            (source / provider).stat().st_ino
+        )
+        assert (target / "modules" / "modules.json").read_text() == "{}"
+
+    def test_copies_backend_state_and_omits_workspace_file(
+        self, tmp_path: Path
+    ):
+        source = initialised_data_directory(tmp_path)
+        target = tmp_path / "clone"
+
+        clone_data_directory(source, target)
+        clone_data_directory(source, target)
+
+        assert (target / "terraform.tfstate").stat().st_ino != (
+            (source / "terraform.tfstate").stat().st_ino
+        )
+        assert (target / "terraform.tfstate").read_text() == (
+            '{"backend": {}}'
+        )
+        assert not (target / "environment").exists()
+
+
+class TestWorkspaceTasks:
+    def collection(
+        self, terraform: Mock, source_directory: Path
+    ) -> TerraformTaskCollection:
+        def configure(_context, _arguments, configuration: Configuration):
+            configuration.source_directory = str(source_directory)
+
+        return (
+            TerraformTaskCollection(
+                task_factory=TerraformTaskFactory(
+                    terraform_factory=MockTerraformFactory(terraform)
+                )
+            )
+            .for_configuration("tenants")
+            .with_global_configure_function(configure)
+            .with_workspaces(["tenant-a", "tenant-b"], maximum_workers=2)
+        )
+
+    def test_initialises_once_and_fans_out_over_workspaces(
+        self, tmp_path: Path
+    ):
+        terraform = Mock(spec=Terraform)
+        terraform.init.side_effect = lambda **_: initialised_data_directory(
+            tmp_path
+        )
+        collection = self.collection(terraform, tmp_path).create()
+        task = cast(Task[BodyCallable[Any]], collection["plan-workspaces"])
+
+        report = cast(MatrixReport, task(Context()))
+
+        assert [result.cell for result in report.succeeded] == [
+            "tenant-a",
+            "tenant-b",
+        ]
+        terraform.init.assert_called_once_with(
+            chdir=str(tmp_path),
+            backend_config={},
+            reconfigure=False,
+            environment={},
+        )
+        selections = sorted(
+            (call.args[0], call.kwargs["environment"]["TF_DATA_DIR"])
+            for call in terraform.select_workspace.call_args_list
+        )
+        assert selections == [
+            (
+                "tenant-a",
+                str((tmp_path / ".terraform/workspaces/tenant-a").resolve()),
+            ),
+            (
+                "tenant-b",
+                str((tmp_path / ".terraform/workspaces/tenant-b").resolve()),
+            ),
+        ]
+        assert terraform.plan.call_count == 2
+        assert (
+            tmp_path / ".terraform/workspaces/tenant-a/providers/aws"
+        ).is_dir()
+
+    def test_collects_outputs_per_workspace(self, tmp_path: Path):
+        terraform = Mock(spec=Terraform)
+        terraform.output.return_value = Result()
+        collection = self.collection(terraform, tmp_path).create()
+        initialised_data_directory(tmp_path)
+        task = cast(Task[BodyCallable[Any]], collection["output-workspaces"])
+
+        report = cast(MatrixReport, task(Context()))
+
+        assert len(report.results) == 2
+        assert terraform.output.call_count == 2
+        assert {"plan-workspaces", "apply-workspaces"} <= set(
+            collection.tasks.keys()
+        )
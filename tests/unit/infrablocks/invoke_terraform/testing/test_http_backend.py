@@ -0,0 +1,160 @@
+import json
+import urllib.error
+import urllib.request
+from collections.abc import Generator
+
+import pytest
+
+from infrablocks.invoke_terraform.testing import (
+    HTTPStateBackend,
+    HTTPStateClient,
+    StateLocked,
+)
+
+
+def request(
+    method: str, url: str, body: bytes | None = None
+) -> tuple[int, bytes]:
+    try:
+        with urllib.request.urlopen(
+            urllib.request.Request(url, data=body, method=method)
+        ) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        with error:
+            return error.code, error.read()
+
+
+@pytest.fixture
+def backend() -> Generator[HTTPStateBackend]:
+    with HTTPStateBackend(seed=1) as backend:
+        yield backend
+
+
+class TestHTTPStateBackend:
+    def test_reports_no_content_before_state_is_written(
+        self, backend: HTTPStateBackend
+    ):
+        config = backend.backend_config("web")
+
+        assert request("GET", config["address"]) == (204, b"")
+
+    def test_stores_and_returns_state(self, backend: HTTPStateBackend):
+        config = backend.backend_config("web")
+        state = json.dumps({"serial": 3, "lineage": "abc"}).encode()
+
+        assert request("POST", config["address"], state)[0] == 200
+        assert request("GET", config["address"]) == (200, state)
+        assert backend.state("web") == {"serial": 3, "lineage": "abc"}
+        assert backend.state("other") is None
+
+    def test_refuses_second_lock_with_current_holder(
+        self, backend: HTTPStateBackend
+    ):
+        config = backend.backend_config("web")
+
+        first = request("LOCK", config["lock_address"], b'{"ID": "one"}')
+        second = request("LOCK", config["lock_address"], b'{"ID": "two"}')
+
+        assert first[0] == 200
+        assert second[0] == 423
+        assert json.loads(second[1])["ID"] == "one"
+        assert backend.metrics().lock_conflicts == 1
+
+    def test_rejects_writes_from_other_lock_holders(
+        self, backend: HTTPStateBackend
+    ):
+        config = backend.backend_config("web")
+        request("LOCK", config["lock_address"], b'{"ID": "one"}')
+
+        rejected = request("POST", f"{config['address']}?ID=two", b"{}")
+        accepted = request("POST", f"{config['address']}?ID=one", b"{}")
+
+        assert rejected[0] == 423
+        assert accepted[0] == 200
+
+    def test_unlocks_only_for_the_holder(self, backend: HTTPStateBackend):
+        config = backend.backend_config("web")
+        request("LOCK", config["lock_address"], b'{"ID": "one"}')
+
+        mismatched = request(
+            "UNLOCK", config["unlock_address"], b'{"ID": "x"}'
+        )
+        released = request(
+            "UNLOCK", config["unlock_address"], b'{"ID": "one"}'
+        )
+
+        assert mismatched[0] == 409
+        assert released[0] == 200
+        assert backend.lock_info("web") is None
+
+    def test_simulates_contention(self):
+        with HTTPStateBackend(contention=1.0) as backend:
+            config = backend.backend_config()
+
+            status, payload = request(
+                "LOCK", config["lock_address"], b'{"ID": "one"}'
+            )
+
+            assert status == 423
+            assert json.loads(payload)["ID"] == "simulated-contention"
+            assert backend.metrics().simulated_conflicts == 1
+
+    def test_counts_requests_by_method(self, backend: HTTPStateBackend):
+        config = backend.backend_config()
+        request("GET", config["address"])
+        request("POST", config["address"], b"{}")
+        request("GET", config["address"])
+
+        metrics = backend.metrics()
+
+        assert metrics.requests == {"GET": 2, "POST": 1}
+        assert metrics.total_requests == 3
+
+    def test_builds_terraform_backend_config(self, backend: HTTPStateBackend):
+        config = backend.backend_config("web")
+
+        assert config == {
+            "address": f"{backend.url}/state/web",
+            "lock_address": f"{backend.url}/lock/web",
+            "unlock_address": f"{backend.url}/lock/web",
+            "lock_method": "LOCK",
+            "unlock_method": "UNLOCK",
+        }
+
+    def test_requires_start_before_use(self):
+        with pytest.raises(ValueError):
+            HTTPStateBackend().url
+
+
+class TestHTTPStateClient:
+    def test_locks_writes_and_unlocks(self, backend: HTTPStateBackend):
+        client = HTTPStateClient(backend.backend_config("web"))
+
+        lock_id = client.lock()
+        client.push({"serial": 1}, lock_id=lock_id)
+        client.unlock(lock_id)
+
+        assert client.pull() == {"serial": 1}
+        assert backend.lock_info("web") is None
+
+    def test_retries_until_lock_is_available(self):
+        with HTTPStateBackend(contention=0.5, seed=3) as backend:
+            client = HTTPStateClient(backend.backend_config(), retry_wait=0)
+
+            client.unlock(client.lock())
+
+            assert client.retries == backend.metrics().simulated_conflicts
+
+    def test_gives_up_after_retry_limit(self, backend: HTTPStateBackend):
+        holder = HTTPStateClient(backend.backend_config())
+        waiter = HTTPStateClient(
+            backend.backend_config(), retry_max=2, retry_wait=0
+        )
+        holder.lock()
+
+        with pytest.raises(StateLocked) as error:
+            waiter.lock()
+
+        assert waiter.retries == 2
+        assert error.value.info["Operation"] == "OperationTypeApply"
@@ -0,0 +1,259 @@
+import io
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import Mock
+
+import pytest
+from invoke.context import Context
+from invoke.exceptions import UnexpectedExit
+from invoke.tasks import Task
+
+from infrablocks.invoke_factory import BodyCallable
+from infrablocks.invoke_terraform import (
+    Configuration,
+    TerraformTaskCollection,
+    TerraformTaskFactory,
+)
+from infrablocks.invoke_terraform.terraform import Executor, InvokeExecutor
+from infrablocks.invoke_terraform.testing import (
+    RecordingExecutor,
+    Replayer,
+    ReplayExecutor,
+    ReplayTerraformFactory,
+    Transcript,
+    TranscriptEntry,
+    install_fake_terraform,
+)
+
+TRANSCRIPT = Transcript(
+    [
+        TranscriptEntry(
+            argv=["terraform", "-chdir=web", "plan", "-var=name=a b"],
+            stdout="Plan: 1 to add.\n",
+            duration=0.5,
+        ),
+        TranscriptEntry(
+            argv=["terraform", "validate"],
+            stderr="Error: first\n",
+            exit_code=1,
+        ),
+        TranscriptEntry(argv=["terraform", "validate"], stdout="Success!\n"),
+    ]
+)
+
+
+class TestTranscript:
+    def test_round_trips_through_file(self, tmp_path: Path):
+        TRANSCRIPT.save(tmp_path / "runs" / "transcript.json")
+
+        loaded = Transcript.load(tmp_path / "runs" / "transcript.json")
+
+        assert loaded.entries == TRANSCRIPT.entries
+
+    def test_rejects_unknown_versions(self):
+        with pytest.raises(ValueError):
+            Transcript.from_dict({"version": 99, "entries": []})
+
+
+class TestReplayer:
+    def test_matches_commands_by_shell_argv(self):
+        replayer = Replayer(TRANSCRIPT, latency=0)
+
+        entry = replayer.replay(
+            ["terraform", "-chdir=web", "plan", "-var='name=a b'"]
+        )
+
+        assert entry.stdout == "Plan: 1 to add.\n"
+
+    def test_replays_repeated_commands_in_order(self):
+        replayer = Replayer(TRANSCRIPT, latency=0)
+
+        outputs = [
+            replayer.replay(["terraform", "validate"]).exit_code
+            for _ in range(3)
+        ]
+
+        assert outputs == [1, 0, 0]
+
+    def test_shares_occurrences_through_cursor_file(self, tmp_path: Path):
+        cursor = tmp_path / "cursor"
+        first = Replayer(TRANSCRIPT, latency=0, cursor=cursor)
+        second = Replayer(TRANSCRIPT, latency=0, cursor=cursor)
+
+        first.replay(["terraform", "validate"])
+
+        assert second.replay(["terraform", "validate"]).exit_code == 0
+
+    def test_scales_recorded_durations(self):
+        replayer = Replayer(TRANSCRIPT, time_scale=0.1)
+        started = time.monotonic()
+
+        replayer.replay(["terraform", "-chdir=web", "plan", "-var='name=a b'"])
+
+        assert time.monotonic() - started >= 0.05
+
+    def test_rejects_unrecorded_commands(self):
+        with pytest.raises(ValueError, match="terraform apply"):
+            Replayer(TRANSCRIPT).replay(["terraform", "apply"])
+
+
+class TestReplayExecutor:
+    def test_writes_recorded_output_to_streams(self):
+        executor = ReplayExecutor(Replayer(TRANSCRIPT, latency=0))
+        stdout = io.StringIO()
+
+        exit_code = executor.execute(
+            ["terraform", "-chdir=web", "plan", "-var='name=a b'"],
+            stdout=stdout,
+        )
+
+        assert exit_code == 0
+        assert stdout.getvalue() == "Plan: 1 to add.\n"
+
+    def test_raises_for_unexpected_exit_codes(self):
+        executor = ReplayExecutor(Replayer(TRANSCRIPT, latency=0))
+
+        with pytest.raises(UnexpectedExit):
+            executor.execute(["terraform", "validate"], stderr=io.StringIO())
+
+    def test_returns_allowed_exit_codes(self):
+        executor = ReplayExecutor(Replayer(TRANSCRIPT, latency=0))
+
+        exit_code = executor.execute(
+            ["terraform", "validate"],
+            stderr=io.StringIO(),
+            exit_codes={0, 1},
+        )
+
+        assert exit_code == 1
+
+    def test_streams_recorded_lines(self):
+        executor = ReplayExecutor(Replayer(TRANSCRIPT, latency=0))
+
+        lines = list(
+            executor.stream(
+                ["terraform", "-chdir=web", "plan", "-var='name=a b'"]
+            )
+        )
+
+        assert lines == ["Plan: 1 to add.\n"]
+
+    def test_drives_tasks_without_terraform(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        monkeypatch.setenv("INVOKE_TERRAFORM_CACHE_DIR", str(tmp_path))
+        transcript = Transcript(
+            [
+                TranscriptEntry(argv=["terraform", "-chdir=web", "init"]),
+                TranscriptEntry(
+                    argv=["terraform", "-chdir=web", "validate"],
+                    stdout="Success!\n",
+                ),
+            ]
+        )
+
+        def configure(_context, _arguments, configuration: Configuration):
+            configuration.source_directory = "web"
+
+        collection = (
+            TerraformTaskCollection(
+                task_factory=TerraformTaskFactory(
+                    terraform_factory=ReplayTerraformFactory(
+                        Replayer(transcript, latency=0)
+                    )
+                )
+            )
+            .for_configuration("web")
+            .with_global_configure_function(configure)
+            .create()
+        )
+        task = cast(Task[BodyCallable[Any]], collection.tasks["validate"])
+
+        task(Context())
+
+        assert "Success!" in capsys.readouterr().out
+
+
+class TestRecordingExecutor:
+    def test_records_output_exit_code_and_duration(self):
+        def execute(_command: Any, **kwargs: Any) -> int:
+            kwargs["stdout"].write("Success!\n")
+            return 0
+
+        executor = Mock(spec=Executor)
+        executor.execute.side_effect = execute
+        transcript = Transcript()
+        stdout = io.StringIO()
+
+        RecordingExecutor(executor, transcript).execute(
+            ["terraform", "-var='name=a b'", "validate"], stdout=stdout
+        )
+
+        assert stdout.getvalue() == "Success!\n"
+        [entry] = transcript.entries
+        assert entry.argv == ["terraform", "-var=name=a b", "validate"]
+        assert entry.stdout == "Success!\n"
+        assert entry.exit_code == 0
+        assert entry.duration >= 0
+
+    def test_records_failed_runs(self):
+        transcript = Transcript()
+        executor = RecordingExecutor(InvokeExecutor(Context()), transcript)
+
+        with pytest.raises(UnexpectedExit):
+            executor.execute(
+                ["sh", "-c", "'echo failed >&2; exit 3'"],
+                stderr=io.StringIO(),
+            )
+
+        assert transcript.entries[0].stderr == "failed\n"
+        assert transcript.entries[0].exit_code == 3
+
+    def test_records_streamed_runs(self):
+        transcript = Transcript()
+        executor = RecordingExecutor(InvokeExecutor(Context()), transcript)
+
+        lines = list(executor.stream(["printf", "'a\\nb\\n'"]))
+
+        assert lines == ["a\n", "b\n"]
+        assert transcript.entries[0].stdout == "a\nb\n"
+
+
+class TestFakeTerraform:
+    def test_replays_transcript_as_a_binary(self, tmp_path: Path):
+        TRANSCRIPT.save(tmp_path / "transcript.json")
+        binary = install_fake_terraform(
+            tmp_path / "bin", tmp_path / "transcript.json", latency=0
+        )
+
+        runs = [
+            subprocess.run(
+                [str(binary), "validate"],
+                capture_output=True,
+                text=True,
+            )
+            for _ in range(2)
+        ]
+
+        assert [(run.returncode, run.stdout, run.stderr) for run in runs] == [
+            (1, "", "Error: first\n"),
+            (0, "Success!\n", ""),
+        ]
+
+    def test_fails_for_unrecorded_commands(self, tmp_path: Path):
+        TRANSCRIPT.save(tmp_path / "transcript.json")
+        binary = install_fake_terraform(
+            tmp_path / "bin", tmp_path / "transcript.json", latency=0
+        )
+
+        run = subprocess.run(
+            [str(binary), "apply"], capture_output=True, text=True
+        )
+
+        assert run.returncode == 127
+        assert "No recorded run of: terraform apply" in run.stderr